@@ -0,0 +1,28 @@
+"""Candidate scoring mode (degraded results)
+
+Revision ID: 3f1c2a9d7b21
+Revises: db5676dec9a5
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d7b21'
+down_revision: Union[str, Sequence[str], None] = 'db5676dec9a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('candidates', sa.Column('scoring_mode', sa.String(), nullable=True, server_default='full'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('candidates', 'scoring_mode')
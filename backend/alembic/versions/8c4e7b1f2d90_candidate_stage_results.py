@@ -0,0 +1,28 @@
+"""Candidate stage results (cached pipeline outputs)
+
+Revision ID: 8c4e7b1f2d90
+Revises: 3f1c2a9d7b21
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e7b1f2d90'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9d7b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('candidates', sa.Column('stage_results', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('candidates', 'stage_results')
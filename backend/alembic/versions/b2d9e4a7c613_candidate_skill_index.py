@@ -0,0 +1,38 @@
+"""Candidate skill inverted index
+
+Existing candidates are indexed by `python reindex_skills.py` (needs the
+app's skill taxonomy, which a migration must not depend on).
+
+Revision ID: b2d9e4a7c613
+Revises: 8c4e7b1f2d90
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d9e4a7c613'
+down_revision: Union[str, Sequence[str], None] = '8c4e7b1f2d90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'candidate_skills',
+        sa.Column('candidate_id', sa.String(), sa.ForeignKey('candidates.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('skill', sa.String(), primary_key=True),
+        sa.Column('job_id', sa.String(), sa.ForeignKey('jobs.id'), nullable=False),
+    )
+    op.create_index('ix_candidate_skills_job_skill', 'candidate_skills', ['job_id', 'skill'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_candidate_skills_job_skill', table_name='candidate_skills')
+    op.drop_table('candidate_skills')
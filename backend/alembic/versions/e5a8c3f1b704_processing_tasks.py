@@ -0,0 +1,43 @@
+"""Background CV processing tasks
+
+Revision ID: e5a8c3f1b704
+Revises: b2d9e4a7c613
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a8c3f1b704'
+down_revision: Union[str, Sequence[str], None] = 'b2d9e4a7c613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'processing_tasks',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('job_id', sa.String(), sa.ForeignKey('jobs.id'), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('stage', sa.String(), nullable=True),
+        sa.Column('progress', sa.Integer(), nullable=True),
+        sa.Column('file_path', sa.String(), nullable=True),
+        sa.Column('filename', sa.String(), nullable=True),
+        sa.Column('candidate_id', sa.String(), sa.ForeignKey('candidates.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_processing_tasks_status', 'processing_tasks', ['status'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_processing_tasks_status', table_name='processing_tasks')
+    op.drop_table('processing_tasks')
@@ -0,0 +1,45 @@
+"""CV content hashes and content-addressed document store
+
+Revision ID: f7b2d6e9a318
+Revises: e5a8c3f1b704
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b2d6e9a318'
+down_revision: Union[str, Sequence[str], None] = 'e5a8c3f1b704'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'cv_documents',
+        sa.Column('content_hash', sa.String(), primary_key=True),
+        sa.Column('text_hash', sa.String(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('parsed_cv', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_cv_documents_text_hash', 'cv_documents', ['text_hash'])
+    op.add_column('candidates', sa.Column('content_hash', sa.String(), nullable=True))
+    op.add_column('candidates', sa.Column('text_hash', sa.String(), nullable=True))
+    op.create_index('ix_candidates_job_content_hash', 'candidates', ['job_id', 'content_hash'])
+    op.create_index('ix_candidates_job_text_hash', 'candidates', ['job_id', 'text_hash'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_candidates_job_text_hash', table_name='candidates')
+    op.drop_index('ix_candidates_job_content_hash', table_name='candidates')
+    op.drop_column('candidates', 'text_hash')
+    op.drop_column('candidates', 'content_hash')
+    op.drop_index('ix_cv_documents_text_hash', table_name='cv_documents')
+    op.drop_table('cv_documents')
@@ -0,0 +1,84 @@
+"""
+Benchmark: CV task throughput vs number of worker processes on the Redis Stream.
+
+Each task burns --cpu ms of CPU (text extraction / compaction / screening) and
+waits --latency s (LLM call), like a CV in worker.py. Workers are real
+processes consuming one consumer group on a local Redis stand-in.
+
+Run from backend/:
+    python -m benchmarks.bench_cv_workers --tasks 200 --processes 1 2 4
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+from benchmarks.fake_redis import FakeRedis
+
+STREAM, GROUP = "bench:cv", "bench-workers"
+
+def _burn(ms: float):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+def _worker(url: str, concurrency: int, cpu: float, latency: float):
+    from config import settings
+    from services.cv_stream import CVStream, consumer_name
+    settings.CV_STREAM_BLOCK_MS = 100
+
+    async def handler(task_id):
+        _burn(cpu)
+        await asyncio.sleep(latency)
+
+    async def run():
+        stream = CVStream(url=url, stream=STREAM, group=GROUP)
+        await asyncio.gather(*(stream.consume(handler, consumer_name(i)) for i in range(concurrency)))
+
+    asyncio.run(run())
+
+async def _run(processes: int, tasks: int, concurrency: int, cpu: float, latency: float):
+    server = await FakeRedis().start()
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_worker, args=(server.url, concurrency, cpu, latency), daemon=True) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    try:
+        from services.cv_stream import CVStream
+        producer = CVStream(url=server.url, stream=STREAM, group=GROUP)
+        await producer.ensure_group()
+        # Wait until every consumer joined the group so process start-up isn't measured
+        while len(server.consumers(STREAM, GROUP)) < processes * concurrency:
+            await asyncio.sleep(0.05)
+
+        start = time.perf_counter()
+        for i in range(tasks):
+            await producer.enqueue(f"task-{i}")
+        while server.acked < tasks:
+            await asyncio.sleep(0.005)
+        elapsed = time.perf_counter() - start
+        await producer.close()
+    finally:
+        for worker in workers:
+            worker.terminate()
+            worker.join()
+        await server.stop()
+    print(f"processes={processes} tasks={tasks} time={elapsed:.2f}s throughput={tasks / elapsed:6.1f} CVs/s")
+    return tasks / elapsed
+
+async def main(tasks: int, process_counts, concurrency: int, cpu: float, latency: float):
+    base = None
+    for processes in process_counts:
+        throughput = await _run(processes, tasks, concurrency, cpu, latency)
+        base = base or throughput
+        print(f"          speed-up x{throughput / base:.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=2, help="consumers per process")
+    parser.add_argument("--cpu", type=float, default=10.0, help="CPU time per CV (ms)")
+    parser.add_argument("--latency", type=float, default=0.02, help="LLM wait per CV (s)")
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.processes, args.concurrency, args.cpu, args.latency))
@@ -0,0 +1,76 @@
+"""
+Benchmark: event-loop lag while CVs are parsed under concurrent load.
+
+"inline" is the old upload path (PyMuPDF called directly in the handler),
+"pool" is ExtractionPool. A probe coroutine sleeps 10 ms in a loop and records
+how late it wakes up - that delay is what every other request waits.
+
+Run from backend/:
+    python -m benchmarks.bench_extraction --files 16 --pages 60 --workers 2
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import fitz
+
+from services.extraction_pool import ExtractionPool
+from services.pdf_parser import PDFParserService
+
+LINE = "Senior Python developer, FastAPI, PostgreSQL, Kubernetes, 8 years of hotel software experience."
+
+def make_pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        for row in range(50):
+            page.insert_text((40, 40 + row * 15), LINE, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+async def _probe(lags: list, stop: asyncio.Event, interval: float = 0.01):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+async def _inline(filename: str, content: bytes):
+    return PDFParserService.extract_text_from_bytes(filename, content)
+
+async def _run(mode: str, files: int, content: bytes, pool: ExtractionPool):
+    extract = _inline if mode == "inline" else pool.extract
+    lags, stop = [], asyncio.Event()
+    probe = asyncio.create_task(_probe(lags, stop))
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    texts = await asyncio.gather(*(extract(f"cv{i}.pdf", content) for i in range(files)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+    assert all(LINE[:20] in text for text in texts)
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    print(
+        f"{mode:>6}: {files} files in {elapsed:.2f}s  loop lag max={lags_ms[-1]:7.1f} ms  "
+        f"mean={statistics.mean(lags_ms):6.1f} ms  probes={len(lags_ms)}"
+    )
+
+async def main(files: int, pages: int, workers: int):
+    content = make_pdf(pages)
+    print(f"PDF: {pages} pages, {len(content) / 1024:.0f} KiB")
+    pool = ExtractionPool(workers=workers)
+    try:
+        await pool.run(len, b"warm-up")  # process start-up is not part of the comparison
+        for mode in ("inline", "pool"):
+            await _run(mode, files, content, pool)
+    finally:
+        pool.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=16)
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.files, args.pages, args.workers))
@@ -0,0 +1,81 @@
+"""
+Benchmark: per-call httpx client vs shared pooled Ollama client.
+
+Simulates N CV uploads, each making the 3 LLM calls of the upload path
+(parse_cv, AnalyzerAgent, ScorerAgent-side call), against a local stand-in
+Ollama. Reports TCP connections opened and wall time per upload.
+
+Run from backend/:
+    python -m benchmarks.bench_llm_client --uploads 50 --concurrency 5 --accept-delay 0.005
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from benchmarks.fake_ollama import FakeOllama
+from config import settings
+from services.llm_service import LLMService, close_http_client
+from services.ollama_pool import ollama_pool
+
+CALLS_PER_UPLOAD = 3
+
+async def _upload_per_call_client(base_url: str):
+    for _ in range(CALLS_PER_UPLOAD):
+        # Previous behaviour: fresh AsyncClient (and TCP connection) per generate()
+        async with httpx.AsyncClient(timeout=settings.OLLAMA_TIMEOUT) as client:
+            response = await client.post(f"{base_url}/api/generate", json={"model": settings.OLLAMA_MODEL, "prompt": "cv", "stream": False})
+            response.raise_for_status()
+
+async def _upload_pooled(llm: LLMService):
+    for _ in range(CALLS_PER_UPLOAD):
+        # Unique prompt per call so single-flight coalescing does not skew the numbers
+        await llm.generate(f"cv {uuid.uuid4()}", use_cache=False)
+
+async def _run(label: str, server: FakeOllama, uploads: int, concurrency: int, make_upload):
+    server.connections = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await make_upload()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(uploads)))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<16} uploads={uploads} connections={server.connections:<5} "
+        f"conn/upload={server.connections / uploads:.2f} "
+        f"time={elapsed:.3f}s ({elapsed / uploads * 1000:.1f} ms/upload)"
+    )
+    return server.connections, elapsed
+
+async def main(uploads: int, concurrency: int, latency: float, accept_delay: float):
+    server = await FakeOllama(latency=latency, accept_delay=accept_delay).start()
+    settings.OLLAMA_BASE_URL = server.url
+    ollama_pool.configure([server.url])
+    try:
+        base_conns, base_time = await _run(
+            "per-call client", server, uploads, concurrency, lambda: _upload_per_call_client(server.url)
+        )
+        llm = LLMService()
+        pooled_conns, pooled_time = await _run("pooled client", server, uploads, concurrency, lambda: _upload_pooled(llm))
+        print(
+            f"\nSaved {base_conns - pooled_conns} connections "
+            f"({(base_conns - pooled_conns) / uploads:.2f} per upload), "
+            f"{(base_time - pooled_time) / uploads * 1000:.1f} ms per upload"
+        )
+    finally:
+        await close_http_client()
+        await server.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.01, help="simulated generation time (s)")
+    parser.add_argument("--accept-delay", type=float, default=0.005, help="simulated connection setup cost (s)")
+    args = parser.parse_args()
+    asyncio.run(main(args.uploads, args.concurrency, args.latency, args.accept_delay))
@@ -0,0 +1,56 @@
+"""
+Benchmark: LLM throughput vs number of Ollama nodes.
+
+Each stand-in node can run --slots generations at once (like a GPU box);
+LLMService routes by least outstanding requests across the pool.
+
+Run from backend/:
+    python -m benchmarks.bench_ollama_pool --calls 60 --nodes 1 2 4
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from benchmarks.fake_ollama import FakeOllama
+from services.llm_scheduler import llm_scheduler
+from services.llm_service import LLMService, close_http_client
+from services.ollama_pool import ollama_pool
+from config import settings
+
+async def _run(nodes: int, calls: int, slots: int, latency: float):
+    servers = [await FakeOllama(latency=latency, slots=slots).start() for _ in range(nodes)]
+    ollama_pool.configure([s.url for s in servers])
+    llm_scheduler.max_concurrency = settings.LLM_MAX_CONCURRENCY * nodes
+    llm_scheduler.max_queue_depth = calls
+    llm = LLMService()
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(llm.generate(f"cv {uuid.uuid4()}", use_cache=False) for _ in range(calls)))
+        elapsed = time.perf_counter() - start
+    finally:
+        for server in servers:
+            await server.stop()
+    spread = "/".join(str(s.requests) for s in servers)
+    print(f"nodes={nodes} calls={calls} time={elapsed:.2f}s throughput={calls / elapsed:6.1f} calls/s spread={spread}")
+    return calls / elapsed
+
+async def main(calls: int, node_counts, slots: int, latency: float):
+    settings.LLM_MAX_CONCURRENCY = slots
+    try:
+        base = None
+        for nodes in node_counts:
+            throughput = await _run(nodes, calls, slots, latency)
+            base = base or throughput
+            print(f"          speed-up x{throughput / base:.2f}")
+    finally:
+        await close_http_client()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=60)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--slots", type=int, default=2, help="parallel generations per node")
+    parser.add_argument("--latency", type=float, default=0.05, help="generation time per call (s)")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.nodes, args.slots, args.latency))
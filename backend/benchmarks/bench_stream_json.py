@@ -0,0 +1,53 @@
+"""
+Benchmark: full completion vs streaming with early JSON cut-off.
+
+The stand-in model answers with a JSON object followed by a chatty tail
+(as llama3 often does). Streaming mode closes the connection once the
+object is complete, so the tail is never generated.
+
+Run from backend/:
+    python -m benchmarks.bench_stream_json --calls 10 --token-delay 0.002
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.fake_ollama import FakeOllama
+from config import settings
+from services.llm_service import LLMService, close_http_client
+from services.ollama_pool import ollama_pool
+
+JSON_PART = '{"score": 72, "strengths": ["Python", "FastAPI"], "weaknesses": ["No Kubernetes"], "recommendation": "maybe", "reasoning": "Solid backend profile."}'
+TAIL = "\n\nExplanation: the candidate has a solid backend background. " * 12
+
+async def _measure(label: str, server: FakeOllama, calls: int, stop_at_json: bool):
+    llm = LLMService()
+    server.tokens_sent = 0
+    start = time.perf_counter()
+    for _ in range(calls):
+        text = await llm.generate("score", stop_at_json=stop_at_json, use_cache=False)
+        assert llm.extract_json(text)["score"] == 72
+    elapsed = time.perf_counter() - start
+    print(f"{label:<18} tokens/call={server.tokens_sent / calls:6.1f} latency={elapsed / calls * 1000:7.1f} ms/call")
+    return elapsed
+
+async def main(calls: int, token_delay: float):
+    server = await FakeOllama(token_delay=token_delay, responder=lambda payload: JSON_PART + TAIL).start()
+    settings.OLLAMA_BASE_URL = server.url
+    ollama_pool.configure([server.url])
+    try:
+        full = await _measure("full completion", server, calls, stop_at_json=False)
+        # Give the server a moment to notice closed streams before counting again
+        await asyncio.sleep(0.05)
+        early = await _measure("stream + cut-off", server, calls, stop_at_json=True)
+        print(f"\nTail latency saved: {(full - early) / calls * 1000:.1f} ms/call ({(1 - early / full) * 100:.0f}%)")
+    finally:
+        await close_http_client()
+        await server.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--token-delay", type=float, default=0.002, help="simulated time per token (s)")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.token_delay))
@@ -0,0 +1,142 @@
+"""
+Local stand-in for the Ollama HTTP API used by the benchmarks.
+
+Speaks just enough HTTP/1.1 (keep-alive, Content-Length and chunked NDJSON
+bodies) to serve /api/generate and /api/tags, and counts accepted TCP
+connections and streamed tokens so the benchmarks can show how much work
+the client causes.
+
+Usage:
+    server = FakeOllama(latency=0.05)
+    await server.start()
+    ... settings.OLLAMA_BASE_URL = server.url ...
+    await server.stop()
+"""
+import asyncio
+import json
+from typing import Callable, Optional
+
+DEFAULT_RESPONSE = '{"name":"Jan Kowalski","email":"jan@example.com","skills":["Python","FastAPI"]}'
+
+class FakeOllama:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        accept_delay: float = 0.0,
+        token_delay: float = 0.0,
+        slots: int = 0,
+        responder: Optional[Callable[[dict], str]] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.accept_delay = accept_delay  # simulated TCP/TLS handshake cost per new connection
+        self.token_delay = token_delay  # per-token generation time in stream mode
+        # Parallel generations the "GPU" can run (0 = unlimited); extra requests queue like in Ollama
+        self._slots = asyncio.Semaphore(slots) if slots else None
+        self.responder = responder or (lambda payload: DEFAULT_RESPONSE)
+        self.connections = 0
+        self.requests = 0
+        self.tokens_sent = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        if self.accept_delay:
+            await asyncio.sleep(self.accept_delay)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, value = line.decode().split(":", 1)
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                await self._respond(writer, method, path, body)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, method: str, path: str, body: bytes):
+        if path.startswith("/api/generate"):
+            payload = json.loads(body or b"{}")
+            if self._slots:
+                async with self._slots:
+                    await self._generate(writer, payload)
+            else:
+                await self._generate(writer, payload)
+            return
+        elif path.startswith("/api/tags"):
+            data = json.dumps({"models": [{"name": "llama3.1:8b"}]}).encode()
+            status = "200 OK"
+        else:
+            data = b'{"error":"not found"}'
+            status = "404 Not Found"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+
+    async def _generate(self, writer: asyncio.StreamWriter, payload: dict):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if payload.get("stream", True):
+            await self._stream(writer, payload)
+            return
+        text = self.responder(payload)
+        tokens = len(self._tokenize(text))
+        if self.token_delay:
+            # Non-streaming still pays for generating every token
+            await asyncio.sleep(self.token_delay * tokens)
+        self.tokens_sent += tokens
+        data = json.dumps({"model": payload.get("model"), "response": text, "done": True}).encode()
+        writer.write(
+            f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+
+    async def _stream(self, writer: asyncio.StreamWriter, payload: dict):
+        """Chunked NDJSON token stream, like Ollama with "stream": true"""
+        text = self.responder(payload)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n")
+        for token in self._tokenize(text):
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            line = json.dumps({"response": token, "done": False}).encode() + b"\n"
+            writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            await writer.drain()
+            self.tokens_sent += 1
+        line = json.dumps({"response": "", "done": True}).encode() + b"\n"
+        writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    def _tokenize(text: str) -> list:
+        # ~4 characters per token, close enough to llama tokenizers for timing purposes
+        return [text[i:i + 4] for i in range(0, len(text), 4)]
@@ -0,0 +1,311 @@
+"""
+Local stand-in for Redis used by the CV worker tests and benchmarks.
+
+Speaks RESP2 over TCP and implements the Streams subset the CV task stream
+needs (XADD, XLEN, XGROUP CREATE, XREADGROUP with BLOCK, XACK, XAUTOCLAIM,
+XCLAIM, XPENDING) plus the handshake commands redis-py sends, so
+redis.asyncio talks to it like to a real server. Counts acknowledged
+messages so benchmarks can tell when a batch is finished.
+
+Usage:
+    server = FakeRedis()
+    await server.start()
+    ... CVStream(url=server.url) ...
+    await server.stop()
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+class SimpleString(str):
+    pass
+
+class RedisError(Exception):
+    pass
+
+NULL_ARRAY = object()
+
+def _parse_id(message_id: str, default_seq: int = 0) -> Tuple[int, int]:
+    if message_id == "-":
+        return (0, 0)
+    if message_id == "+":
+        return (2 ** 63, 2 ** 63)
+    ms, _, seq = message_id.partition("-")
+    return (int(ms), int(seq) if seq else default_seq)
+
+def _format_id(message_id: Tuple[int, int]) -> str:
+    return f"{message_id[0]}-{message_id[1]}"
+
+class _Group:
+    def __init__(self, last_delivered: Tuple[int, int]):
+        self.last_delivered = last_delivered
+        self.pending: Dict[Tuple[int, int], list] = {}  # id -> [consumer, delivered_at, deliveries]
+        self.consumers = set()
+
+class _Stream:
+    def __init__(self):
+        self.entries: Dict[Tuple[int, int], List[str]] = {}
+        self.last_id = (0, 0)
+        self.groups: Dict[str, _Group] = {}
+
+class FakeRedis:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.streams: Dict[str, _Stream] = {}
+        self.commands = 0
+        self.acked = 0
+        self._changed: Optional[asyncio.Condition] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self):
+        self._changed = asyncio.Condition()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def consumers(self, stream: str, group: str) -> set:
+        s = self.streams.get(stream)
+        return set(s.groups[group].consumers) if s and group in s.groups else set()
+
+    # --- protocol ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if command is None:
+                    break
+                self.commands += 1
+                try:
+                    reply = await self._dispatch(command)
+                except RedisError as e:
+                    reply = e
+                writer.write(self._encode(reply))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> Optional[List[str]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.decode().split()  # inline command
+        args = []
+        for _ in range(int(line[1:])):
+            size = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(size + 2))[:-2].decode())
+        return args
+
+    def _encode(self, value) -> bytes:
+        if isinstance(value, RedisError):
+            message = str(value)
+            return f"-{message if message.split(' ', 1)[0].isupper() else 'ERR ' + message}\r\n".encode()
+        if value is NULL_ARRAY:
+            return b"*-1\r\n"
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, SimpleString):
+            return f"+{value}\r\n".encode()
+        if isinstance(value, bool) or isinstance(value, int):
+            return f":{int(value)}\r\n".encode()
+        if isinstance(value, (list, tuple)):
+            return f"*{len(value)}\r\n".encode() + b"".join(self._encode(v) for v in value)
+        data = str(value).encode()
+        return b"$%d\r\n%s\r\n" % (len(data), data)
+
+    async def _dispatch(self, command: List[str]):
+        name, args = command[0].upper(), command[1:]
+        if name == "PING":
+            return SimpleString("PONG")
+        if name in ("CLIENT", "SELECT"):
+            return SimpleString("OK")
+        if name in ("FLUSHALL", "FLUSHDB"):
+            self.streams.clear()
+            return SimpleString("OK")
+        if name == "DEL":
+            return sum(1 for key in args if self.streams.pop(key, None) is not None)
+        handler = getattr(self, f"_cmd_{name.lower()}", None)
+        if handler is None:
+            raise RedisError(f"unknown command '{name}'")
+        return await handler(args) if asyncio.iscoroutinefunction(handler) else handler(args)
+
+    # --- streams ---
+
+    def _stream(self, key: str, create: bool = False) -> Optional[_Stream]:
+        if key not in self.streams and create:
+            self.streams[key] = _Stream()
+        return self.streams.get(key)
+
+    def _group(self, key: str, group: str) -> _Group:
+        stream = self._stream(key)
+        if stream is None or group not in stream.groups:
+            raise RedisError(f"NOGROUP No such key '{key}' or consumer group '{group}'")
+        return stream.groups[group]
+
+    async def _cmd_xadd(self, args):
+        key, rest = args[0], args[1:]
+        while rest[0] != "*" and "-" not in rest[0]:
+            rest = rest[1:]  # MAXLEN / NOMKSTREAM options are not modelled
+        stream = self._stream(key, create=True)
+        now = int(time.time() * 1000)
+        message_id = (now, 0) if now > stream.last_id[0] else (stream.last_id[0], stream.last_id[1] + 1)
+        if rest[0] != "*":
+            message_id = _parse_id(rest[0])
+        stream.entries[message_id] = rest[1:]
+        stream.last_id = message_id
+        async with self._changed:
+            self._changed.notify_all()
+        return _format_id(message_id)
+
+    def _cmd_xlen(self, args):
+        stream = self._stream(args[0])
+        return len(stream.entries) if stream else 0
+
+    def _cmd_xgroup(self, args):
+        sub, key, group = args[0].upper(), args[1], args[2]
+        if sub != "CREATE":
+            raise RedisError(f"unsupported XGROUP {sub}")
+        stream = self._stream(key, create="MKSTREAM" in (a.upper() for a in args[4:]))
+        if stream is None:
+            raise RedisError("The XGROUP subcommand requires the key to exist")
+        if group in stream.groups:
+            raise RedisError("BUSYGROUP Consumer Group name already exists")
+        stream.groups[group] = _Group(stream.last_id if args[3] == "$" else _parse_id(args[3]))
+        return SimpleString("OK")
+
+    def _entry(self, stream: _Stream, message_id: Tuple[int, int]):
+        fields = stream.entries.get(message_id)
+        return [_format_id(message_id), fields] if fields is not None else None
+
+    async def _cmd_xreadgroup(self, args):
+        options = {}
+        i = 0
+        while args[i].upper() != "STREAMS":
+            option = args[i].upper()
+            if option == "GROUP":
+                options["group"], options["consumer"] = args[i + 1], args[i + 2]
+                i += 3
+            elif option in ("COUNT", "BLOCK"):
+                options[option.lower()] = int(args[i + 1])
+                i += 2
+            else:
+                i += 1
+        key, start = args[i + 1], args[i + 2]
+        group = self._group(key, options["group"])
+        consumer = options["consumer"]
+        group.consumers.add(consumer)
+        count = options.get("count") or 2 ** 31
+        stream = self.streams[key]
+
+        if start != ">":
+            # History of this consumer's pending entries
+            after = _parse_id(start)
+            ids = sorted(i for i, p in group.pending.items() if p[0] == consumer and i > after)[:count]
+            return [[key, [self._entry(stream, i) for i in ids]]]
+
+        deadline = None if "block" not in options else (
+            None if options["block"] == 0 else time.monotonic() + options["block"] / 1000
+        )
+        while True:
+            ids = sorted(i for i in stream.entries if i > group.last_delivered)[:count]
+            if ids:
+                now = time.monotonic()
+                for message_id in ids:
+                    group.pending[message_id] = [consumer, now, 1]
+                group.last_delivered = ids[-1]
+                return [[key, [self._entry(stream, i) for i in ids]]]
+            if "block" not in options:
+                return NULL_ARRAY
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                return NULL_ARRAY
+            async with self._changed:
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    return NULL_ARRAY
+
+    def _cmd_xack(self, args):
+        group = self._group(args[0], args[1])
+        acked = sum(1 for message_id in args[2:] if group.pending.pop(_parse_id(message_id), None) is not None)
+        self.acked += acked
+        return acked
+
+    def _take_over(self, group: _Group, message_id, consumer: str, justid: bool):
+        entry = group.pending[message_id]
+        entry[0], entry[1] = consumer, time.monotonic()
+        if not justid:
+            entry[2] += 1
+
+    def _cmd_xautoclaim(self, args):
+        key, group_name, consumer, min_idle, start = args[:5]
+        group = self._group(key, group_name)
+        group.consumers.add(consumer)
+        upper = [a.upper() for a in args]
+        count = int(args[upper.index("COUNT") + 1]) if "COUNT" in upper else 100
+        justid = "JUSTID" in upper
+        now = time.monotonic()
+        claimed = []
+        for message_id in sorted(group.pending):
+            if message_id < _parse_id(start) or len(claimed) >= count:
+                continue
+            if (now - group.pending[message_id][1]) * 1000 >= int(min_idle):
+                self._take_over(group, message_id, consumer, justid)
+                claimed.append(message_id)
+        stream = self.streams[key]
+        entries = [_format_id(i) if justid else self._entry(stream, i) for i in claimed]
+        return ["0-0", entries, []]
+
+    def _cmd_xclaim(self, args):
+        key, group_name, consumer, min_idle = args[:4]
+        group = self._group(key, group_name)
+        ids = [a for a in args[4:] if "-" in a]
+        justid = "JUSTID" in (a.upper() for a in args[4:])
+        now = time.monotonic()
+        claimed = []
+        for raw in ids:
+            message_id = _parse_id(raw)
+            if message_id in group.pending and (now - group.pending[message_id][1]) * 1000 >= int(min_idle):
+                self._take_over(group, message_id, consumer, justid)
+                claimed.append(message_id)
+        stream = self.streams[key]
+        return [_format_id(i) if justid else self._entry(stream, i) for i in claimed]
+
+    def _cmd_xpending(self, args):
+        group = self._group(args[0], args[1])
+        rest = args[2:]
+        now = time.monotonic()
+        if not rest:
+            ids = sorted(group.pending)
+            per_consumer: Dict[str, int] = {}
+            for entry in group.pending.values():
+                per_consumer[entry[0]] = per_consumer.get(entry[0], 0) + 1
+            if not ids:
+                return [0, None, None, NULL_ARRAY]
+            return [len(ids), _format_id(ids[0]), _format_id(ids[-1]), [[c, str(n)] for c, n in per_consumer.items()]]
+        min_idle = 0
+        if rest[0].upper() == "IDLE":
+            min_idle, rest = int(rest[1]), rest[2:]
+        start, end, count = _parse_id(rest[0]), _parse_id(rest[1], default_seq=2 ** 63), int(rest[2])
+        consumer = rest[3] if len(rest) > 3 else None
+        rows = []
+        for message_id in sorted(group.pending):
+            consumer_name, delivered_at, deliveries = group.pending[message_id]
+            idle = int((now - delivered_at) * 1000)
+            if start <= message_id <= end and idle >= min_idle and consumer in (None, consumer_name):
+                rows.append([_format_id(message_id), consumer_name, idle, deliveries])
+        return rows[:count]
@@ -5,15 +5,44 @@ logger = logging.getLogger(__name__)
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite+aiosqlite:///./rekruter.db"
     SUPABASE_URL: Optional[str] = None
     SUPABASE_KEY: Optional[str] = None
     OLLAMA_BASE_URL: str = "http://localhost:11434"
+    OLLAMA_BASE_URLS: str = ""  # comma-separated Ollama nodes; empty = OLLAMA_BASE_URL only
+    OLLAMA_NODE_MAX_FAILURES: int = 3
+    OLLAMA_HEALTH_CHECK_INTERVAL: int = 15
+    OLLAMA_HEALTH_CHECK_TIMEOUT: float = 5.0
+    OLLAMA_HEDGING: bool = False
     OLLAMA_MODEL: str = "llama3.1:8b"
     OLLAMA_TIMEOUT: int = 120
+    OLLAMA_CONNECT_TIMEOUT: float = 10.0
+    OLLAMA_MAX_CONNECTIONS: int = 20
+    OLLAMA_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    OLLAMA_KEEPALIVE_EXPIRY: float = 60.0
+    OLLAMA_STREAM_JSON: bool = True
+    OLLAMA_STRUCTURED_OUTPUT: bool = True
+    OLLAMA_KEEP_ALIVE: str = "30m"
+    OLLAMA_WARMUP_ON_STARTUP: bool = True
+    OLLAMA_KEEPER_ENABLED: bool = True
+    OLLAMA_KEEPER_INTERVAL: int = 240
+    OLLAMA_KEEPER_WEEKDAYS_ONLY: bool = True
+    BUSINESS_HOURS_START: int = 7
+    BUSINESS_HOURS_END: int = 19
+    LLM_MAX_CONCURRENCY: int = 2  # per Ollama node
+    LLM_MAX_QUEUE_DEPTH: int = 50
+    LLM_RETRY_AFTER_SECONDS: int = 30
+    LLM_BATCH_SIZE: int = 5
+    LLM_BATCH_WINDOW_MS: int = 50  # batch-priority analyses/scores of one job collected this long
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RECOVERY_SECONDS: float = 30.0
+    LLM_LATENCY_WINDOW: int = 100
+    LLM_TIMEOUT_PERCENTILE: float = 0.95
+    LLM_TIMEOUT_MULTIPLIER: float = 3.0
+    OLLAMA_MIN_TIMEOUT: float = 15.0
     ANTHROPIC_API_KEY: Optional[str] = None
     SECRET_KEY: str = "dev-secret-key"
     ENVIRONMENT: str = "development"
@@ -23,7 +52,24 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_ENABLED: bool = False
     CACHE_TTL: int = 3600
+    CACHE_MAX_ENTRIES: int = 10000
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL: int = 86400
+    LLM_CACHE_MAX_RESPONSE_BYTES: int = 65536
     USE_MULTI_AGENT: bool = True
+    AGENT_MEMORY_SIZE: int = 100  # per-agent ring buffer of sampled interactions
+    AGENT_MEMORY_SAMPLE_RATE: float = 0.1
+    # One LLM call returns parsed CV + analysis (instead of parse_cv + AnalyzerAgent)
+    LLM_SINGLE_PASS: bool = False
+    SKILL_TAXONOMY_PATH: str = "services/skill_taxonomy.json"
+    SKILL_MATCH_MODE: str = "exact"  # exact (taxonomy) / semantic (+ embedding similarity via the RAG encoder)
+    SKILL_SEMANTIC_THRESHOLD: float = 0.7
+    SKILL_EMBEDDINGS_PATH: str = "data/skill_embeddings.npz"
+    BULK_SCREENER_CACHE_JOBS: int = 32  # encoded skill matrices kept (one per job, LRU)
+    # Skip AnalyzerAgent below this screening match % (jobs override via requirements.fast_reject_threshold, 0 = off)
+    FAST_REJECT_THRESHOLD: float = 20.0
+    # Per-stage timeouts of the multi-agent pipeline (seconds, missing = no limit)
+    PIPELINE_STAGE_TIMEOUTS: Dict[str, float] = {"rag": 10.0, "screening": 5.0, "analysis": 300.0, "scoring": 5.0}
     USE_RAG_CONTEXT: bool = True
     USE_KAIZEN_LEARNING: bool = True
     ENABLE_FALLBACK: bool = True
@@ -31,6 +77,31 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     MAX_UPLOAD_SIZE: int = 10485760
+    UPLOAD_DIR: str = "uploads"  # files of async uploads waiting for processing
+    CV_WORKERS: int = 2  # concurrent CV tasks per process (in-process queue or each worker.py process)
+    CV_QUEUE_MAX: int = 1000
+    CV_TASK_LEASE_SECONDS: int = 60  # running task without heartbeat this long = its process died, task is re-queued
+    # local = in-process worker pool, redis = Redis Stream consumed by worker.py (UPLOAD_DIR must be shared)
+    CV_QUEUE_BACKEND: str = "local"
+    CV_STREAM: str = "rekruter:cv_tasks"
+    CV_STREAM_GROUP: str = "cv-workers"
+    CV_STREAM_BLOCK_MS: int = 5000
+    CV_STREAM_CLAIM_IDLE_MS: int = 60000  # pending longer without heartbeat = consumer died, task is claimed
+    CV_STREAM_MAX_DELIVERIES: int = 3
+    CV_WORKER_PROCESSES: int = 2  # worker.py processes per node
+    BULK_UPLOAD_MAX_FILES: int = 500
+    BULK_UPLOAD_MAX_SIZE: int = 262144000  # whole bulk request (ZIPs included)
+    BULK_UPLOAD_MAX_UNPACKED_SIZE: int = 524288000  # all CV files after unpacking ZIPs
+    EXTRACTION_WORKERS: int = 2  # PDF/DOCX parsing processes, 0 = thread in the API process
+    EXTRACTION_MAX_FILES_PER_WORKER: int = 100  # recycle parser processes (PyMuPDF memory growth)
+    EXTRACTION_CPU_LIMIT_SECONDS: float = 20.0  # per file, 0 = no limit
+    EXTRACTION_WALL_LIMIT_SECONDS: float = 60.0  # per file, parser processes killed after it, 0 = no limit
+    BULK_UPLOAD_CONCURRENCY: int = 4  # CVs parsed + scored at once per bulk request
+    BULK_UPLOAD_SAVE_BATCH: int = 50  # new candidates inserted per commit
+    BULK_UPLOAD_SAVE_INTERVAL_MS: int = 1000  # longest a scored candidate waits for its batch
+    CV_COMPACTION_ENABLED: bool = True
+    CV_TOKEN_BUDGET: int = 2000
+    LLM_PROMPT_TOKENS_PER_SECOND: float = 400.0
     PAGINATION_PAGE_SIZE: int = 20
     
     model_config = ConfigDict(env_file=".env", case_sensitive=False)
@@ -47,6 +118,11 @@ class Settings(BaseSettings):
     def is_sqlite(self) -> bool:
         return "sqlite" in self.DATABASE_URL.lower()
     
+    @property
+    def ollama_backends(self) -> List[str]:
+        urls = [url.strip() for url in self.OLLAMA_BASE_URLS.split(",") if url.strip()]
+        return urls or [self.OLLAMA_BASE_URL]
+    
     @property
     def redis_available(self) -> bool:
         return self.REDIS_ENABLED and bool(self.REDIS_URL)
@@ -9,8 +9,19 @@ import sentry_sdk
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from config import settings
 from database import engine
-from middleware.security import limiter, request_id_middleware, security_headers_middleware
-from services.cache import cache
+from middleware.security import limiter, request_id_middleware, security_headers_middleware, UploadSizeLimitMiddleware
+from services.cache import cache, llm_cache
+from services.llm_service import init_http_client, close_http_client, llm_single_flight
+from services.llm_scheduler import llm_scheduler, LLMOverloadedError
+from services.circuit_breaker import llm_breaker
+from services.model_keeper import model_keeper
+from services.ollama_pool import ollama_pool
+from services.rescoring import job_rescorer
+from services.bulk_screener import bulk_screener
+from services.task_queue import cv_task_queue
+from services.cv_stream import cv_stream
+from services.extraction_pool import extraction_pool
+from services.agents.registry import agent_registry
 import logging
 
 logging.basicConfig(
@@ -32,8 +43,21 @@ if settings.SENTRY_DSN:
 async def lifespan(app: FastAPI):
     logger.info(f"🚀 Rekruter AI starting (env: {settings.ENVIRONMENT})...")
     await cache.connect()
+    await init_http_client()
+    agent_registry.init()
+    # Preload/warm-up runs in background so startup isn't blocked by model load time
+    ollama_pool.start()
+    model_keeper.start()
+    cv_task_queue.start()
     yield
     logger.info("🛑 Shutting down...")
+    await cv_task_queue.stop()
+    await cv_stream.close()
+    extraction_pool.shutdown()
+    await job_rescorer.stop()
+    await model_keeper.stop()
+    await ollama_pool.stop()
+    await close_http_client()
     await cache.close()
     await engine.dispose()
 
@@ -57,6 +81,7 @@ app.add_middleware(
 
 app.middleware("http")(request_id_middleware)
 app.middleware("http")(security_headers_middleware)
+app.add_middleware(UploadSizeLimitMiddleware)
 
 if settings.is_production or settings.DEBUG:
     Instrumentator().instrument(app).expose(app, endpoint="/metrics")
@@ -76,9 +101,29 @@ async def health_check():
             "rag": settings.USE_RAG_CONTEXT,
             "kaizen": settings.USE_KAIZEN_LEARNING,
             "cache": cache.enabled,
-        }
+            "fallback": settings.ENABLE_FALLBACK,
+        },
+        "llm_cache": llm_cache.stats(),
+        "llm_coalescing": llm_single_flight.stats(),
+        "llm_queue": {"active": llm_scheduler.active, "waiting": llm_scheduler.queue_depth},
+        "llm_breaker": llm_breaker.stats(),
+        "llm_model": model_keeper.stats(),
+        "ollama_nodes": ollama_pool.stats(),
+        "rescoring": job_rescorer.stats(),
+        "screening_cache": bulk_screener.stats(),
+        "cv_tasks": cv_task_queue.stats(),
+        "extraction": extraction_pool.stats(),
+        "agents": agent_registry.stats(),
     }
 
+@app.exception_handler(LLMOverloadedError)
+async def llm_overloaded_handler(request: Request, exc: LLMOverloadedError):
+    return JSONResponse(
+        status_code=503,
+        content={"error": "AI service busy", "detail": "Too many CVs in processing. Please try again later."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Global exception: {exc}", exc_info=True)
@@ -87,9 +132,10 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"error": "Internal server error", "detail": str(exc) if settings.DEBUG else None}
     )
 
-from routers import jobs, candidates, auth
+from routers import jobs, candidates, tasks, auth
 app.include_router(jobs.router)
 app.include_router(candidates.router)
+app.include_router(tasks.router)
 app.include_router(auth.router)
 
 @app.get("/")
@@ -2,7 +2,11 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+from typing import Optional
 from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from config import settings
@@ -32,3 +36,71 @@ async def security_headers_middleware(request: Request, call_next):
     for header, value in SECURITY_HEADERS.items():
         response.headers[header] = value
     return response
+
+MULTIPART_OVERHEAD = 64 * 1024  # boundaries + part headers around the file
+
+def upload_limit(method: str, path: str) -> Optional[int]:
+    """Body size limit of an upload endpoint (None for everything else)"""
+    if method != "POST" or not path.startswith("/api/jobs/"):
+        return None
+    if path.endswith("/upload"):
+        return settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD
+    if path.endswith("/upload/bulk"):
+        return settings.BULK_UPLOAD_MAX_SIZE + MULTIPART_OVERHEAD
+    return None
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject oversized uploads before the multipart body is spooled: by Content-Length
+    up front, and by counting received bytes for requests without one (chunked)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        limit = upload_limit(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        length = Headers(scope=scope).get("content-length")
+        if length and length.isdigit() and int(length) > limit:
+            await self.reject(limit, scope, receive, send)
+            return
+
+        received = 0
+        too_large = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, too_large
+            if too_large:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # The app sees a disconnect and stops reading, the 413 is sent below
+                    too_large = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message: Message):
+            nonlocal response_started
+            if too_large and not response_started:
+                return  # the app's answer to the cut-off body is replaced by the 413
+            response_started = True
+            await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
+        if too_large and not response_started:
+            await self.reject(limit, scope, receive, send)
+
+    @staticmethod
+    async def reject(limit: int, scope: Scope, receive: Receive, send: Send):
+        response = JSONResponse(
+            status_code=413,
+            content={"error": "File too large", "detail": f"Maximum upload size is {limit - MULTIPART_OVERHEAD} bytes"},
+        )
+        await response(scope, receive, send)
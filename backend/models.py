@@ -2,7 +2,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Text, JSON, Integer
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Text, JSON, Integer, Index
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -40,8 +40,49 @@ class Candidate(Base):
     weaknesses = Column(JSON)
     recommendation = Column(String)
     status = Column(String, default="new")
+    stage_results = Column(JSON)  # {stage: {"hash": input hash, "output": ...}} - reused by re-scoring
+    scoring_mode = Column(String, default="full")  # full / degraded / fast_reject - degraded ones get re-scored later, fast_reject on request
+    content_hash = Column(String)  # SHA-256 of the uploaded file
+    text_hash = Column(String)  # SHA-256 of the normalized extracted text
     created_at = Column(DateTime, default=datetime.utcnow)
     job = relationship("Job", back_populates="candidates")
+    skill_index = relationship("CandidateSkill", cascade="all, delete-orphan", passive_deletes=True)
+    __table_args__ = (
+        Index("ix_candidates_job_content_hash", "job_id", "content_hash"),
+        Index("ix_candidates_job_text_hash", "job_id", "text_hash"),
+    )
+
+class CVDocument(Base):
+    """Content-addressed store of uploaded CVs: file hash -> extracted text + parsed CV, shared by all jobs"""
+    __tablename__ = "cv_documents"
+    content_hash = Column(String, primary_key=True)  # SHA-256 of the file bytes
+    text_hash = Column(String, nullable=False, index=True)
+    text = Column(Text, nullable=False)
+    parsed_cv = Column(JSON)  # job-independent LLM parse, None until a non-degraded parse succeeded
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class CandidateSkill(Base):
+    """Inverted skill index: canonical skill key -> candidates of a job"""
+    __tablename__ = "candidate_skills"
+    candidate_id = Column(String, ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True)
+    skill = Column(String, primary_key=True)  # canonical taxonomy key, parents included
+    job_id = Column(String, ForeignKey("jobs.id"), nullable=False)
+    __table_args__ = (Index("ix_candidate_skills_job_skill", "job_id", "skill"),)
+
+class ProcessingTask(Base):
+    """Background CV upload (202 + task ID), persisted so queued work survives restarts"""
+    __tablename__ = "processing_tasks"
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    job_id = Column(String, ForeignKey("jobs.id"), nullable=False)
+    status = Column(String, default="queued", index=True)  # queued / running / done / failed
+    stage = Column(String, default="queued")  # queued / extracting / parsing / scoring / saving / done / duplicate
+    progress = Column(Integer, default=0)
+    file_path = Column(String)  # stored upload, removed once processed
+    filename = Column(String)
+    candidate_id = Column(String, ForeignKey("candidates.id", ondelete="SET NULL"))
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class User(Base):
     __tablename__ = "users"
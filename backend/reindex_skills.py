@@ -0,0 +1,41 @@
+"""
+Rebuild the candidate skill index (candidate_skills) from stored parsed CVs.
+
+Run once after `alembic upgrade head` on a database that already had candidates
+(the index migration only creates the table), and after every skill taxonomy change:
+    python reindex_skills.py              # all jobs
+    python reindex_skills.py --job <id>   # one job
+"""
+import argparse
+import asyncio
+import logging
+from typing import Optional
+from sqlalchemy import select
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+async def reindex(job_id: Optional[str] = None) -> int:
+    from database import AsyncSessionLocal, engine
+    from models import Job
+    from services.skill_index import reindex_job
+
+    rows = 0
+    try:
+        async with AsyncSessionLocal() as db:
+            job_ids = [job_id] if job_id else (await db.execute(select(Job.id))).scalars().all()
+            for current in job_ids:
+                rows += await reindex_job(db, current)
+    finally:
+        await engine.dispose()
+    logger.info(f"🗂️ Skill index rebuilt: {len(job_ids)} jobs, {rows} entries")
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--job", help="only this job ID")
+    args = parser.parse_args()
+    asyncio.run(reindex(args.job))
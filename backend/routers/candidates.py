@@ -1,27 +1,53 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, delete
+from sqlalchemy.orm.attributes import flag_modified
 from typing import List, Optional
 from uuid import UUID
 from database import get_db
-from models import Job, Candidate
+from models import Job, Candidate, CandidateSkill, ProcessingTask
 from schemas import CandidateResponse, CandidateUpdate, CandidateNote
-from services.pdf_parser import PDFParserService
-from services.llm_service import LLMService
-from services.agents.orchestrator import MultiAgentOrchestrator
+from services.llm_scheduler import llm_scheduler, LLMOverloadedError
+from services.circuit_breaker import degraded_mode
+from services.agents.registry import agent_registry
+from services.rescoring import apply_scoring
+from services.skill_index import filter_by_skills
+from services.bulk_screener import bulk_screener
+from services.cv_processing import ALLOWED_TYPES, process_upload, reparse_candidate, save_upload, upload_result
+from services.cv_store import content_hash, find_duplicate
+from services.task_queue import cv_task_queue
+from services.extraction_pool import ExtractionError
+from services.bulk_upload import BulkUploadTooLarge, collect_cv_files, bulk_upload_stream
 from config import settings
+import asyncio
 import logging
 
 router = APIRouter(prefix="/api", tags=["candidates"])
 logger = logging.getLogger(__name__)
 
-pdf_parser = PDFParserService()
-llm_service = LLMService()
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+async def read_upload(file: UploadFile, limit: int) -> bytes:
+    """
+    Upload content read in chunks - rejected as soon as it grows past the limit.
+    The request body itself is capped while streaming by UploadSizeLimitMiddleware,
+    this is the per-file limit on the already spooled part.
+    """
+    if file.size is not None and file.size > limit:
+        raise HTTPException(status_code=413, detail=f"File too large (max {limit} bytes)")
+    content = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        content += chunk
+        if len(content) > limit:
+            raise HTTPException(status_code=413, detail=f"File too large (max {limit} bytes)")
+    return bytes(content)
 
 @router.post("/jobs/{job_id}/upload", status_code=status.HTTP_201_CREATED)
 async def upload_cv(
     job_id: UUID,
     file: UploadFile = File(...),
+    background: bool = Query(False, alias="async", description="Return 202 + task ID, process in background"),
     db: AsyncSession = Depends(get_db)
 ):
     """Upload CV for job application"""
@@ -33,67 +59,90 @@ async def upload_cv(
         raise HTTPException(status_code=404, detail="Job not found")
     
     # Validate file type
-    allowed_types = ["application/pdf", "text/plain", "application/msword"]
-    if file.content_type not in allowed_types:
+    if file.content_type not in ALLOWED_TYPES:
         raise HTTPException(status_code=422, detail="Invalid file type")
     
-    try:
-        # Save file temporarily
-        import tempfile
-        from pathlib import Path
-        
-        temp_file = Path(tempfile.mktemp(suffix=Path(file.filename).suffix))
-        content = await file.read()
-        temp_file.write_bytes(content)
-        
-        # Parse CV
-        cv_text = pdf_parser.extract_text(str(temp_file))
-        temp_file.unlink()
-        
-        # Parse CV with LLM
-        parsed_cv = await llm_service.parse_cv(cv_text)
-        
-        # Score candidate
-        if settings.USE_MULTI_AGENT:
-            orchestrator = MultiAgentOrchestrator()
-            scoring_result = await orchestrator.process_candidate(
-                cv_data=parsed_cv,
-                job_requirements=job.requirements
-            )
-        else:
-            scoring_result = await llm_service.score_candidate(
-                parsed_cv, 
-                job.requirements
-            )
-        
-        # Create candidate
-        candidate = Candidate(
-            job_id=job_id,
-            name=parsed_cv.get("name", "Unknown"),
-            email=parsed_cv.get("email", ""),
-            parsed_cv=parsed_cv,
-            score=scoring_result.get("score", 0),
-            strengths=scoring_result.get("strengths", []),
-            weaknesses=scoring_result.get("weaknesses", []),
-            recommendation=scoring_result.get("recommendation", "pending"),
-            status="new"
+    content = await read_upload(file, settings.MAX_UPLOAD_SIZE)
+    
+    # Same file already uploaded to this job - answered without queueing or LLM calls
+    sha = content_hash(content)
+    existing = await find_duplicate(db, job.id, content_hash=sha)
+    if existing is not None:
+        return JSONResponse(status_code=status.HTTP_200_OK, content=upload_result(existing, duplicate=True))
+    
+    if background:
+        # Store file + task row, a CV worker does the rest (progress at /api/tasks/{id})
+        cv_task_queue.check_capacity()
+        task = ProcessingTask(job_id=str(job_id), filename=file.filename)
+        db.add(task)
+        await db.flush()
+        task.file_path = await cv_task_queue.store_upload(task.id, file.filename, content)
+        await db.commit()
+        try:
+            await cv_task_queue.submit(task.id)
+        except Exception:
+            # Client gets 503 without a task ID - nobody would ever poll or retry this row
+            await cv_task_queue.discard(db, task)
+            raise
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"task_id": task.id, "status": task.status, "status_url": f"/api/tasks/{task.id}"},
+            headers={"Location": f"/api/tasks/{task.id}"}
         )
+    
+    # Backpressure - reject before parsing if Ollama is already saturated
+    llm_scheduler.check_capacity()
+    
+    try:
+        # Content-addressed store + text dedup, then parse in memory (no temp files) and score
+        outcome = await process_upload(db, job, file.filename, content, content_sha=sha)
+        if outcome.duplicate:
+            return JSONResponse(status_code=status.HTTP_200_OK, content=upload_result(outcome.candidate, duplicate=True))
         
-        db.add(candidate)
+        await save_upload(db, outcome)
         await db.commit()
-        await db.refresh(candidate)
+        await db.refresh(outcome.candidate)
         
-        return {
-            "candidate_id": candidate.id,
-            "score": candidate.score,
-            "recommendation": candidate.recommendation
-        }
+        return upload_result(outcome.candidate)
         
+    except LLMOverloadedError:
+        await db.rollback()
+        raise
+    except ExtractionError as e:
+        await db.rollback()
+        raise HTTPException(status_code=422, detail=f"Could not read CV: {e}")
     except Exception as e:
         await db.rollback()
         logger.error(f"Error processing CV: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/jobs/{job_id}/upload/bulk")
+async def upload_cv_bulk(
+    job_id: UUID,
+    files: List[UploadFile] = File(..., description="CV files and/or ZIP archives"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Bulk CV import - streams NDJSON progress, one line per file"""
+    result = await db.execute(select(Job).where(Job.id == job_id))
+    job = result.scalar_one_or_none()
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    # Read everything before streaming - uploads are closed once the handler returns
+    uploads, remaining = [], settings.BULK_UPLOAD_MAX_SIZE
+    for f in files:
+        content = await read_upload(f, remaining)
+        remaining -= len(content)
+        uploads.append((f.filename, f.content_type, content))
+    try:
+        # ZIPs are inflated off the event loop, limits checked before any entry is read
+        cv_files = await asyncio.to_thread(collect_cv_files, uploads)
+    except BulkUploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    return StreamingResponse(bulk_upload_stream(job, cv_files), media_type="application/x-ndjson")
+
 @router.get("/jobs/{job_id}/candidates", response_model=List[CandidateResponse])
 async def list_candidates(
     job_id: UUID,
@@ -101,11 +150,16 @@ async def list_candidates(
     limit: int = Query(20, ge=1, le=100),
     status_filter: Optional[str] = Query(None, alias="status"),
     min_score: Optional[int] = Query(None, ge=0, le=100),
+    skills: Optional[str] = Query(None, description="Comma-separated skills, e.g. kubernetes,python"),
+    skills_mode: str = Query("and", pattern="^(and|or)$", description="and = all skills, or = any skill"),
     db: AsyncSession = Depends(get_db)
 ):
     """List candidates for specific job"""
     query = select(Candidate).where(Candidate.job_id == job_id)
     
+    if skills:
+        query = filter_by_skills(query, job_id, [s for s in skills.split(",") if s.strip()], skills_mode)
+    
     if status_filter:
         query = query.where(Candidate.status == status_filter)
     
@@ -155,6 +209,48 @@ async def update_candidate(
     
     return candidate
 
+@router.post("/candidates/{candidate_id}/analyze", response_model=CandidateResponse)
+async def analyze_candidate(
+    candidate_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Run full multi-agent analysis for a fast-rejected (or degraded) candidate.
+    Degraded ones are re-parsed from the stored CV text first (409 when it is not stored).
+    """
+    result = await db.execute(select(Candidate).where(Candidate.id == candidate_id))
+    candidate = result.scalar_one_or_none()
+    
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    if degraded_mode():
+        raise HTTPException(status_code=503, detail="LLM unavailable - try again later")
+    llm_scheduler.check_capacity()
+    
+    # The keyword-fallback parse is not worth a full analysis - parse the CV properly first
+    reparsed = False
+    if candidate.scoring_mode == "degraded":
+        reparsed = await reparse_candidate(db, candidate)
+        if not reparsed:
+            raise HTTPException(status_code=409, detail="CV text of this degraded candidate is not stored or could not be parsed - upload the CV again")
+    
+    job = (await db.execute(select(Job).where(Job.id == candidate.job_id))).scalar_one()
+    orchestrator = agent_registry.orchestrator
+    scoring_result = await orchestrator.process_candidate(
+        cv_data=candidate.parsed_cv or {},
+        job_requirements=job.requirements,
+        company_id=job.company_id,
+        fast_reject=False,
+        cached_stages=candidate.stage_results
+    )
+    apply_scoring(candidate, scoring_result, reparsed=reparsed)
+    
+    await db.commit()
+    await db.refresh(candidate)
+    
+    return candidate
+
 @router.delete("/candidates/{candidate_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_candidate(
     candidate_id: UUID,
@@ -167,8 +263,12 @@ async def delete_candidate(
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
+    # Explicit - SQLite doesn't enforce ON DELETE CASCADE without PRAGMA foreign_keys
+    await db.execute(delete(CandidateSkill).where(CandidateSkill.candidate_id == candidate.id))
+    job_id = candidate.job_id
     await db.delete(candidate)
     await db.commit()
+    bulk_screener.invalidate(job_id)
     
     return None
 
@@ -198,6 +298,7 @@ async def add_candidate_note(
         "created_at": datetime.utcnow().isoformat(),
         "author": "recruiter"  # Will be replaced with actual user
     })
+    flag_modified(candidate, "parsed_cv")  # in-place JSON change isn't tracked
     
     await db.commit()
     
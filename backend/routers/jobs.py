@@ -7,6 +7,7 @@ from database import get_db
 from models import Job, Company, Candidate, User
 from schemas import JobCreate, JobUpdate, JobResponse, JobStats
 from middleware.auth import require_auth
+from services.rescoring import job_rescorer
 import logging
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
@@ -83,6 +84,7 @@ async def update_job(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
+    previous_requirements = job.requirements
     update_data = job_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         if field == "requirements" and hasattr(value, 'dict'):
@@ -91,6 +93,10 @@ async def update_job(
     
     await db.commit()
     await db.refresh(job)
+    
+    # Stale scores - re-score candidates in background (cached stages are reused)
+    if job.requirements != previous_requirements:
+        job_rescorer.schedule(job.id)
     return job
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
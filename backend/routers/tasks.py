@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from uuid import UUID
+from database import get_db
+from models import ProcessingTask
+from schemas import TaskResponse
+import logging
+
+router = APIRouter(prefix="/api", tags=["tasks"])
+logger = logging.getLogger(__name__)
+
+@router.get("/tasks/{task_id}", response_model=TaskResponse)
+async def get_task(
+    task_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """Status of a background CV upload (stage, progress, candidate ID once done)"""
+    result = await db.execute(select(ProcessingTask).where(ProcessingTask.id == str(task_id)))
+    task = result.scalar_one_or_none()
+    
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    return task
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
@@ -6,6 +6,7 @@ from datetime import datetime
 class Requirements(BaseModel):
     must_have: List[str]
     nice_to_have: List[str]
+    fast_reject_threshold: Optional[float] = Field(None, ge=0, le=100)  # None = global default
 
 class JobCreate(BaseModel):
     title: str
@@ -46,6 +47,7 @@ class CandidateResponse(BaseModel):
     email: Optional[str]
     score: int
     status: str
+    scoring_mode: Optional[str] = "full"
     created_at: datetime
     class Config:
         from_attributes = True
@@ -59,6 +61,20 @@ class CandidateUpdate(BaseModel):
 class CandidateNote(BaseModel):
     text: str
 
+class TaskResponse(BaseModel):
+    id: UUID
+    job_id: UUID
+    status: str
+    stage: str
+    progress: int
+    filename: Optional[str] = None
+    candidate_id: Optional[UUID] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    class Config:
+        from_attributes = True
+
 class UserRegister(BaseModel):
     email: str
     password: str
@@ -7,6 +7,7 @@ from .screener_agent import ScreenerAgent
 from .analyzer_agent import AnalyzerAgent
 from .scorer_agent import ScorerAgent
 from .orchestrator import MultiAgentOrchestrator
+from .registry import AgentRegistry, agent_registry
 
 # Alias dla kompatybilności
 AgentOrchestrator = MultiAgentOrchestrator
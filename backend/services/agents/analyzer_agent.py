@@ -2,9 +2,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-from typing import Dict, Any, Optional
+import asyncio
+import json
+from typing import Dict, Any, List, Optional
 from .base_agent import BaseAgent
+from services.micro_batcher import MicroBatcher, batching_enabled
 from services.llm_service import LLMService
+from services.llm_schemas import ANALYSIS_SCHEMA
 
 class AnalyzerAgent(BaseAgent):
     """Agent analizujący - głęboka analiza experience + skills"""
@@ -15,6 +19,31 @@ class AnalyzerAgent(BaseAgent):
             description="Deep analysis of experience and qualifications"
         )
         self.llm = LLMService()
+        # Batch-priority requests for the same job share one process_batch call
+        self.batcher = MicroBatcher("analyzer", self._run_batch)
+    
+    async def analyze(self, cv_data: Dict[str, Any], job_requirements: Dict[str, Any], context: Optional[str] = None) -> Dict[str, Any]:
+        """
+        run() for the pipeline - at batch priority (bulk upload, re-scoring) concurrent
+        requests for the same job are sent as one process_batch call, interactive
+        requests never wait
+        """
+        if not batching_enabled():
+            return await self.run(cv_data, job_requirements, context=context)
+        
+        key = json.dumps(
+            [job_requirements.get("must_have", []), job_requirements.get("nice_to_have", []), context],
+            sort_keys=True,
+            default=str,
+        )
+        return await self.batcher.submit(key, cv_data, job_requirements, context)
+    
+    async def _run_batch(self, cv_list: List[Dict[str, Any]], job_requirements: Dict[str, Any], context: Optional[str]) -> List[Dict[str, Any]]:
+        with self.measure():
+            results = await self.process_batch(cv_list, job_requirements, context)
+        for cv_data, result in zip(cv_list, results):
+            self.log_interaction({"cv_data": cv_data, "job_requirements": job_requirements}, result)
+        return results
     
     async def process(self, cv_data: Dict[str, Any], job_requirements: Dict[str, Any], context: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -64,20 +93,80 @@ Return ONLY valid JSON:
 Be thorough but concise.
 """
         
-        response = await self.llm.generate(prompt, system="You are a senior recruitment analyst. Return only JSON.")
+        response = await self.llm.generate(
+            prompt,
+            system="You are a senior recruitment analyst. Return only JSON.",
+            stop_at_json=True,
+            format=ANALYSIS_SCHEMA,
+        )
         
-        try:
-            result = self.llm.extract_json(response)
+        result = self.llm.extract_json(response, call_site="analyzer")
+        if isinstance(result, dict):
             return result
-            
-        except Exception as e:
-            logger.info(f"❌ AnalyzerAgent Error: {e}")
-            return {
-                "strengths": [],
-                "weaknesses": ["Analysis failed"],
-                "red_flags": [],
-                "opportunities": [],
-                "seniority_level": "unknown",
-                "culture_fit_notes": "N/A",
-                "detailed_reasoning": "Error in analysis"
-            }
+        
+        logger.info(f"❌ AnalyzerAgent Error: no JSON object in response")
+        self.record_failure()
+        return self.failed_analysis()
+    
+    async def process_batch(
+        self,
+        cv_list: List[Dict[str, Any]],
+        job_requirements: Dict[str, Any],
+        context: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Analiza wielu kandydatów na jedno stanowisko - wymagania wysyłane raz na batch
+        Items with missing/invalid analysis are retried one by one with process()
+        """
+        
+        def build_prompt(chunk):
+            prompt = f"COMPANY CONTEXT:\n{context}\n\n" if context else ""
+            profiles = "\n\n".join(
+                f"""[{item_id}]
+- Skills: {cv.get('skills', [])}
+- Experience: {cv.get('experience', [])}
+- Education: {cv.get('education', [])}"""
+                for item_id, cv in chunk
+            )
+            prompt += f"""You are a SENIOR recruitment analyst with 15+ years experience.
+
+JOB REQUIREMENTS:
+Must have: {job_requirements.get('must_have', [])}
+Nice to have: {job_requirements.get('nice_to_have', [])}
+
+CANDIDATE PROFILES:
+{profiles}
+
+Task: Perform DEEP analysis of EACH candidate independently (experience, career progression,
+technology stack, education relevance, red flags).
+
+Return ONLY valid JSON with one entry per candidate id:
+{{"results": [{{"id": "c1", "strengths": [], "weaknesses": [], "red_flags": [], "opportunities": [],
+"seniority_level": "junior/mid/senior/lead", "culture_fit_notes": "...", "detailed_reasoning": "..."}}]}}
+"""
+            return prompt
+        
+        results = await self.llm.generate_batch(
+            cv_list,
+            build_prompt,
+            system="You are a senior recruitment analyst. Return only JSON.",
+            item_schema=ANALYSIS_SCHEMA,
+            call_site="analyzer",
+        )
+        retries = [i for i, result in enumerate(results) if result is None]
+        retried = await asyncio.gather(*(self.process(cv_list[i], job_requirements, context) for i in retries))
+        for i, result in zip(retries, retried):
+            results[i] = result
+        return results
+    
+    @staticmethod
+    def failed_analysis() -> Dict[str, Any]:
+        return {
+            "strengths": [],
+            "weaknesses": ["Analysis failed"],
+            "red_flags": [],
+            "opportunities": [],
+            "seniority_level": "unknown",
+            "culture_fit_notes": "N/A",
+            "detailed_reasoning": "Error in analysis"
+        }
@@ -2,9 +2,16 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+import random
+import time
 from abc import ABC
+from collections import deque
+from contextlib import contextmanager
 from typing import Any, Dict
 from datetime import datetime
+from config import settings
+from services.llm_service import llm_caller
+from services.metrics import AGENT_LATENCY, AGENT_FAILURES
 
 class BaseAgent:
     """Base class dla wszystkich specialized agents"""
@@ -12,15 +19,42 @@ class BaseAgent:
     def __init__(self, name: str, description: str = ""):
         self.name = name
         self.description = description
-        self.memory = []
+        # Bounded + sampled - agents live for the whole process
+        self.memory = deque(maxlen=settings.AGENT_MEMORY_SIZE)
     
     # Removed @abstractmethod - each agent can have its own signature
     async def process(self, *args, **kwargs) -> Dict[str, Any]:
         """Główna logika agenta - implemented by subclasses"""
         raise NotImplementedError(f"{self.name} must implement process()")
     
+    async def run(self, *args, **kwargs) -> Dict[str, Any]:
+        """process() with per-agent metrics (latency, failures, LLM tokens)"""
+        with self.measure():
+            output = await self.process(*args, **kwargs)
+        self.log_interaction({"args": args, "kwargs": kwargs}, output)
+        return output
+    
+    @contextmanager
+    def measure(self):
+        """Time a call and attribute the LLM tokens it uses to this agent"""
+        token = llm_caller.set(self.name)
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.record_failure()
+            raise
+        finally:
+            AGENT_LATENCY.labels(agent=self.name).observe(time.perf_counter() - start)
+            llm_caller.reset(token)
+    
+    def record_failure(self):
+        AGENT_FAILURES.labels(agent=self.name).inc()
+    
     def log_interaction(self, input_data: Dict, output: Dict):
-        """Log dla Kaizen learning"""
+        """Log dla Kaizen learning (sampled)"""
+        if random.random() >= settings.AGENT_MEMORY_SAMPLE_RATE:
+            return
         self.memory.append({
             "input": input_data,
             "output": output,
@@ -2,19 +2,31 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from .screener_agent import ScreenerAgent
 from .analyzer_agent import AnalyzerAgent
 from .scorer_agent import ScorerAgent
+from .pipeline import AgentPipeline, Stage
 from config import settings
+from services.circuit_breaker import degraded_mode
+from services.metrics import PIPELINE_FAST_REJECTS
+from services.skill_taxonomy import skill_taxonomy
+import asyncio
 
 class MultiAgentOrchestrator:
     """Orchestrates multiple AI agents for candidate evaluation"""
     
-    def __init__(self):
-        self.screener = ScreenerAgent()
-        self.analyzer = AnalyzerAgent()
-        self.scorer = ScorerAgent()
+    def __init__(
+        self,
+        screener: Optional[ScreenerAgent] = None,
+        analyzer: Optional[AnalyzerAgent] = None,
+        scorer: Optional[ScorerAgent] = None
+    ):
+        """Long-lived - use agent_registry.orchestrator instead of creating one per request"""
+        self.screener = screener or ScreenerAgent()
+        self.analyzer = analyzer or AnalyzerAgent()
+        self.scorer = scorer or ScorerAgent()
+        self.extra_stages: List[Stage] = []
         
         logger.info("🤖 Multi-Agent System initialized")
         logger.info("   - ScreenerAgent: Filters candidates by must-have skills")
@@ -24,57 +36,217 @@ class MultiAgentOrchestrator:
         if settings.USE_RAG_CONTEXT:
             logger.info("   - RAG Context: ✅ ENABLED")
     
+    def add_stage(self, stage: Stage):
+        """Plug an extra agent into the pipeline - it runs as soon as its declared inputs are ready"""
+        self.extra_stages.append(stage)
+    
+    @staticmethod
+    def fast_reject_threshold(job_requirements: Dict[str, Any]) -> float:
+        """Per-job early-exit threshold (requirements.fast_reject_threshold), 0 = always analyze"""
+        threshold = job_requirements.get("fast_reject_threshold")
+        if threshold is None:
+            threshold = settings.FAST_REJECT_THRESHOLD
+        return float(threshold or 0)
+    
+    @staticmethod
+    def is_fast_reject(screening_result: Dict[str, Any], threshold: float) -> bool:
+        return threshold > 0 and screening_result.get("match_percentage", 100) < threshold
+    
+    @staticmethod
+    def analysis_key(cv_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> Dict[str, Any]:
+        """What the AnalyzerAgent output depends on (recruiter notes live in parsed_cv but don't count)"""
+        return {
+            "cv": {k: v for k, v in cv_data.items() if k != "notes"},
+            "must_have": job_requirements.get("must_have", []),
+            "nice_to_have": job_requirements.get("nice_to_have", []),
+        }
+    
+    def build_stages(
+        self,
+        degraded: bool = False,
+        fast_reject_threshold: float = 0,
+        analysis: Optional[Dict[str, Any]] = None,
+        screening: Optional[Dict[str, Any]] = None
+    ) -> List[Stage]:
+        """
+        Candidate pipeline as a dependency graph:
+            rag ─────────────┐
+                             ├─> analysis ─┐
+            (cv, job) ───────┘             ├─> scoring
+            screening ─────────────────────┘
+        Screening needs neither RAG nor the LLM, so it overlaps with both.
+        With a fast-reject threshold the analysis also waits for screening,
+        so hopeless candidates never reach the LLM. A ready `analysis`
+        (single-pass parse-and-analyze) replaces the AnalyzerAgent call, a ready
+        `screening` (bulk screening of the whole job) the ScreenerAgent call.
+        """
+        timeouts = settings.PIPELINE_STAGE_TIMEOUTS
+        stages = [
+            Stage(
+                "rag",
+                # SentenceTransformer encoding is CPU-bound - keep it off the event loop
+                lambda job_requirements, company_id: asyncio.to_thread(self.company_context, job_requirements, company_id),
+                inputs=("job_requirements", "company_id"),
+                timeout=timeouts.get("rag"),
+                fallback=lambda **_: "",
+                lazy=True,  # not needed when the analysis is cached or precomputed
+            ),
+            Stage(
+                "screening",
+                (lambda: screening) if screening is not None else self.screener.run,
+                inputs=() if screening is not None else ("cv_data", "job_requirements"),
+                timeout=timeouts.get("screening"),
+                # Semantic model still loading - exact taxonomy matching instead of a failed pipeline
+                fallback=None if screening is not None else self.screener.exact_screening,
+                cache_key=lambda cv_data, job_requirements: {
+                    "skills": cv_data.get("skills", []),
+                    "must_have": job_requirements.get("must_have", []),
+                    "taxonomy": skill_taxonomy.version,
+                    "match_mode": settings.SKILL_MATCH_MODE,
+                    "semantic_threshold": settings.SKILL_SEMANTIC_THRESHOLD,
+                },
+            ),
+        ]
+        if analysis is not None:
+            stages.append(Stage("analysis", lambda: analysis, cache_key=self.analysis_key))
+        elif degraded:
+            # Not cached - degraded results get re-scored once Ollama is back
+            stages.append(Stage("analysis", lambda screening: self.deterministic_analysis(screening), inputs=("screening",)))
+        elif fast_reject_threshold > 0:
+            async def analyze(cv_data, job_requirements, rag, screening):
+                if self.is_fast_reject(screening, fast_reject_threshold):
+                    return self.deterministic_analysis(screening)
+                return await self.analyzer.analyze(cv_data, job_requirements, context=rag or None)
+            
+            stages.append(Stage(
+                "analysis",
+                analyze,
+                inputs=("cv_data", "job_requirements", "rag", "screening"),
+                timeout=timeouts.get("analysis"),
+                fallback=lambda **_: AnalyzerAgent.failed_analysis(),
+                cache_key=lambda cv_data, job_requirements, screening: {
+                    **self.analysis_key(cv_data, job_requirements),
+                    "fast_reject": self.is_fast_reject(screening, fast_reject_threshold),
+                },
+            ))
+        else:
+            stages.append(Stage(
+                "analysis",
+                lambda cv_data, job_requirements, rag: self.analyzer.analyze(cv_data, job_requirements, context=rag or None),
+                inputs=("cv_data", "job_requirements", "rag"),
+                timeout=timeouts.get("analysis"),
+                fallback=lambda **_: AnalyzerAgent.failed_analysis(),
+                cache_key=self.analysis_key,
+            ))
+        stages.append(Stage(
+            "scoring",
+            lambda cv_data, job_requirements, screening, analysis: self.scorer.run(cv_data, job_requirements, screening, analysis),
+            inputs=("cv_data", "job_requirements", "screening", "analysis"),
+            timeout=timeouts.get("scoring"),
+        ))
+        return stages + self.extra_stages
+    
     async def process_candidate(
         self, 
         cv_data: Dict[str, Any], 
         job_requirements: Dict[str, Any],
-        company_id: str = None
+        company_id: str = None,
+        fast_reject: bool = True,
+        analysis: Optional[Dict[str, Any]] = None,
+        cached_stages: Optional[Dict[str, Dict[str, Any]]] = None,
+        screening: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Process candidate through multi-agent pipeline"""
+        """
+        Process candidate through multi-agent pipeline (independent stages run concurrently).
+        fast_reject=False forces the full LLM analysis (recruiter asked for it).
+        analysis - result of LLMService.parse_and_analyze, skips the AnalyzerAgent call.
+        cached_stages - previous result["stage_results"]; stages whose inputs didn't change are reused.
+        screening - ScreenerAgent output computed for the whole job at once (ScreenerAgent.process_job).
+        """
         
         logger.info("\n🚀 Starting Multi-Agent Pipeline...")
         
-        # Get RAG context if enabled
-        company_context = ""
-        if settings.USE_RAG_CONTEXT:
-            try:
-                from services.rag_service import get_rag
-                rag = get_rag()
-                if rag:
-                    query = f"Hiring for {job_requirements.get('title', 'position')} with skills {job_requirements.get('must_have', [])}"
-                    company_context = rag.build_context(query, company_id=company_id)
-                    logger.info(f"   📚 RAG Context loaded: {len(company_context)} chars")
-            except Exception as e:
-                logger.info(f"   ⚠️ RAG Context failed: {e}")
-        
-        # Stage 1: Screener
-        logger.info("   1️⃣ ScreenerAgent checking requirements...")
-        screening_result = await self.screener.process(cv_data, job_requirements)
-        logger.info(f"      ✅ Passes screening: {screening_result.get('passes', False)}")
+        # Analyzer is replaced by a deterministic stand-in while Ollama is down
+        degraded = analysis is None and degraded_mode()
+        if degraded:
+            logger.info("   ⚠️ LLM unavailable - skipping AnalyzerAgent (degraded mode)")
         
-        # Stage 2: Analyzer (with RAG context)
-        logger.info("   2️⃣ AnalyzerAgent performing deep analysis...")
-        analysis_result = await self.analyzer.process(
-            cv_data, 
-            job_requirements,
-            context=company_context if company_context else None
+        threshold = self.fast_reject_threshold(job_requirements) if fast_reject and analysis is None else 0
+        pipeline = AgentPipeline(
+            self.build_stages(degraded, threshold, analysis, screening),
+            initial_inputs=("cv_data", "job_requirements", "company_id"),
+            cached=cached_stages,
         )
-        logger.info(f"      ✅ Strengths found: {len(analysis_result.get('strengths', []))}")
+        outputs, report = await pipeline.run(cv_data=cv_data, job_requirements=job_requirements, company_id=company_id)
         
-        # Stage 3: Scorer
-        logger.info("   3️⃣ ScorerAgent calculating final score...")
-        scoring_result = await self.scorer.process(
-            cv_data,
-            job_requirements,
-            screening_result,
-            analysis_result
-        )
+        scoring_result = outputs["scoring"]
+        logger.info(f"      ✅ Passes screening: {outputs['screening'].get('passes', False)}")
+        logger.info(f"      ✅ Strengths found: {len(outputs['analysis'].get('strengths', []))}")
         logger.info(f"      ✅ Final score: {scoring_result.get('score', 0)}/100")
         logger.info(f"      ✅ Recommendation: {scoring_result.get('recommendation', 'unknown')}")
         
-        logger.info("\n✨ Multi-Agent Pipeline completed!")
+        # Analyzer timed out / returned nothing usable - stored as degraded so re-scoring retries it
+        analysis_failed = outputs["analysis"] == AnalyzerAgent.failed_analysis()
+        if degraded or analysis_failed:
+            self.mark_degraded(scoring_result)
+        elif self.is_fast_reject(outputs["screening"], threshold):
+            logger.info(f"   ⏩ Fast reject: match {outputs['screening'].get('match_percentage', 0):.0f}% < {threshold:.0f}% - AnalyzerAgent skipped")
+            self.mark_fast_reject(scoring_result)
+        stage_results = report.pop("stage_results")
+        if analysis_failed:
+            stage_results.pop("analysis", None)  # retry the LLM next time
+        scoring_result["stage_results"] = stage_results
+        scoring_result["pipeline"] = report
+        extras = {stage.name: outputs[stage.name] for stage in self.extra_stages}
+        if extras:
+            scoring_result["agents"] = extras
+        
+        logger.info(f"\n✨ Multi-Agent Pipeline completed in {report['total_ms']} ms")
         
         return scoring_result
+    
+    def company_context(self, job_requirements: Dict[str, Any], company_id: str = None) -> str:
+        """RAG lookup for company knowledge (empty string if disabled/failed)"""
+        if not settings.USE_RAG_CONTEXT:
+            return ""
+        try:
+            from services.rag_service import get_rag
+            rag = get_rag()
+            if rag:
+                query = f"Hiring for {job_requirements.get('title', 'position')} with skills {job_requirements.get('must_have', [])}"
+                company_context = rag.build_context(query, company_id=company_id)
+                logger.info(f"   📚 RAG Context loaded: {len(company_context)} chars")
+                return company_context
+        except Exception as e:
+            logger.info(f"   ⚠️ RAG Context failed: {e}")
+        return ""
+    
+    @staticmethod
+    def mark_degraded(scoring_result: Dict[str, Any]) -> Dict[str, Any]:
+        scoring_result["degraded"] = True
+        scoring_result["scoring_mode"] = "degraded"
+        scoring_result["reasoning"] += " Degraded mode (no LLM analysis) - re-score later."
+        return scoring_result
+    
+    @staticmethod
+    def mark_fast_reject(scoring_result: Dict[str, Any]) -> Dict[str, Any]:
+        PIPELINE_FAST_REJECTS.inc()
+        scoring_result["scoring_mode"] = "fast_reject"
+        scoring_result["reasoning"] += " Fast reject below match threshold (no LLM analysis) - full analysis on request."
+        return scoring_result
+    
+    @staticmethod
+    def deterministic_analysis(screening_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Analysis stand-in built from screening only (no LLM) - neutral, no red flags"""
+        return {
+            "strengths": [f"Has {skill}" for skill in screening_result.get("matching_skills", [])],
+            "weaknesses": [f"Missing {skill}" for skill in screening_result.get("missing_skills", [])],
+            "red_flags": [],
+            "opportunities": [],
+            "seniority_level": "unknown",
+            "culture_fit_notes": "N/A",
+            "detailed_reasoning": "Skills-only screening, LLM analysis pending",
+        }
 
     def log_decision_to_kaizen(self, candidate_id: str, result: Dict):
         """Log decision to Kaizen for learning"""
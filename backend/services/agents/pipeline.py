@@ -0,0 +1,150 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import asyncio
+import hashlib
+import inspect
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+@dataclass
+class Stage:
+    """
+    One pipeline step. `run` is called with keyword arguments named after `inputs`
+    (initial values or outputs of other stages) and may be sync or async.
+    """
+    name: str
+    run: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    fallback: Optional[Callable[..., Any]] = None  # same kwargs; used on timeout (errors always propagate)
+    # Called with the inputs named in its own signature; returns JSON-able data the output depends on
+    cache_key: Optional[Callable[..., Any]] = None
+    lazy: bool = False  # run only when another stage needs the output
+
+def input_hash(data: Any) -> str:
+    """Stable hash of JSON-able stage inputs"""
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+class PipelineError(Exception):
+    pass
+
+class AgentPipeline:
+    """Runs stages as a dependency graph - each stage starts as soon as its inputs are ready"""
+    
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        initial_inputs: Iterable[str],
+        cached: Optional[Dict[str, Dict[str, Any]]] = None
+    ):
+        """cached - previous report["stage_results"]: {stage: {"hash": ..., "output": ...}}"""
+        self.stages = {stage.name: stage for stage in stages}
+        self.initial_inputs = set(initial_inputs)
+        self.cached = cached or {}
+        self._validate()
+    
+    @staticmethod
+    def _dependencies(stage: Stage) -> Tuple[str, ...]:
+        key_inputs = tuple(inspect.signature(stage.cache_key).parameters) if stage.cache_key else ()
+        return stage.inputs + key_inputs
+    
+    def _validate(self):
+        for stage in self.stages.values():
+            unknown = [i for i in self._dependencies(stage) if i not in self.stages and i not in self.initial_inputs]
+            if unknown:
+                raise PipelineError(f"Stage '{stage.name}' has unknown inputs: {unknown}")
+        # Cycle check (DFS)
+        state: Dict[str, int] = {}
+        
+        def visit(name: str):
+            if state.get(name) == 1:
+                raise PipelineError(f"Cycle in pipeline at stage '{name}'")
+            if state.get(name) == 2:
+                return
+            state[name] = 1
+            for dep in self._dependencies(self.stages[name]):
+                if dep in self.stages:
+                    visit(dep)
+            state[name] = 2
+        
+        for name in self.stages:
+            visit(name)
+    
+    async def run(self, **initial: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Returns (outputs by stage name, report with per-stage timings and timeouts).
+        Stages with a cache_key whose input hash matches `cached` are not re-run;
+        report["stage_results"] holds hashes + outputs to pass as `cached` next time.
+        """
+        missing = self.initial_inputs - set(initial)
+        if missing:
+            raise PipelineError(f"Missing pipeline inputs: {sorted(missing)}")
+        
+        pipeline_start = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+        report: Dict[str, Any] = {"timings_ms": {}, "timed_out": [], "failed": [], "reused": [], "stage_results": {}}
+        
+        def start(name: str) -> asyncio.Task:
+            if name not in tasks:
+                tasks[name] = asyncio.create_task(execute(self.stages[name]), name=f"stage:{name}")
+            return tasks[name]
+        
+        async def resolve(name: str) -> Any:
+            return initial[name] if name in initial else await start(name)
+        
+        async def gather_inputs(names: Iterable[str]) -> Dict[str, Any]:
+            names = list(names)
+            return dict(zip(names, await asyncio.gather(*(resolve(n) for n in names))))
+        
+        async def execute(stage: Stage) -> Any:
+            key = None
+            if stage.cache_key:
+                # Only the key's own inputs are awaited - a hit doesn't wait for (or start) the rest
+                key_kwargs = await gather_inputs(self._dependencies(stage)[len(stage.inputs):])
+                key = input_hash(stage.cache_key(**key_kwargs))
+                previous = self.cached.get(stage.name) or {}
+                if previous.get("hash") == key and "output" in previous:
+                    report["reused"].append(stage.name)
+                    report["stage_results"][stage.name] = previous
+                    return previous["output"]
+            kwargs = await gather_inputs(stage.inputs)
+            start_time = time.perf_counter()
+            try:
+                output = await asyncio.wait_for(self._call(stage.run, kwargs), timeout=stage.timeout)
+                if key is not None:
+                    report["stage_results"][stage.name] = {"hash": key, "output": output}
+                return output
+            except asyncio.TimeoutError:
+                report["timed_out"].append(stage.name)
+                logger.info(f"   ⏱️ Stage {stage.name} timed out after {stage.timeout}s")
+                if stage.fallback is None:
+                    raise
+                return await self._call(stage.fallback, kwargs)
+            except Exception as e:
+                report["failed"].append(stage.name)
+                logger.info(f"   ❌ Stage {stage.name} failed: {e!r}")
+                raise
+            finally:
+                report["timings_ms"][stage.name] = round((time.perf_counter() - start_time) * 1000, 1)
+        
+        eager = [start(name) for name, stage in self.stages.items() if not stage.lazy]
+        try:
+            # Lazy stages that got started are awaited by the stages that need them
+            await asyncio.gather(*eager)
+            outputs = {name: task.result() for name, task in tasks.items()}
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        report["total_ms"] = round((time.perf_counter() - pipeline_start) * 1000, 1)
+        return outputs, report
+    
+    @staticmethod
+    async def _call(fn: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+        result = fn(**kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
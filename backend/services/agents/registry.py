@@ -0,0 +1,82 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+from typing import Any, Callable, Dict, Optional, Tuple
+from .base_agent import BaseAgent
+from .screener_agent import ScreenerAgent
+from .analyzer_agent import AnalyzerAgent
+from .scorer_agent import ScorerAgent
+from .orchestrator import MultiAgentOrchestrator
+from .pipeline import Stage
+
+class AgentRegistry:
+    """
+    Process-wide agents, created once at startup and looked up by name.
+    Agents registered with `inputs` are also plugged into the orchestrator
+    pipeline as extra stages (called as agent.run(**inputs)).
+    """
+
+    CORE_AGENTS = ("screener", "analyzer", "scorer")  # wired into the orchestrator by role
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], BaseAgent]] = {}
+        self._stage_inputs: Dict[str, Tuple[str, ...]] = {}
+        self._agents: Dict[str, BaseAgent] = {}
+        self._orchestrator: Optional[MultiAgentOrchestrator] = None
+
+    def register(self, name: str, factory: Callable[[], BaseAgent], inputs: Optional[Tuple[str, ...]] = None):
+        """Register agent factory; with `inputs` the agent also runs as a pipeline stage named `name`"""
+        self._factories[name] = factory
+        self._agents.pop(name, None)
+        if name in self.CORE_AGENTS:
+            self._orchestrator = None  # rebuilt with the new agent on next use
+        if inputs is not None:
+            self._stage_inputs[name] = tuple(inputs)
+            if self._orchestrator is not None:
+                self._orchestrator.add_stage(self._stage(name))
+
+    def get(self, name: str) -> BaseAgent:
+        if name not in self._agents:
+            if name not in self._factories:
+                raise KeyError(f"Unknown agent: {name}")
+            self._agents[name] = self._factories[name]()
+        return self._agents[name]
+
+    def names(self):
+        return list(self._factories)
+
+    def _stage(self, name: str) -> Stage:
+        agent = self.get(name)
+        return Stage(name, lambda **kwargs: agent.run(**kwargs), inputs=self._stage_inputs[name])
+
+    @property
+    def orchestrator(self) -> MultiAgentOrchestrator:
+        if self._orchestrator is None:
+            orchestrator = MultiAgentOrchestrator(
+                screener=self.get("screener"),
+                analyzer=self.get("analyzer"),
+                scorer=self.get("scorer"),
+            )
+            for name in self._stage_inputs:
+                orchestrator.add_stage(self._stage(name))
+            self._orchestrator = orchestrator
+        return self._orchestrator
+
+    def init(self):
+        """Create all registered agents and the orchestrator (app startup)"""
+        for name in self._factories:
+            self.get(name)
+        self.orchestrator
+        logger.info(f"🤖 Agent registry ready: {', '.join(self.names())}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {"memory": len(agent.memory), "stage": name in self._stage_inputs}
+            for name, agent in self._agents.items()
+        }
+
+agent_registry = AgentRegistry()
+agent_registry.register("screener", ScreenerAgent)
+agent_registry.register("analyzer", AnalyzerAgent)
+agent_registry.register("scorer", ScorerAgent)
@@ -2,8 +2,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from .base_agent import BaseAgent
+from services.skill_taxonomy import skill_taxonomy
+from services.bulk_screener import bulk_screener
+from services.skill_embeddings import skill_embeddings, semantic_mode
+import asyncio
 
 class ScreenerAgent(BaseAgent):
     """Agent filtrujący - sprawdza must-have requirements"""
@@ -15,21 +19,73 @@ class ScreenerAgent(BaseAgent):
         )
     
     async def process(self, cv_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> Dict[str, Any]:
-        """Sprawdza czy kandydat spełnia MUST-HAVE requirements"""
+        """Sprawdza czy kandydat spełnia MUST-HAVE requirements (aliasy/hierarchia z taksonomii)"""
         
-        cv_skills = set(str(s).lower() for s in cv_data.get('skills', []))
-        must_have = set(str(s).lower() for s in job_requirements.get('must_have', []))
+        matching_skills, missing_skills, required = self.exact_match(cv_data, job_requirements)
         
-        missing_skills = must_have - cv_skills
-        matching_skills = must_have & cv_skills
+        # Semantic mode: exact misses get a second chance via embedding similarity ("ML" ~ "machine learning")
+        semantic = {}
+        if semantic_mode() and missing_skills:
+            semantic = await asyncio.to_thread(skill_embeddings.semantic_matches, missing_skills, cv_data.get('skills', []))
+            matching_skills += [name for name in missing_skills if name in semantic]
+            missing_skills = [name for name in missing_skills if name not in semantic]
         
+        return self.screening_result(matching_skills, missing_skills, required, semantic)
+    
+    def exact_screening(self, cv_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> Dict[str, Any]:
+        """process() bez embeddingów - fallback gdy model semantyczny nie zdąży (pierwsze ładowanie)"""
+        return self.screening_result(*self.exact_match(cv_data, job_requirements))
+    
+    @staticmethod
+    def exact_match(cv_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> Tuple[List[str], List[str], int]:
+        """(matching, missing, number of must-haves) by taxonomy IDs"""
+        # Unknown skills get IDs in a scope private to this call - they still match exactly;
+        # unknown CV skills no requirement names can't match and are skipped
+        scope = skill_taxonomy.scope()
+        must_have = skill_taxonomy.requirements(job_requirements.get('must_have', []), scope)
+        cv_skills = skill_taxonomy.encode(cv_data.get('skills', []), scope, extend=False)
+        
+        matching_skills = [name for skill_id, name in must_have.items() if skill_id in cv_skills]
+        missing_skills = [name for skill_id, name in must_have.items() if skill_id not in cv_skills]
+        return matching_skills, missing_skills, len(must_have)
+    
+    @staticmethod
+    def screening_result(matching_skills: List[str], missing_skills: List[str], required: int, semantic: Dict[str, Any] = None) -> Dict[str, Any]:
         passes = len(missing_skills) == 0
-        match_percentage = (len(matching_skills) / len(must_have) * 100) if must_have else 100
+        match_percentage = (len(matching_skills) / required * 100) if required else 100
         
-        return {
+        result = {
             "passes": passes,
-            "matching_skills": list(matching_skills),
-            "missing_skills": list(missing_skills),
+            "matching_skills": matching_skills,
+            "missing_skills": missing_skills,
             "match_percentage": match_percentage,
             "confidence": "high" if match_percentage >= 80 else "medium" if match_percentage >= 50 else "low"
         }
+        if semantic:
+            result["semantic_matches"] = semantic
+        return result
+    
+    async def process_job(
+        self,
+        job_id: Any,
+        candidates: List[Tuple[str, List[str]]],
+        job_requirements: Dict[str, Any],
+        top_k: Optional[int] = None,
+        min_match: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Screening wszystkich kandydatów joba - macierz bitsetów z cache (re-scoring), (candidate ID, skills).
+        top_k / min_match: tylko najlepsi kandydaci (best first), każdy z "candidate_id".
+        """
+        semantic = semantic_mode()
+        
+        def screen():
+            encoded = bulk_screener.job_matrix(job_id, candidates)
+            return bulk_screener.results(encoded, job_requirements, semantic, top_k, min_match)
+        
+        # Encoding a new job / building the dicts of a large one would block the event loop
+        screened = await asyncio.to_thread(screen)
+        if top_k is not None or min_match is not None:
+            for result in screened:
+                result["candidate_id"] = candidates[result.pop("row")][0]
+        return screened
@@ -0,0 +1,182 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from config import settings
+from services.skill_taxonomy import SkillScope, SkillTaxonomy, skill_taxonomy
+
+class EncodedSkills(NamedTuple):
+    bits: np.ndarray  # (n_candidates, n_words) uint64
+    scope: SkillScope  # IDs of skills outside the taxonomy used in `bits`
+    skill_lists: List[List[str]]
+    version: str  # taxonomy version
+
+class BulkScreener:
+    """
+    Vectorized must-have screening: each candidate is a row of uint64 words with one
+    bit per canonical skill ID (parents included). A job's must-have list becomes one
+    mask row, so screening N candidates is a single AND + popcount over the matrix.
+    The matrix of a job's candidates is cached (screen_job), so re-screening against
+    new requirements skips the encoding.
+    """
+
+    def __init__(self, taxonomy: SkillTaxonomy = skill_taxonomy):
+        self.taxonomy = taxonomy
+        self._jobs: "OrderedDict[str, Tuple[Tuple[int, str], EncodedSkills]]" = OrderedDict()
+        self.hits = self.misses = 0
+
+    def encode(self, skill_lists: Sequence[Iterable[str]]) -> EncodedSkills:
+        """Candidates' skills -> (n_candidates, n_words) uint64 bitset matrix"""
+        skill_lists = [list(skills or []) for skills in skill_lists]
+        scope = self.taxonomy.scope()
+        encoded = [self.taxonomy.encode(skills, scope) for skills in skill_lists]
+        n_words = max(1, (scope.size + 63) // 64)
+        matrix = np.zeros((len(encoded), n_words), dtype=np.uint64)
+        rows = np.repeat(np.arange(len(encoded)), [len(ids) for ids in encoded])
+        ids = np.fromiter((i for skill_ids in encoded for i in skill_ids), dtype=np.int64, count=len(rows))
+        np.bitwise_or.at(matrix, (rows, ids >> 6), np.left_shift(np.uint64(1), (ids & 63).astype(np.uint64)))
+        return EncodedSkills(matrix, scope, skill_lists, self.taxonomy.version)
+
+    def job_matrix(self, job_id: Any, candidates: Sequence[Tuple[str, Iterable[str]]]) -> EncodedSkills:
+        """
+        Encoded (candidate ID, skills) of a job, from the cache while the hash of the job's
+        candidate IDs and the taxonomy version are unchanged (checked on every call, so other
+        processes' inserts are noticed too). Skills of a known candidate change only on
+        re-parse, which calls invalidate().
+        """
+        job_id = str(job_id)
+        key = (hash(tuple(candidate_id for candidate_id, _ in candidates)), self.taxonomy.version)
+        cached = self._jobs.get(job_id)
+        if cached is not None and cached[0] == key:
+            self._jobs.move_to_end(job_id)
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        encoded = self.encode([skills for _, skills in candidates])
+        self._jobs[job_id] = (key, encoded)
+        self._jobs.move_to_end(job_id)
+        while len(self._jobs) > settings.BULK_SCREENER_CACHE_JOBS:
+            self._jobs.popitem(last=False)
+        return encoded
+
+    def invalidate(self, job_id: Any):
+        """Candidates of the job were added/removed"""
+        self._jobs.pop(str(job_id), None)
+
+    def requirement_bits(self, must_have: Iterable[str], encoded: EncodedSkills) -> Dict[str, Any]:
+        """Required skills -> mask row + (word, bit) per requirement; IDs past the matrix width match nobody"""
+        # Child scope - requirements unknown to the encoding get IDs past it without changing it
+        required = self.taxonomy.requirements(must_have, encoded.scope.child())
+        n_words = encoded.bits.shape[1]
+        ids = np.fromiter(required, dtype=np.int64, count=len(required))
+        inside = ids < n_words * 64
+        mask = np.zeros(n_words, dtype=np.uint64)
+        np.bitwise_or.at(mask, ids[inside] >> 6, np.left_shift(np.uint64(1), (ids[inside] & 63).astype(np.uint64)))
+        return {"names": list(required.values()), "ids": ids, "inside": inside, "mask": mask}
+
+    def screen(self, encoded: EncodedSkills, must_have: Iterable[str]) -> Dict[str, np.ndarray]:
+        """match count / percentage / passes for every row of an encoded matrix"""
+        bits = self.requirement_bits(must_have, encoded)
+        total = len(bits["ids"])
+        matched = np.bitwise_count(encoded.bits & bits["mask"]).sum(axis=1, dtype=np.int64)
+        if total == 0:
+            percentage = np.full(len(encoded.bits), 100.0)
+        else:
+            percentage = matched * 100.0 / total
+        return {"matched": matched, "match_percentage": percentage, "passes": matched == total}
+
+    def results(
+        self,
+        encoded: EncodedSkills,
+        job_requirements: Dict[str, Any],
+        semantic: bool = False,
+        top_k: Optional[int] = None,
+        min_match: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Same output as ScreenerAgent.process for every row of an encoded matrix, in row order.
+        With top_k / min_match only the returned rows (match_percentage >= min_match, best
+        top_k first) get a result dict, each with its "row" index.
+        """
+        matrix = encoded.bits
+        bits = self.requirement_bits(job_requirements.get("must_have", []), encoded)
+
+        # (n_candidates, n_requirements) membership, for the per-candidate skill lists
+        has = np.zeros((len(matrix), len(bits["ids"])), dtype=bool)
+        ids = bits["ids"][bits["inside"]]
+        has[:, bits["inside"]] = ((matrix[:, ids >> 6] >> (ids & 63).astype(np.uint64)) & np.uint64(1)) == 1
+        if semantic and not has.all():
+            has |= self.semantic_membership(encoded, bits["names"], has)
+
+        total = len(bits["names"])
+        selected = top_k is not None or min_match is not None
+        rows = np.arange(len(has))
+        if selected:
+            percentage = has.sum(axis=1) * 100.0 / total if total else np.full(len(has), 100.0)
+            rows = rows[percentage >= (min_match or 0)]
+            rows = rows[np.argsort(-percentage[rows], kind="stable")][:top_k]
+
+        # Rows share few match patterns (2^requirements at most) - one result per pattern, copied per row
+        patterns, row_pattern = np.unique(has[rows], axis=0, return_inverse=True)
+        templates = []
+        for row in patterns:
+            match_percentage = float(row.sum() * 100.0 / total) if total else 100.0
+            templates.append({
+                "passes": bool(row.all()),
+                "matching_skills": [name for name, hit in zip(bits["names"], row) if hit],
+                "missing_skills": [name for name, hit in zip(bits["names"], row) if not hit],
+                "match_percentage": match_percentage,
+                "confidence": "high" if match_percentage >= 80 else "medium" if match_percentage >= 50 else "low"
+            })
+        screened = [
+            {**template, "matching_skills": list(template["matching_skills"]), "missing_skills": list(template["missing_skills"])}
+            for template in (templates[i] for i in row_pattern.reshape(-1).tolist())
+        ]
+        if selected:
+            for result, row in zip(screened, rows.tolist()):
+                result["row"] = row
+        return screened
+
+    def screen_candidates(
+        self,
+        cv_list: List[Dict[str, Any]],
+        job_requirements: Dict[str, Any],
+        semantic: bool = False,
+        top_k: Optional[int] = None,
+        min_match: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Same output as ScreenerAgent.process, for a whole candidate list in one pass (encoded every call)"""
+        return self.results(self.encode([cv.get("skills", []) for cv in cv_list]), job_requirements, semantic, top_k, min_match)
+
+    def stats(self):
+        return {"cached_jobs": len(self._jobs), "hits": self.hits, "misses": self.misses}
+
+    def semantic_membership(self, encoded: EncodedSkills, names: List[str], has: np.ndarray) -> np.ndarray:
+        """
+        Embedding fallback for exact misses: one similarity matrix between the missed
+        requirements and the distinct skill strings of all candidates; close strings
+        become an OR-mask per requirement, applied to the bitset matrix.
+        """
+        from services.skill_embeddings import skill_embeddings
+        matrix, skill_lists = encoded.bits, encoded.skill_lists
+        missed = [name for name, column in zip(names, has.T) if not column.all()]
+        vocabulary = list(dict.fromkeys(str(skill) for skills in skill_lists for skill in skills or []))
+        matches = skill_embeddings.semantic_matches(missed, vocabulary)
+
+        scope = encoded.scope.child()  # matched strings come from the encoded lists, nothing new expected
+        extra = np.zeros_like(has)
+        for j, name in enumerate(names):
+            if name not in matches:
+                continue
+            mask = np.zeros(matrix.shape[1], dtype=np.uint64)
+            for skill in matches[name]:
+                skill_id = scope.id(skill)
+                if skill_id is not None and skill_id < matrix.shape[1] * 64:
+                    mask[skill_id >> 6] |= np.uint64(1) << np.uint64(skill_id & 63)
+            extra[:, j] = (matrix & mask).any(axis=1)
+        return extra
+
+bulk_screener = BulkScreener()
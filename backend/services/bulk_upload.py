@@ -0,0 +1,261 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import asyncio
+import io
+import json
+import time
+import uuid
+import zipfile
+from pathlib import PurePosixPath
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from config import settings
+from database import AsyncSessionLocal
+from models import Job, Candidate
+from services.llm_scheduler import Priority, priority_scope, LLMOverloadedError
+from services.cv_processing import ALLOWED_SUFFIXES, ALLOWED_TYPES, UploadOutcome, process_upload, save_upload, upload_result
+from services.cv_store import content_hash
+
+ZIP_TYPES = {"application/zip", "application/x-zip-compressed"}
+
+# (filename, content, error) - content is None for rejected files
+CVFile = Tuple[str, Optional[bytes], Optional[str]]
+
+class BulkUploadTooLarge(Exception):
+    """Too many files or too many bytes once unpacked - checked before anything is decompressed"""
+
+def _is_zip(filename: str, content_type: Optional[str]) -> bool:
+    return content_type in ZIP_TYPES or (filename or "").lower().endswith(".zip")
+
+class _Limits:
+    """File count / unpacked byte budget shared by every file of one bulk request"""
+
+    def __init__(self, max_files: int, max_bytes: int):
+        self.files, self.bytes = max_files, max_bytes
+
+    def take(self, size: int = 0):
+        self.files -= 1
+        self.bytes -= size
+        if self.files < 0:
+            raise BulkUploadTooLarge(f"Too many files (max {settings.BULK_UPLOAD_MAX_FILES})")
+        if self.bytes < 0:
+            raise BulkUploadTooLarge(f"Unpacked files too large (max {settings.BULK_UPLOAD_MAX_UNPACKED_SIZE} bytes)")
+
+def unpack_zip(archive: bytes, archive_name: str = "upload.zip", limits: Optional[_Limits] = None) -> List[CVFile]:
+    """CV files of a ZIP (folders flattened, macOS metadata and non-CV files skipped)"""
+    limits = limits or _Limits(settings.BULK_UPLOAD_MAX_FILES, settings.BULK_UPLOAD_MAX_UNPACKED_SIZE)
+    try:
+        with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+            # Plan on the declared sizes first - zipfile never inflates an entry past its
+            # declared size, so a bomb is rejected here before any decompression
+            plan = []
+            for info in zf.infolist():
+                path = PurePosixPath(info.filename)
+                if info.is_dir() or "__MACOSX" in path.parts or path.name.startswith("."):
+                    continue
+                if path.suffix.lower() not in ALLOWED_SUFFIXES:
+                    limits.take()
+                    plan.append((info, "Invalid file type"))
+                elif info.file_size > settings.MAX_UPLOAD_SIZE:
+                    limits.take()
+                    plan.append((info, "File too large"))
+                else:
+                    limits.take(info.file_size)
+                    plan.append((info, None))
+            return [
+                (info.filename, None if error else zf.read(info), error)
+                for info, error in plan
+            ]
+    except zipfile.BadZipFile:
+        limits.take()
+        return [(archive_name, None, "Invalid ZIP archive")]
+
+def collect_cv_files(uploads: List[Tuple[str, Optional[str], bytes]]) -> List[CVFile]:
+    """
+    (filename, content_type, bytes) of the request -> individual CV files, ZIPs expanded.
+    Raises BulkUploadTooLarge past BULK_UPLOAD_MAX_FILES / BULK_UPLOAD_MAX_UNPACKED_SIZE.
+    CPU-bound (inflating ZIPs) - call it in a thread.
+    """
+    limits = _Limits(settings.BULK_UPLOAD_MAX_FILES, settings.BULK_UPLOAD_MAX_UNPACKED_SIZE)
+    files: List[CVFile] = []
+    for filename, content_type, content in uploads:
+        if _is_zip(filename, content_type):
+            files.extend(unpack_zip(content, filename, limits))
+        elif content_type not in ALLOWED_TYPES and PurePosixPath(filename or "").suffix.lower() not in ALLOWED_SUFFIXES:
+            limits.take()
+            files.append((filename, None, "Invalid file type"))
+        elif len(content) > settings.MAX_UPLOAD_SIZE:
+            limits.take()
+            files.append((filename, None, "File too large"))
+        else:
+            limits.take(len(content))
+            files.append((filename, content, None))
+    return files
+
+def _line(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False, default=str) + "\n"
+
+async def _score_file(job: Job, filename: str, content: bytes, semaphore: asyncio.Semaphore, session_factory):
+    async with semaphore:
+        try:
+            # Read-only session for the dedup / CV store lookups, writes happen in the bulk insert
+            async with session_factory() as db:
+                while True:
+                    try:
+                        outcome = await process_upload(db, job, filename, content)
+                        break
+                    except LLMOverloadedError as e:
+                        # Interactive uploads fill the LLM queue - wait instead of dropping the file
+                        await asyncio.sleep(e.retry_after)
+            if not outcome.duplicate:
+                outcome.candidate.id = str(uuid.uuid4())  # known before the bulk insert, reported per file
+            return filename, outcome, None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Bulk upload: {filename} failed: {e}")
+            return filename, None, str(e)
+
+async def _save_batch(outcomes: List[UploadOutcome], session_factory) -> Optional[str]:
+    """Insert one batch of scored uploads, error message on failure"""
+    if not outcomes:
+        return None
+    try:
+        async with session_factory() as db:
+            for outcome in outcomes:
+                await save_upload(db, outcome)
+            await db.commit()
+        return None
+    except Exception as e:
+        logger.error(f"❌ Bulk upload insert of {len(outcomes)} candidates failed: {e}")
+        return f"Saving candidate failed: {e}"
+
+def _new_outcomes(outcomes: List[Optional[UploadOutcome]], seen_text: Dict[str, Candidate]) -> List[UploadOutcome]:
+    """Outcomes to insert: not failed, not duplicates, first of their CV text"""
+    new: Dict[str, UploadOutcome] = {}
+    for outcome in outcomes:
+        if outcome is not None and not outcome.duplicate and outcome.candidate.text_hash not in seen_text:
+            new.setdefault(outcome.candidate.text_hash, outcome)
+    return list(new.values())
+
+_background_saves: Set[asyncio.Task] = set()
+
+def _save_in_background(outcomes: List[UploadOutcome], session_factory):
+    task = asyncio.create_task(_save_batch(outcomes, session_factory))
+    _background_saves.add(task)
+    task.add_done_callback(_background_saves.discard)
+
+async def bulk_upload_stream(job: Job, files: List[CVFile], session_factory=AsyncSessionLocal) -> AsyncIterator[str]:
+    """
+    NDJSON progress of a bulk upload: files are scored BULK_UPLOAD_CONCURRENCY at a
+    time (LLM calls at batch priority so single uploads stay responsive) and a line per
+    file is sent as soon as it is scored. New candidates are inserted separately, in
+    batches of BULK_UPLOAD_SAVE_BATCH (or whatever waited BULK_UPLOAD_SAVE_INTERVAL_MS);
+    files of a batch whose insert fails get a "save_failed" line. A summary line with
+    the committed candidate IDs closes the stream. Files already uploaded to the job
+    (or repeated within the request) are reported as duplicates without LLM calls.
+    """
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    total = len(files)
+    semaphore = asyncio.Semaphore(settings.BULK_UPLOAD_CONCURRENCY)
+    batch_size = max(1, settings.BULK_UPLOAD_SAVE_BATCH)
+    interval = settings.BULK_UPLOAD_SAVE_INTERVAL_MS / 1000
+    first_of: Dict[str, str] = {}  # content hash -> first filename in this batch
+    repeats: List[Tuple[str, str]] = []
+    unique: List[Tuple[str, bytes]] = []
+    for filename, content, error in files:
+        if error is None:
+            sha = content_hash(content)
+            if sha in first_of:
+                repeats.append((filename, first_of[sha]))
+            else:
+                first_of[sha] = filename
+                unique.append((filename, content))
+    with priority_scope(Priority.BATCH):
+        pending = {
+            asyncio.create_task(_score_file(job, filename, content, semaphore, session_factory))
+            for filename, content in unique
+        }
+
+    candidate_ids: List[str] = []
+    seen_text: Dict[str, Candidate] = {}  # normalized text hash -> new candidate (buffered or saved)
+    files_of: Dict[str, List[str]] = {}  # normalized text hash -> files that resolved to it
+    buffer: List[UploadOutcome] = []
+    deadline = None  # flush time of the oldest buffered candidate
+    done = duplicates = 0
+    try:
+        for filename, content, error in files:
+            if error is not None:
+                done += 1
+                yield _line({"file": filename, "status": "failed", "error": error, "done": done, "total": total})
+        for filename, original in repeats:
+            done += 1
+            duplicates += 1
+            yield _line({"file": filename, "status": "duplicate", "duplicate_of_file": original, "done": done, "total": total})
+
+        while pending or buffer:
+            finished = set()
+            if pending:
+                timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                finished, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                filename, outcome, error = task.result()
+                done += 1
+                if outcome is not None and not outcome.duplicate:
+                    text = outcome.candidate.text_hash
+                    files_of.setdefault(text, []).append(filename)
+                    if text in seen_text:
+                        # Same CV text under another file name - keep the first one
+                        outcome = UploadOutcome(seen_text[text], True, None)
+                    else:
+                        seen_text[text] = outcome.candidate
+                        buffer.append(outcome)
+                        deadline = deadline or loop.time() + interval
+                if outcome is None:
+                    yield _line({"file": filename, "status": "failed", "error": error, "done": done, "total": total})
+                elif outcome.duplicate:
+                    duplicates += 1
+                    yield _line({"file": filename, "status": "duplicate", **upload_result(outcome.candidate, duplicate=True), "done": done, "total": total})
+                else:
+                    yield _line({"file": filename, "status": "scored", **upload_result(outcome.candidate), "done": done, "total": total})
+
+            while buffer and (len(buffer) >= batch_size or not pending or loop.time() >= deadline):
+                batch, buffer = buffer[:batch_size], buffer[batch_size:]
+                deadline = loop.time() + interval if buffer else None
+                # Shielded - a client disconnect must not abort a half-done commit
+                save_error = await asyncio.shield(_save_batch(batch, session_factory))
+                if save_error is None:
+                    candidate_ids.extend(outcome.candidate.id for outcome in batch)
+                    continue
+                for outcome in batch:
+                    # A later file with this text gets scored and saved on its own
+                    seen_text.pop(outcome.candidate.text_hash)
+                    same_text = files_of.pop(outcome.candidate.text_hash)
+                    duplicates -= len(same_text) - 1  # their original is gone too
+                    for filename in same_text:
+                        yield _line({"file": filename, "status": "save_failed", "error": save_error, "candidate_id": outcome.candidate.id})
+    finally:
+        # Client went away mid-stream: files not finished yet are dropped (LLM calls already
+        # running still complete inside single-flight and land in the LLM cache, so a retry
+        # reuses them); files scored in the meantime are still saved
+        for task in pending:
+            task.cancel()
+        scored = [task.result()[1] for task in pending if task.done() and not task.cancelled()]
+        leftover = buffer + _new_outcomes(scored, seen_text)
+        if leftover:
+            _save_in_background(leftover, session_factory)
+
+    elapsed = time.perf_counter() - started
+    created = len(candidate_ids)
+    logger.info(f"📦 Bulk upload job {job.id}: {created}/{total} CVs saved, {duplicates} duplicates in {elapsed:.1f}s")
+    yield _line({
+        "status": "completed",
+        "total": total,
+        "created": created,
+        "duplicates": duplicates,
+        "failed": total - created - duplicates,
+        "candidate_ids": candidate_ids,
+        "seconds": round(elapsed, 2),
+    })
@@ -3,4 +3,5 @@ import logging
 logger = logging.getLogger(__name__)
 
 from .cache_service import cache, CacheService
-__all__ = ["cache", "CacheService"]
+from .llm_cache import llm_cache, LLMResponseCache
+__all__ = ["cache", "CacheService", "llm_cache", "LLMResponseCache"]
@@ -1,4 +1,6 @@
 import json
+import time
+from collections import OrderedDict
 from typing import Optional, Any
 from config import settings
 import logging
@@ -6,10 +8,11 @@ import logging
 logger = logging.getLogger(__name__)
 
 class CacheService:
-    def __init__(self):
+    def __init__(self, max_entries: int = None):
         self.redis = None
         self.enabled = settings.redis_available
-        self._memory_cache = {}  # Fallback in-memory cache
+        self.max_entries = max_entries or settings.CACHE_MAX_ENTRIES
+        self._memory_cache = OrderedDict()  # Fallback in-memory LRU cache: key -> (expires_at, value)
     
     async def connect(self):
         if not self.enabled:
@@ -35,7 +38,15 @@ class CacheService:
                 return json.loads(value) if value else None
             except Exception as e:
                 logger.error(f"Redis GET error: {e}")
-        return self._memory_cache.get(key)
+        entry = self._memory_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._memory_cache[key]
+            return None
+        self._memory_cache.move_to_end(key)
+        return value
     
     async def set(self, key: str, value: Any, ttl: int = None):
         ttl = ttl or settings.CACHE_TTL
@@ -45,7 +56,10 @@ class CacheService:
                 return
             except Exception as e:
                 logger.error(f"Redis SET error: {e}")
-        self._memory_cache[key] = value
+        self._memory_cache[key] = (time.monotonic() + ttl, value)
+        self._memory_cache.move_to_end(key)
+        while len(self._memory_cache) > self.max_entries:
+            self._memory_cache.popitem(last=False)
     
     async def delete(self, key: str):
         if self.redis and self.enabled:
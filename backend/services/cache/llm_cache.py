@@ -0,0 +1,55 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+from config import settings
+from services.metrics import LLM_CACHE_REQUESTS
+from .cache_service import cache, CacheService
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LLMResponseCache:
+    """Content-addressed cache for Ollama responses, keyed by (model, system, prompt, options)"""
+    
+    PREFIX = "llm:"
+    
+    def __init__(self, backend: CacheService = None, ttl: int = None):
+        self.backend = backend or cache
+        self.ttl = ttl or settings.LLM_CACHE_TTL
+        self.hits = 0
+        self.misses = 0
+    
+    @classmethod
+    def make_key(cls, model: str, prompt: str, system: Optional[str] = None, options: Optional[Dict[str, Any]] = None) -> str:
+        material = json.dumps(
+            {"model": model, "system": system or "", "prompt": prompt, "options": options or {}},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return cls.PREFIX + hashlib.sha256(material.encode("utf-8")).hexdigest()
+    
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+            LLM_CACHE_REQUESTS.labels(result="miss").inc()
+            return None
+        self.hits += 1
+        LLM_CACHE_REQUESTS.labels(result="hit").inc()
+        return value.get("response")
+    
+    async def set(self, key: str, response: str):
+        # Empty response means Ollama failed - never cache it
+        if not response or len(response.encode("utf-8")) > settings.LLM_CACHE_MAX_RESPONSE_BYTES:
+            return
+        await self.backend.set(key, {"response": response}, ttl=self.ttl)
+    
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+llm_cache = LLMResponseCache()
@@ -0,0 +1,110 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import time
+from collections import deque
+from config import settings
+from services.metrics import LLM_BREAKER_STATE, LLM_SHORT_CIRCUITED, LLM_ADAPTIVE_TIMEOUT
+
+class CircuitBreaker:
+    """
+    Circuit breaker for Ollama calls with latency-based adaptive timeout
+    closed -> (N consecutive failures) -> open -> (recovery time) -> half_open -> probe ok -> closed
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    MIN_SAMPLES = 10
+    
+    def __init__(
+        self,
+        failure_threshold: int = None,
+        recovery_seconds: float = None,
+        latency_window: int = None,
+    ):
+        self.failure_threshold = failure_threshold or settings.LLM_BREAKER_FAILURE_THRESHOLD
+        self.recovery_seconds = recovery_seconds or settings.LLM_BREAKER_RECOVERY_SECONDS
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._latencies = deque(maxlen=latency_window or settings.LLM_LATENCY_WINDOW)
+    
+    @property
+    def is_open(self) -> bool:
+        """True while calls would be short-circuited (used to pick degraded mode)"""
+        if self.state == self.OPEN:
+            return time.monotonic() - self.opened_at < self.recovery_seconds
+        return self.state == self.HALF_OPEN and self._probe_in_flight
+    
+    def allow_request(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.recovery_seconds:
+            self._set_state(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            # Let exactly one probe through
+            self._probe_in_flight = True
+            return True
+        LLM_SHORT_CIRCUITED.inc()
+        return False
+    
+    def record_success(self, latency: float):
+        self._latencies.append(latency)
+        self.failures = 0
+        self._probe_in_flight = False
+        if self.state != self.CLOSED:
+            logger.info("✅ Ollama recovered - circuit closed")
+            self._set_state(self.CLOSED)
+        LLM_ADAPTIVE_TIMEOUT.set(self.timeout())
+    
+    def record_failure(self):
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"⚡ Ollama circuit OPEN after {self.failures} failures - degraded mode")
+            self.opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+    
+    def record_cancelled(self):
+        # Caller went away mid-call - neither success nor failure, just free the probe
+        self._probe_in_flight = False
+    
+    @property
+    def has_latency_samples(self) -> bool:
+        return len(self._latencies) >= self.MIN_SAMPLES
+    
+    def percentile(self, q: float) -> float:
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    
+    def timeout(self) -> float:
+        """Per-call timeout: observed latency percentile x multiplier, clamped to [min, OLLAMA_TIMEOUT]"""
+        if not self.has_latency_samples:
+            return float(settings.OLLAMA_TIMEOUT)
+        adaptive = self.percentile(settings.LLM_TIMEOUT_PERCENTILE) * settings.LLM_TIMEOUT_MULTIPLIER
+        return max(settings.OLLAMA_MIN_TIMEOUT, min(float(settings.OLLAMA_TIMEOUT), adaptive))
+    
+    def _set_state(self, state: str):
+        self.state = state
+        LLM_BREAKER_STATE.set({self.CLOSED: 0, self.HALF_OPEN: 1, self.OPEN: 2}[state])
+    
+    def stats(self):
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "timeout_seconds": round(self.timeout(), 1),
+            "p95_latency_seconds": round(self.percentile(0.95), 2),
+        }
+
+llm_breaker = CircuitBreaker()
+
+def degraded_mode() -> bool:
+    """Skip LLM stages and score deterministically (ENABLE_FALLBACK and breaker open)"""
+    return settings.ENABLE_FALLBACK and llm_breaker.is_open
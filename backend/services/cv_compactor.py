@@ -0,0 +1,213 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from config import settings
+
+# Section headings (EN + PL) -> section type
+SECTION_HEADINGS = {
+    "skills": ["skills", "technical skills", "technologies", "tech stack", "competencies", "umiejętności", "kompetencje", "technologie"],
+    "experience": ["experience", "work experience", "professional experience", "employment", "employment history", "career", "doświadczenie", "doświadczenie zawodowe", "przebieg kariery"],
+    "summary": ["summary", "profile", "about me", "objective", "professional summary", "o mnie", "podsumowanie", "profil"],
+    "education": ["education", "academic background", "wykształcenie", "edukacja"],
+    "certifications": ["certifications", "certificates", "courses", "trainings", "certyfikaty", "kursy", "szkolenia"],
+    "languages": ["languages", "języki", "języki obce"],
+    "projects": ["projects", "side projects", "projekty"],
+    "hobbies": ["hobbies", "interests", "hobby", "zainteresowania"],
+}
+
+# Lower number = kept first when the budget is tight ("header" is the contact block before any heading)
+SECTION_PRIORITY = {
+    "header": 0,
+    "skills": 1,
+    "experience": 2,
+    "summary": 3,
+    "education": 4,
+    "certifications": 5,
+    "languages": 6,
+    "projects": 7,
+    "other": 8,
+    "hobbies": 9,
+}
+
+# Whole-line boilerplate
+BOILERPLATE_PATTERNS = [
+    re.compile(r"^\s*references\s+(are\s+)?available\s+(up)?on\s+request\.?\s*$", re.IGNORECASE),
+    re.compile(r"^\s*(curriculum\s+vitae|resume|życiorys|cv)\s*$", re.IGNORECASE),
+]
+
+# GDPR / RODO consent clause: starts with the consent phrase, dropped together with
+# the rest of its paragraph when that mentions personal data
+CONSENT_START = re.compile(r"^(i\s+(hereby\s+)?(agree|consent)|wyrażam\s+zgodę)\b", re.IGNORECASE)
+CONSENT_TOPIC = re.compile(r"personal\s+data|danych\s+osobowych|GDPR|RODO|2016/679", re.IGNORECASE)
+CONSENT_MAX_CHARS = 1500
+
+# "3", "Page 2 of 5", "Strona 1/3" - at most 3 digits, so year lines like "2021" stay
+PAGE_NUMBER = re.compile(r"^\s*((page|strona)\s*)?\d{1,3}\s*((/|of|z)\s*\d{1,3})?\s*$", re.IGNORECASE)
+
+PAGE_BREAK = "\f"  # PDFParserService separates pages with a form feed
+EDGE_LINES = 2  # lines at the top/bottom of a page checked for running headers/footers
+
+class CVCompactor:
+    """Shrinks extracted CV text to a token budget before it is sent to the LLM"""
+    
+    CHARS_PER_TOKEN = 4  # rough estimate for llama tokenizers
+    
+    def __init__(self, token_budget: Optional[int] = None):
+        self.token_budget = token_budget or settings.CV_TOKEN_BUDGET
+    
+    @classmethod
+    def estimate_tokens(cls, text: str) -> int:
+        return len(text) // cls.CHARS_PER_TOKEN
+    
+    def compact(self, text: Optional[str]) -> Optional[str]:
+        """
+        Normalize whitespace; text over the token budget also loses page headers/footers
+        and boilerplate, then low-priority sections until it fits
+        """
+        if not text:
+            return text
+        start = time.perf_counter()
+        pages = self.normalize(text)
+        normalized = "\n".join(line for page in pages for line in page)
+        if self.estimate_tokens(normalized) <= self.token_budget:
+            return normalized
+        lines = self.remove_page_furniture(pages)
+        lines = self.remove_boilerplate(lines)
+        compacted = self.fit_budget(self.split_sections(lines))
+        
+        before, after = self.estimate_tokens(text), self.estimate_tokens(compacted)
+        saved_seconds = (before - after) / settings.LLM_PROMPT_TOKENS_PER_SECOND
+        logger.info(
+            f"🗜️ CV compacted: {len(text)} -> {len(compacted)} chars (~{before} -> ~{after} tokens, "
+            f"~{saved_seconds:.1f}s prompt time saved) in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        return compacted
+    
+    @staticmethod
+    def normalize(text: str) -> List[List[str]]:
+        """
+        Lines per page: runs of spaces collapsed, control chars dropped, at most one
+        blank line in a row, no blank lines at page edges
+        """
+        text = text.replace("\u00a0", " ").replace("\r\n", "\n").replace("\r", "\n")
+        pages = []
+        for page_text in text.split(PAGE_BREAK):
+            page_text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f]", "", page_text)
+            lines = []
+            for raw in page_text.split("\n"):
+                line = re.sub(r"[ \t•●▪]+", " ", raw).strip()
+                if line or (lines and lines[-1]):
+                    lines.append(line)
+            while lines and not lines[-1]:
+                lines.pop()
+            if lines:
+                if pages:
+                    pages[-1].append("")  # page break reads as a paragraph break
+                pages.append(lines)
+        return pages
+    
+    @staticmethod
+    def _edges(page: List[str]) -> List[int]:
+        content = [i for i, line in enumerate(page) if line]
+        return sorted(set(content[:EDGE_LINES] + content[-EDGE_LINES:]))
+    
+    @classmethod
+    def remove_page_furniture(cls, pages: List[List[str]]) -> List[str]:
+        """
+        Drop page numbers at the top/bottom of a page, and running headers/footers: short
+        lines at a page edge that repeat (digits aside) at the edges of most pages.
+        Body lines are never touched, however often they repeat.
+        """
+        def key(line: str) -> str:
+            return re.sub(r"\d+", "#", line.lower())
+        
+        running = set()
+        if len(pages) > 1:
+            counts = Counter(
+                k for page in pages
+                for k in {key(page[i]) for i in cls._edges(page) if len(page[i]) <= 80}
+            )
+            running = {k for k, count in counts.items() if count >= max(2, (len(pages) + 1) // 2)}
+        
+        lines = []
+        for page in pages:
+            content = [i for i, line in enumerate(page) if line]
+            first, last = content[0], content[-1]
+            drop = {
+                i for i in cls._edges(page)
+                if key(page[i]) in running or (i in (first, last) and PAGE_NUMBER.match(page[i]))
+            }
+            lines.extend(line for i, line in enumerate(page) if i not in drop)
+        return lines
+    
+    @staticmethod
+    def remove_boilerplate(lines: List[str]) -> List[str]:
+        """Drop boilerplate lines and GDPR consent clauses (from the consent phrase to the paragraph end)"""
+        kept = []
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            if line and CONSENT_START.match(line):
+                end = i
+                while end < len(lines) and lines[end]:
+                    end += 1
+                clause = " ".join(lines[i:end])
+                if CONSENT_TOPIC.search(clause) and len(clause) <= CONSENT_MAX_CHARS:
+                    i = end
+                    continue
+            if not (line and any(pattern.match(line) for pattern in BOILERPLATE_PATTERNS)):
+                kept.append(line)
+            i += 1
+        return kept
+    
+    @staticmethod
+    def _heading_type(line: str) -> Optional[str]:
+        # "SKILLS" / "Skills:" / "SKILLS: Python, SQL"
+        key = line.split(":", 1)[0] if line else ""
+        if not key or len(key) > 40:
+            return None
+        key = key.lower().strip(" -–|#*").strip()
+        for section, headings in SECTION_HEADINGS.items():
+            if key in headings:
+                return section
+        return None
+    
+    @classmethod
+    def split_sections(cls, lines: List[str]) -> List[Tuple[str, List[str]]]:
+        sections = [("header", [])]
+        for line in lines:
+            section = cls._heading_type(line)
+            if section:
+                sections.append((section, [line]))
+            else:
+                sections[-1][1].append(line)
+        return [(name, body) for name, body in sections if any(body)]
+    
+    def fit_budget(self, sections: List[Tuple[str, List[str]]]) -> str:
+        """Keep sections by priority until the budget is spent; output keeps original order"""
+        budget_chars = self.token_budget * self.CHARS_PER_TOKEN
+        texts = ["\n".join(body).strip() for _, body in sections]
+        if sum(len(t) + 2 for t in texts) <= budget_chars:
+            return "\n\n".join(texts)
+        
+        order = sorted(range(len(sections)), key=lambda i: (SECTION_PRIORITY.get(sections[i][0], SECTION_PRIORITY["other"]), i))
+        kept: Dict[int, str] = {}
+        remaining = budget_chars
+        for i in order:
+            if remaining <= 0:
+                break
+            text = texts[i]
+            if len(text) + 2 > remaining:
+                # Cut at a line boundary inside the section
+                cut = text[:remaining].rsplit("\n", 1)[0]
+                text = cut if len(cut) > 0 else text[:remaining]
+            kept[i] = text
+            remaining -= len(text) + 2
+        return "\n\n".join(kept[i] for i in sorted(kept))
+
+cv_compactor = CVCompactor()
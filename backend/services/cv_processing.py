@@ -0,0 +1,223 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import asyncio
+import copy
+import time
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import settings
+from models import Job, Candidate, CandidateSkill, CVDocument
+from services.extraction_pool import extraction_pool
+from services.cv_compactor import cv_compactor
+from services.llm_service import LLMService
+from services.llm_schemas import CV_SCHEMA
+from services.circuit_breaker import degraded_mode
+from services.agents.registry import agent_registry
+from services.skill_index import index_entries
+from services.bulk_screener import bulk_screener
+from services.cv_store import content_hash, text_hash, find_duplicate, get_document, find_parsed_cv, store_document
+from services.metrics import CV_PROCESSING_SECONDS, CV_DEDUP
+
+# Upload flow shared by the sync endpoint and the background task workers:
+# file -> text -> (compaction) -> parsed CV -> agents -> unsaved Candidate
+
+llm_service = LLMService()
+
+StageCallback = Callable[[str, int], Awaitable[None]]  # (stage, progress %)
+
+ALLOWED_TYPES = ["application/pdf", "text/plain", "application/msword"]
+ALLOWED_SUFFIXES = {".pdf", ".txt", ".doc", ".docx"}
+
+async def _noop_stage(stage: str, progress: int):
+    pass
+
+async def extract_cv_bytes(filename: str, content: bytes) -> Optional[str]:
+    """Text of an uploaded CV (PDF/DOCX/TXT), parsed in the extraction process pool"""
+    return await extraction_pool.extract(filename, content)
+
+async def score_cv_text(
+    job: Job,
+    cv_text: str,
+    on_stage: Optional[StageCallback] = None,
+    parsed_cv: Optional[Dict[str, Any]] = None
+) -> Candidate:
+    """Parse + score CV text for a job, returns the (not yet added) Candidate (parsed_cv given = no parse call)"""
+    on_stage = on_stage or _noop_stage
+
+    # Shrink to token budget before prompting
+    if settings.CV_COMPACTION_ENABLED:
+        cv_text = cv_compactor.compact(cv_text)
+
+    # Parse CV with LLM (keyword fallback while Ollama is down)
+    await on_stage("parsing", 30)
+    skill_hints = job.requirements.get("must_have", []) + job.requirements.get("nice_to_have", [])
+    flow = "single_pass" if settings.LLM_SINGLE_PASS else "two_pass"
+    started = time.perf_counter()
+    orchestrator = agent_registry.orchestrator
+    analysis = None
+    parse_degraded = parsed_cv is None and degraded_mode()
+    if parsed_cv is None and not parse_degraded:
+        if settings.LLM_SINGLE_PASS:
+            context = await asyncio.to_thread(orchestrator.company_context, job.requirements, job.company_id)
+            parsed_cv, analysis = await llm_service.parse_and_analyze(cv_text, job.requirements, context=context or None)
+        else:
+            parsed_cv = await llm_service.parse_cv(cv_text)
+        parse_degraded = not parsed_cv and settings.ENABLE_FALLBACK
+    if parse_degraded:
+        parsed_cv = llm_service.fallback_parse_cv(cv_text, skill_hints)
+
+    # Score candidate (degraded mode always goes through the deterministic agents,
+    # single-pass analysis goes straight to Screener + Scorer)
+    await on_stage("scoring", 60)
+    if settings.USE_MULTI_AGENT or degraded_mode() or analysis is not None:
+        scoring_result = await orchestrator.process_candidate(
+            cv_data=parsed_cv,
+            job_requirements=job.requirements,
+            analysis=analysis
+        )
+    else:
+        scoring_result = await llm_service.score(
+            parsed_cv,
+            job.requirements
+        )
+
+    CV_PROCESSING_SECONDS.labels(flow=flow).observe(time.perf_counter() - started)
+
+    candidate = Candidate(
+        job_id=job.id,
+        name=parsed_cv.get("name", "Unknown"),
+        email=parsed_cv.get("email", ""),
+        parsed_cv=parsed_cv,
+        score=scoring_result.get("score", 0),
+        strengths=scoring_result.get("strengths", []),
+        weaknesses=scoring_result.get("weaknesses", []),
+        recommendation=scoring_result.get("recommendation", "pending"),
+        status="new",
+        scoring_mode="degraded" if parse_degraded else scoring_result.get("scoring_mode", "full"),
+        stage_results=scoring_result.get("stage_results", {})
+    )
+    candidate.skill_index = index_entries(job.id, parsed_cv)
+    return candidate
+
+class UploadOutcome(NamedTuple):
+    candidate: Candidate
+    duplicate: bool  # candidate is the job's existing one, nothing to save
+    document: Optional[CVDocument]  # store entry to save with the candidate (transient, see store_document)
+
+async def process_upload(
+    db: AsyncSession,
+    job: Job,
+    filename: str,
+    content: bytes,
+    on_stage: Optional[StageCallback] = None,
+    content_sha: Optional[str] = None
+) -> UploadOutcome:
+    """
+    Upload bytes -> candidate through the content-addressed CV store: a file (or the same
+    normalized text) already uploaded to this job returns the existing candidate without
+    extraction or LLM calls; text and parsed_cv of known CVs are reused for other jobs,
+    so only the job-specific agents run.
+    """
+    on_stage = on_stage or _noop_stage
+    sha = content_sha or content_hash(content)
+    existing = await find_duplicate(db, job.id, content_hash=sha)
+    if existing is not None:
+        CV_DEDUP.labels(kind="duplicate_file").inc()
+        logger.info(f"♻️ Duplicate upload {filename} -> candidate {existing.id}")
+        return UploadOutcome(existing, True, None)
+
+    document = await get_document(db, sha)
+    if document is not None:
+        CV_DEDUP.labels(kind="text_reused").inc()
+        cv_text = document.text
+    else:
+        await on_stage("extracting", 10)
+        cv_text = await extract_cv_bytes(filename, content)
+        if not cv_text:
+            raise ValueError("No text could be extracted from the CV")
+
+    normalized = text_hash(cv_text)
+    existing = await find_duplicate(db, job.id, text_hash=normalized)
+    if existing is not None:
+        CV_DEDUP.labels(kind="duplicate_text").inc()
+        logger.info(f"♻️ Duplicate CV text {filename} -> candidate {existing.id}")
+        return UploadOutcome(existing, True, None)
+
+    parsed_cv = copy.deepcopy(document.parsed_cv) if document is not None and document.parsed_cv else None
+    parsed_cv = parsed_cv or await find_parsed_cv(db, normalized)
+    if parsed_cv is not None:
+        CV_DEDUP.labels(kind="parse_reused").inc()
+
+    candidate = await score_cv_text(job, cv_text, on_stage, parsed_cv=parsed_cv)
+    candidate.content_hash, candidate.text_hash = sha, normalized
+
+    # New file, or a stored one still without parse. Keyword fallback parses depend on
+    # the job's skills - only real LLM parses are shared.
+    entry = None
+    share_parse = candidate.scoring_mode != "degraded" and not (document is not None and document.parsed_cv)
+    if document is None or share_parse:
+        entry = CVDocument(
+            content_hash=sha,
+            text_hash=normalized,
+            text=cv_text,
+            parsed_cv=copy.deepcopy(candidate.parsed_cv) if share_parse else None,
+        )
+    return UploadOutcome(candidate, False, entry)
+
+async def save_upload(db: AsyncSession, outcome: UploadOutcome):
+    """Add a processed upload to the session (nothing for duplicates)"""
+    if outcome.duplicate:
+        return
+    if outcome.document is not None:
+        await store_document(db, outcome.document)
+    db.add(outcome.candidate)
+    bulk_screener.invalidate(outcome.candidate.job_id)
+
+async def reparse_candidate(db: AsyncSession, candidate: Candidate) -> bool:
+    """
+    Replace a degraded candidate's keyword-fallback parse with an LLM parse of the CV
+    text kept in the CV store. False (candidate stays degraded) when the text is not
+    stored - uploaded before the store existed - or no LLM parse could be made.
+    """
+    document = await get_document(db, candidate.content_hash) if candidate.content_hash else None
+    if document is None:
+        return False
+    cv_text = cv_compactor.compact(document.text) if settings.CV_COMPACTION_ENABLED else document.text
+    parsed_cv = copy.deepcopy(document.parsed_cv) if document.parsed_cv else None
+    if parsed_cv is None:
+        if degraded_mode():
+            return False
+        parsed_cv = await llm_service.parse_cv(cv_text)
+        if not parsed_cv:
+            return False
+        document.parsed_cv = copy.deepcopy(parsed_cv)
+
+    # Recruiter additions (notes) are not part of any parse - carried over
+    added = {key: value for key, value in (candidate.parsed_cv or {}).items() if key not in CV_SCHEMA["properties"]}
+    candidate.parsed_cv = {**parsed_cv, **added}
+    candidate.name = parsed_cv.get("name") or candidate.name
+    candidate.email = parsed_cv.get("email", candidate.email)
+    # Cached stages were computed from the fallback parse
+    candidate.stage_results = {}
+    await db.execute(delete(CandidateSkill).where(CandidateSkill.candidate_id == candidate.id))
+    entries = index_entries(candidate.job_id, parsed_cv)
+    for entry in entries:
+        entry.candidate_id = candidate.id
+    db.add_all(entries)
+    bulk_screener.invalidate(candidate.job_id)
+    logger.info(f"🔄 Degraded candidate {candidate.id} re-parsed from the CV store")
+    return True
+
+def upload_result(candidate: Candidate, duplicate: bool = False) -> dict:
+    """Upload response / finished task payload"""
+    return {
+        "candidate_id": candidate.id,
+        "score": candidate.score,
+        "recommendation": candidate.recommendation,
+        "degraded": candidate.scoring_mode == "degraded",
+        "fast_reject": candidate.scoring_mode == "fast_reject",
+        "duplicate": duplicate
+    }
@@ -0,0 +1,81 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import copy
+import hashlib
+import re
+import unicodedata
+from typing import Any, Dict, Optional
+from datetime import datetime
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Candidate, CVDocument
+
+_NON_WORD = re.compile(r"\W+")
+
+def content_hash(content: bytes) -> str:
+    """SHA-256 of the uploaded bytes"""
+    return hashlib.sha256(content).hexdigest()
+
+def text_hash(text: str) -> str:
+    """
+    SHA-256 of the normalized text - the same CV exported again (other PDF producer,
+    DOCX vs PDF, changed spacing/case/punctuation) hashes the same
+    """
+    normalized = _NON_WORD.sub(" ", unicodedata.normalize("NFKC", text or "").casefold()).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+async def find_duplicate(
+    db: AsyncSession,
+    job_id: str,
+    content_hash: Optional[str] = None,
+    text_hash: Optional[str] = None,
+) -> Optional[Candidate]:
+    """Earliest candidate of the job uploaded with the same file (or the same normalized text)"""
+    query = select(Candidate).where(Candidate.job_id == str(job_id))
+    if content_hash is not None:
+        query = query.where(Candidate.content_hash == content_hash)
+    elif text_hash is not None:
+        query = query.where(Candidate.text_hash == text_hash)
+    else:
+        return None
+    result = await db.execute(query.order_by(Candidate.created_at).limit(1))
+    return result.scalar_one_or_none()
+
+async def get_document(db: AsyncSession, content_hash: str) -> Optional[CVDocument]:
+    return await db.get(CVDocument, content_hash)
+
+async def find_parsed_cv(db: AsyncSession, text_hash: str) -> Optional[Dict[str, Any]]:
+    """parsed_cv of any stored document with the same normalized text (copy, safe to modify)"""
+    result = await db.execute(select(CVDocument.parsed_cv).where(CVDocument.text_hash == text_hash))
+    # JSON null and SQL NULL both mean "not parsed yet" - filtered here, not in SQL
+    parsed_cv = next((parsed for parsed in result.scalars() if parsed), None)
+    return copy.deepcopy(parsed_cv) if parsed_cv else None
+
+async def store_document(db: AsyncSession, document: CVDocument):
+    """
+    Insert a store entry unless the file is already there (concurrent uploads of the
+    same file are fine), and fill in its parsed_cv when the new entry has one.
+    """
+    values = {
+        "content_hash": document.content_hash,
+        "text_hash": document.text_hash,
+        "text": document.text,
+        "created_at": datetime.utcnow(),
+    }
+    if document.parsed_cv:
+        values["parsed_cv"] = document.parsed_cv
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        await db.merge(document)
+        return
+    await db.execute(insert(CVDocument).values(**values).on_conflict_do_nothing(index_elements=["content_hash"]))
+    if document.parsed_cv:
+        await db.execute(
+            update(CVDocument).where(CVDocument.content_hash == document.content_hash).values(parsed_cv=document.parsed_cv)
+        )
@@ -0,0 +1,162 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import asyncio
+import os
+import socket
+from typing import Awaitable, Callable, Optional
+from config import settings
+
+TaskHandler = Callable[[str], Awaitable[None]]
+DeadHandler = Callable[[str, str], Awaitable[None]]
+
+def consumer_name(index: int = 0) -> str:
+    """Unique per worker coroutine: host-pid-index"""
+    return f"{socket.gethostname()}-{os.getpid()}-{index}"
+
+class CVStream:
+    """
+    Redis Streams transport for CV tasks (CV_QUEUE_BACKEND=redis): the API XADDs the
+    task ID, worker.py processes read through one consumer group, so each task goes to
+    exactly one consumer and stays pending until XACKed. Messages of a dead consumer
+    (idle longer than CV_STREAM_CLAIM_IDLE_MS) are XAUTOCLAIMed by live workers; a
+    running task heartbeats (XCLAIM to itself) so long LLM calls are not stolen.
+    After CV_STREAM_MAX_DELIVERIES the task is given up instead of crashing workers forever.
+    """
+
+    def __init__(self, url: Optional[str] = None, stream: Optional[str] = None, group: Optional[str] = None, client=None):
+        self.url = url or settings.REDIS_URL
+        self.stream = stream or settings.CV_STREAM
+        self.group = group or settings.CV_STREAM_GROUP
+        self._client = client
+        self._group_ready = False
+        self.enqueued = 0
+        self.acked = 0
+        self.claimed = 0
+        self.dead = 0
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis.asyncio as redis
+            self._client = redis.from_url(self.url, decode_responses=True)
+        return self._client
+
+    async def ensure_group(self):
+        """Create the consumer group (from the start of the stream, so nothing enqueued earlier is lost)"""
+        if self._group_ready:
+            return
+        from redis.exceptions import ResponseError
+        try:
+            await self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def enqueue(self, task_id: str) -> str:
+        await self.ensure_group()
+        message_id = await self.client.xadd(self.stream, {"task_id": str(task_id)})
+        self.enqueued += 1
+        return message_id
+
+    async def length(self) -> int:
+        return await self.client.xlen(self.stream)
+
+    async def consume(
+        self,
+        handler: TaskHandler,
+        consumer: str,
+        on_dead: Optional[DeadHandler] = None,
+        stop: Optional[asyncio.Event] = None,
+    ):
+        """Process tasks until stop is set: claimed stuck messages first, then new ones"""
+        await self.ensure_group()
+        stop = stop or asyncio.Event()
+        logger.info(f"👷 CV consumer {consumer} reading {self.stream} ({self.group})")
+        while not stop.is_set():
+            try:
+                messages = await self.claim(consumer)
+                claimed = bool(messages)
+                if not messages:
+                    reply = await self.client.xreadgroup(
+                        self.group, consumer, {self.stream: ">"}, count=1, block=settings.CV_STREAM_BLOCK_MS
+                    )
+                    messages = reply[0][1] if reply else []
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ CV stream read failed ({consumer}): {e}")
+                await asyncio.sleep(1)
+                continue
+            for message_id, fields in messages:
+                await self._handle(handler, consumer, message_id, fields or {}, on_dead, claimed)
+
+    async def claim(self, consumer: str) -> list:
+        """Take over one message whose consumer stopped heartbeating (crashed / killed worker)"""
+        _, messages, *_ = await self.client.xautoclaim(
+            self.stream, self.group, consumer, settings.CV_STREAM_CLAIM_IDLE_MS, count=1
+        )
+        messages = [(message_id, fields) for message_id, fields in messages if message_id is not None]
+        for message_id, fields in messages:
+            self.claimed += 1
+            logger.info(f"🪝 {consumer} claimed stuck CV task {fields.get('task_id')} ({message_id})")
+        return messages
+
+    async def _handle(self, handler: TaskHandler, consumer: str, message_id: str, fields: dict, on_dead: Optional[DeadHandler], claimed: bool):
+        task_id = fields.get("task_id")
+        if claimed:
+            pending = await self.client.xpending_range(self.stream, self.group, min=message_id, max=message_id, count=1)
+            deliveries = pending[0]["times_delivered"] if pending else 1
+            if deliveries > settings.CV_STREAM_MAX_DELIVERIES:
+                logger.error(f"☠️ CV task {task_id} dropped after {deliveries - 1} failed deliveries")
+                if on_dead is not None:
+                    await on_dead(task_id, f"Worker died {deliveries - 1} times while processing this CV")
+                self.dead += 1
+                await self._ack(message_id)
+                return
+
+        heartbeat = asyncio.create_task(self._heartbeat(consumer, message_id))
+        try:
+            await handler(task_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Not acked - another consumer claims it after CV_STREAM_CLAIM_IDLE_MS
+            logger.error(f"❌ CV task {task_id} crashed on {consumer}: {e}")
+            return
+        finally:
+            heartbeat.cancel()
+        await self._ack(message_id)
+
+    async def _ack(self, message_id: str):
+        await self.client.xack(self.stream, self.group, message_id)
+        self.acked += 1
+
+    async def _heartbeat(self, consumer: str, message_id: str):
+        """Reset the message's idle time while it is being processed"""
+        interval = settings.CV_STREAM_CLAIM_IDLE_MS / 3000
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.client.xclaim(self.stream, self.group, consumer, 0, [message_id], justid=True)
+            except Exception as e:
+                logger.warning(f"⚠️ CV task heartbeat failed ({message_id}): {e}")
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._group_ready = False
+
+    def stats(self):
+        return {
+            "stream": self.stream,
+            "enqueued": self.enqueued,
+            "acked": self.acked,
+            "claimed": self.claimed,
+            "dead": self.dead,
+        }
+
+cv_stream = CVStream()
@@ -0,0 +1,144 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import asyncio
+import multiprocessing
+import resource
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+from config import settings
+from services.pdf_parser import PDFParserService
+from services.metrics import EXTRACTION_SECONDS
+
+class ExtractionError(Exception):
+    """Text extraction could not finish (CPU limit, crashed parser)"""
+
+class CPUTimeExceeded(BaseException):
+    # BaseException so the parser's broad `except Exception` fallbacks don't swallow it
+    pass
+
+def _on_cpu_limit(signum, frame):
+    raise CPUTimeExceeded()
+
+def _init_worker():
+    signal.signal(signal.SIGXCPU, _on_cpu_limit)
+
+def _run_limited(cpu_limit: float, func: Callable, *args) -> Any:
+    """Runs in the pool process: func(*args) with a soft RLIMIT_CPU of cpu_limit seconds from now"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if cpu_limit:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        limit = int(usage.ru_utime + usage.ru_stime + cpu_limit) + 1
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+    try:
+        return func(*args)
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+class ExtractionPool:
+    """
+    PDF/DOCX text extraction in a process pool, so PyMuPDF/python-docx CPU work
+    doesn't block the event loop (and runs on other cores). Each file gets a CPU
+    time budget (SIGXCPU in the worker) and a wall-clock limit - a parser stuck in
+    C code that blocks or ignores the signal gets its pool killed and replaced.
+    Workers are also replaced after EXTRACTION_MAX_FILES_PER_WORKER files to cap
+    parser memory growth. EXTRACTION_WORKERS=0 falls back to a thread.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_files_per_worker: Optional[int] = None,
+        cpu_limit: Optional[float] = None,
+        wall_limit: Optional[float] = None
+    ):
+        self.workers = settings.EXTRACTION_WORKERS if workers is None else workers
+        self.max_files_per_worker = max_files_per_worker or settings.EXTRACTION_MAX_FILES_PER_WORKER
+        self.cpu_limit = settings.EXTRACTION_CPU_LIMIT_SECONDS if cpu_limit is None else cpu_limit
+        self.wall_limit = settings.EXTRACTION_WALL_LIMIT_SECONDS if wall_limit is None else wall_limit
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.extracted = 0
+        self.failed = 0
+        self.restarts = 0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                max_tasks_per_child=self.max_files_per_worker,
+            )
+        return self._executor
+
+    async def run(self, func: Callable, *args) -> Any:
+        """func(*args) in a pool process under the per-file CPU and wall-clock limits"""
+        if not self.workers:
+            return await asyncio.to_thread(func, *args)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        loop = asyncio.get_running_loop()
+        # One file per free worker - the wall-clock limit then doesn't count time spent queued
+        async with self._slots:
+            future = loop.run_in_executor(self.executor, _run_limited, self.cpu_limit, func, *args)
+            try:
+                return await asyncio.wait_for(future, self.wall_limit or None)
+            except CPUTimeExceeded:
+                raise ExtractionError(f"CPU time limit exceeded ({self.cpu_limit}s)")
+            except asyncio.TimeoutError:
+                # Stuck outside the CPU limit (blocked / ignored SIGXCPU) - only killing the worker frees it
+                logger.error(f"❌ Extraction exceeded {self.wall_limit}s - killing parser processes")
+                self.restart(kill=True)
+                raise ExtractionError(f"Wall-clock limit exceeded ({self.wall_limit}s)")
+            except BrokenProcessPool:
+                # A worker died (segfault in the parser, killed after the wall-clock limit) - the pool is unusable
+                logger.error("❌ Extraction worker died - restarting process pool")
+                self.restart()
+                raise ExtractionError("Parser process crashed")
+
+    def restart(self, kill: bool = False):
+        """Drop the pool (a new one starts on the next file), optionally killing its workers"""
+        if self._executor is None:
+            return
+        self.restarts += 1
+        if kill:
+            # ProcessPoolExecutor has no public way to stop a running task
+            for process in list((self._executor._processes or {}).values()):
+                process.kill()
+        self.shutdown(wait=False)
+
+    async def extract(self, filename: str, content: bytes) -> Optional[str]:
+        """Text of an uploaded CV (PDF/DOCX/TXT by filename suffix)"""
+        started = time.perf_counter()
+        try:
+            text = await self.run(PDFParserService.extract_text_from_bytes, filename, content)
+        except ExtractionError as e:
+            self.failed += 1
+            logger.error(f"❌ Extraction of {filename} failed: {e}")
+            raise
+        self.extracted += 1
+        EXTRACTION_SECONDS.observe(time.perf_counter() - started)
+        return text
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "extracted": self.extracted,
+            "failed": self.failed,
+            "restarts": self.restarts,
+        }
+
+extraction_pool = ExtractionPool()
@@ -0,0 +1,116 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Optional
+from config import settings
+from services.metrics import LLM_QUEUE_DEPTH, LLM_ACTIVE_REQUESTS, LLM_QUEUE_WAIT, LLM_REJECTED_REQUESTS
+
+class Priority(IntEnum):
+    """Lower value = served first"""
+    INTERACTIVE = 0  # recruiter waiting on an upload
+    BATCH = 1        # bulk re-scoring, background jobs
+
+# Priority for LLM calls made in the current task (set once by background jobs)
+current_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+@contextmanager
+def priority_scope(priority: Priority):
+    """Run all LLM calls inside the block with the given priority"""
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+class LLMOverloadedError(Exception):
+    """Raised when the LLM queue is full - mapped to 503 + Retry-After in main.py"""
+    
+    def __init__(self, retry_after: int):
+        super().__init__(f"LLM queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class LLMScheduler:
+    """Concurrency cap + priority queue in front of Ollama"""
+    
+    def __init__(self, max_concurrency: int = None, max_queue_depth: int = None, retry_after: int = None):
+        # LLM_MAX_CONCURRENCY is per Ollama node
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY * len(settings.ollama_backends)
+        self.max_queue_depth = max_queue_depth if max_queue_depth is not None else settings.LLM_MAX_QUEUE_DEPTH
+        self.retry_after = retry_after or settings.LLM_RETRY_AFTER_SECONDS
+        self.active = 0
+        self._waiters = []  # heap of [priority, seq, future]
+        self._seq = itertools.count()
+    
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+    
+    def check_capacity(self):
+        """Fail fast before starting expensive work when the queue is already full"""
+        if len(self._waiters) >= self.max_queue_depth:
+            raise LLMOverloadedError(self.retry_after)
+    
+    @asynccontextmanager
+    async def slot(self, priority: Optional[Priority] = None):
+        """Hold one Ollama slot for the duration of the block"""
+        priority = current_priority.get() if priority is None else priority
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+    
+    async def _acquire(self, priority: Priority):
+        label = priority.name.lower()
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            LLM_ACTIVE_REQUESTS.set(self.active)
+            LLM_QUEUE_WAIT.labels(priority=label).observe(0)
+            return
+        
+        if len(self._waiters) >= self.max_queue_depth:
+            LLM_REJECTED_REQUESTS.labels(priority=label).inc()
+            logger.warning(f"🚦 LLM queue full ({self.queue_depth}), rejecting {label} request")
+            raise LLMOverloadedError(self.retry_after)
+        
+        future = asyncio.get_running_loop().create_future()
+        entry = [priority, next(self._seq), future]
+        heapq.heappush(self._waiters, entry)
+        LLM_QUEUE_DEPTH.labels(priority=label).inc()
+        start = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was handed to us just as we got cancelled - pass it on
+                self._release()
+            else:
+                try:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                except ValueError:
+                    pass  # already popped (and skipped) by a _release between cancel and now
+            raise
+        finally:
+            LLM_QUEUE_DEPTH.labels(priority=label).dec()
+        LLM_QUEUE_WAIT.labels(priority=label).observe(time.monotonic() - start)
+    
+    def _release(self):
+        # Hand the slot straight to the highest-priority waiter (active count unchanged)
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+        LLM_ACTIVE_REQUESTS.set(self.active)
+
+llm_scheduler = LLMScheduler()
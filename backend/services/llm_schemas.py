@@ -0,0 +1,98 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+from typing import Any, Dict, List, Optional
+
+# JSON schemas passed to Ollama's "format" option (structured outputs).
+# Each schema is derived from the example dict the call site expects back,
+# so prompt format and schema cannot drift apart.
+
+def schema_from_example(example: Any, enums: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+    """Build a JSON schema from an example value (all object keys required)"""
+    enums = enums or {}
+    if isinstance(example, dict):
+        properties = {}
+        for key, value in example.items():
+            properties[key] = schema_from_example(value)
+            if key in enums:
+                properties[key]["enum"] = enums[key]
+        return {"type": "object", "properties": properties, "required": list(example.keys())}
+    if isinstance(example, list):
+        return {"type": "array", "items": schema_from_example(example[0]) if example else {"type": "string"}}
+    if isinstance(example, bool):
+        return {"type": "boolean"}
+    if isinstance(example, int):
+        return {"type": "integer"}
+    if isinstance(example, float):
+        return {"type": "number"}
+    return {"type": "string"}
+
+def batch_schema(item_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """{"results": [{"id": "c1", ...item}]} - one entry per candidate in a batched prompt"""
+    item = {
+        "type": "object",
+        "properties": {"id": {"type": "string"}, **item_schema["properties"]},
+        "required": ["id"] + item_schema["required"],
+    }
+    return {"type": "object", "properties": {"results": {"type": "array", "items": item}}, "required": ["results"]}
+
+def matches_schema(value: Any, schema: Dict[str, Any]) -> bool:
+    """Lightweight validation of LLM output against the schemas above (types, required keys, enums)"""
+    expected = schema.get("type")
+    if expected == "object":
+        if not isinstance(value, dict) or any(key not in value for key in schema.get("required", [])):
+            return False
+        return all(matches_schema(value[key], sub) for key, sub in schema.get("properties", {}).items() if key in value)
+    if expected == "array":
+        return isinstance(value, list) and all(matches_schema(item, schema.get("items", {})) for item in value)
+    if "enum" in schema and value not in schema["enum"]:
+        return False
+    if expected == "integer":
+        return isinstance(value, int) and not isinstance(value, bool)
+    if expected == "number":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if expected == "string":
+        return isinstance(value, str)
+    if expected == "boolean":
+        return isinstance(value, bool)
+    return True
+
+CV_EXAMPLE = {
+    "name": "Jan Kowalski",
+    "email": "jan@example.com",
+    "phone": "+48 600 000 000",
+    "experience": [{"company": "Tech Corp", "role": "Senior Developer", "duration": "2020-2023"}],
+    "skills": ["Python"],
+    "education": [{"degree": "MSc CS", "university": "AGH", "year": "2020"}],
+    "languages": ["English"],
+}
+
+SCORE_EXAMPLE = {
+    "score": 85,
+    "strengths": ["strength"],
+    "weaknesses": ["weakness"],
+    "recommendation": "yes",
+    "reasoning": "...",
+}
+
+ANALYSIS_EXAMPLE = {
+    "strengths": ["strength1"],
+    "weaknesses": ["weakness1"],
+    "red_flags": ["flag1"],
+    "opportunities": ["opportunity1"],
+    "seniority_level": "mid",
+    "culture_fit_notes": "brief notes",
+    "detailed_reasoning": "2-3 sentences explaining your analysis",
+}
+
+CV_SCHEMA = schema_from_example(CV_EXAMPLE)
+SCORE_SCHEMA = schema_from_example(SCORE_EXAMPLE, enums={"recommendation": ["yes", "maybe", "no"]})
+ANALYSIS_SCHEMA = schema_from_example(ANALYSIS_EXAMPLE, enums={"seniority_level": ["junior", "mid", "senior", "lead"]})
+
+# Single-pass mode: parsed CV and analysis in one response
+PARSE_ANALYZE_SCHEMA = {
+    "type": "object",
+    "properties": {"cv": CV_SCHEMA, "analysis": ANALYSIS_SCHEMA},
+    "required": ["cv", "analysis"],
+}
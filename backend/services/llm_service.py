@@ -3,56 +3,323 @@ import logging
 logger = logging.getLogger(__name__)
 
 import httpx
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from config import settings
+from services.cache import llm_cache
+from services.single_flight import SingleFlight
+from services.micro_batcher import MicroBatcher, batching_enabled
+from services.llm_scheduler import llm_scheduler, Priority
+from services.llm_schemas import CV_SCHEMA, SCORE_SCHEMA, ANALYSIS_SCHEMA, PARSE_ANALYZE_SCHEMA, batch_schema, matches_schema
+from services.circuit_breaker import llm_breaker
+from services.model_keeper import model_keeper
+from services.ollama_pool import ollama_pool, OllamaBackend
+from services.metrics import LLM_JSON_PARSE_RESULTS, LLM_REQUEST_LATENCY, LLM_HEDGED_REQUESTS, AGENT_LLM_TOKENS
+from contextvars import ContextVar
+import asyncio
 import json
 import re
+import time
 
-class LLMService:
+# Identical prompts in flight at the same time share one Ollama request
+llm_single_flight = SingleFlight("llm")
+
+# Who is calling the LLM (set by BaseAgent.measure) - token usage is attributed to it
+llm_caller: ContextVar[str] = ContextVar("llm_caller", default="direct")
+
+def record_tokens(prompt_tokens: Optional[int], completion_tokens: Optional[int]):
+    agent = llm_caller.get()
+    if prompt_tokens:
+        AGENT_LLM_TOKENS.labels(agent=agent, kind="prompt").inc(prompt_tokens)
+    if completion_tokens:
+        AGENT_LLM_TOKENS.labels(agent=agent, kind="completion").inc(completion_tokens)
+
+# Shared Ollama HTTP client (one connection pool per process, managed by app lifespan)
+_http_client: Optional[httpx.AsyncClient] = None
+
+def _build_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.OLLAMA_TIMEOUT, connect=settings.OLLAMA_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OLLAMA_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OLLAMA_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get shared Ollama client (created lazily outside of app lifespan, e.g. in scripts)"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+    return _http_client
+
+async def init_http_client() -> httpx.AsyncClient:
+    """Open shared Ollama client - called from main.py lifespan"""
+    client = get_http_client()
+    logger.info(f"🔌 Ollama client pool ready (max {settings.OLLAMA_MAX_CONNECTIONS} connections)")
+    return client
+
+async def close_http_client():
+    """Close shared Ollama client - called from main.py lifespan"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+class JSONStreamScanner:
+    """Incremental brace-depth tracker - detects the first complete top-level JSON object in a token stream"""
+    
     def __init__(self):
-        self.base_url = settings.OLLAMA_BASE_URL
+        self.buffer = []
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.result: Optional[str] = None
+    
+    def feed(self, chunk: str) -> Optional[str]:
+        """Feed next token(s); returns object text once the first complete object has been seen"""
+        if self.result is not None:
+            return self.result
+        for char in chunk:
+            if self.depth == 0:
+                if char != "{":
+                    continue
+                self.buffer = []
+            self.buffer.append(char)
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == "\\":
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    candidate = "".join(self.buffer)
+                    try:
+                        json.loads(candidate)
+                    except ValueError:
+                        # Braces balanced but not JSON (e.g. "{name}" in prose) - keep scanning
+                        continue
+                    self.result = candidate
+                    return self.result
+        return None
+
+class LLMService:
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.model = settings.OLLAMA_MODEL
+        self._client = client
+        # Batch-priority score() calls for the same job share one score_candidates_batch call
+        self.score_batcher = MicroBatcher("score", self.score_candidates_batch)
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_http_client()
     
-    async def generate(self, prompt: str, system: Optional[str] = None) -> str:
-        """Generate text using Ollama"""
-        url = f"{self.base_url}/api/generate"
+    async def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        stop_at_json: bool = False,
+        use_cache: bool = True,
+        priority: Optional[Priority] = None,
+        format: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Generate text using Ollama
+        stop_at_json: stream tokens and close the stream as soon as the first
+        complete top-level JSON object has arrived (returns just that object)
+        use_cache: per-call opt-out of the LLM response cache
+        priority: scheduler class (defaults to the current priority_scope)
+        format: JSON schema for Ollama structured output (ignored if OLLAMA_STRUCTURED_OUTPUT is off)
+        Raises LLMOverloadedError when the scheduler queue is full.
+        Returns "" on failure or while the circuit breaker is open.
+        """
+        use_cache = use_cache and settings.LLM_CACHE_ENABLED
+        if not settings.OLLAMA_STRUCTURED_OUTPUT:
+            format = None
+        key = llm_cache.make_key(self.model, prompt, system, {"stop_at_json": stop_at_json, "format": format})
+        if use_cache:
+            cached = await llm_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        if llm_breaker.is_open:
+            # Fail fast instead of queueing behind a dead Ollama
+            return ""
+        
+        async def fetch() -> str:
+            async with llm_scheduler.slot(priority):
+                response = await self._call_ollama(prompt, system, stop_at_json, format)
+            if use_cache:
+                await llm_cache.set(key, response)
+            return response
+        
+        return await llm_single_flight.do(key, fetch)
+    
+    async def _call_ollama(self, prompt: str, system: Optional[str], stop_at_json: bool, format: Optional[Dict[str, Any]] = None) -> str:
+        stream = stop_at_json and settings.OLLAMA_STREAM_JSON
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False
+            "stream": stream,
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE
         }
         if system:
             payload["system"] = system
+        if format:
+            payload["format"] = format
         
+        if not llm_breaker.allow_request():
+            return ""
+        
+        warm = model_keeper.is_warm()
+        start = time.monotonic()
         try:
-            async with httpx.AsyncClient(timeout=360.0) as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                return response.json().get("response", "")
+            text = await asyncio.wait_for(self._dispatch(payload, stream), timeout=llm_breaker.timeout())
+        except asyncio.CancelledError:
+            llm_breaker.record_cancelled()
+            raise
         except Exception as e:
-            logger.info(f"❌ Ollama Error: {e}")
+            llm_breaker.record_failure()
+            logger.info(f"❌ Ollama Error: {e!r}")
             return ""
+        latency = time.monotonic() - start
+        llm_breaker.record_success(latency)
+        LLM_REQUEST_LATENCY.labels(start="warm" if warm else "cold").observe(latency)
+        model_keeper.note_request()
+        return text
     
-    def extract_json(self, text: str) -> Any:
+    async def _dispatch(self, payload: Dict[str, Any], stream: bool) -> str:
+        """Route to the least-loaded Ollama node, hedging to a second node past p95 if enabled"""
+        backend = ollama_pool.pick()
+        hedge_after = llm_breaker.percentile(0.95) if llm_breaker.has_latency_samples else 0
+        if not (settings.OLLAMA_HEDGING and hedge_after and len(ollama_pool.healthy_backends) > 1):
+            return await self._send(backend, payload, stream)
+        
+        primary = asyncio.create_task(self._send(backend, payload, stream))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_after)
+            if done:
+                return primary.result()
+            other = ollama_pool.pick(exclude=[backend])
+            if other is None:
+                return await primary
+            logger.info(f"🪃 Hedging slow call ({hedge_after:.1f}s) to {other.url}")
+            hedge = asyncio.create_task(self._send(other, payload, stream))
+            pending = {primary, hedge}
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        LLM_HEDGED_REQUESTS.labels(winner="primary" if task is primary else "hedge").inc()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _send(self, backend: OllamaBackend, payload: Dict[str, Any], stream: bool) -> str:
+        backend.acquire()
+        try:
+            text = await self._request(f"{backend.url}/api/generate", payload, stream)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            backend.record_failure()
+            raise
+        finally:
+            backend.release()
+        backend.record_success()
+        return text
+    
+    async def _request(self, url: str, payload: Dict[str, Any], stream: bool) -> str:
+        if stream:
+            return await self._generate_stream(url, payload)
+        response = await self.client.post(url, json=payload)
+        response.raise_for_status()
+        data = response.json()
+        record_tokens(data.get("prompt_eval_count"), data.get("eval_count"))
+        return data.get("response", "")
+    
+    async def _generate_stream(self, url: str, payload: Dict[str, Any]) -> str:
+        """Read Ollama NDJSON stream, stop early once a JSON object is complete"""
+        scanner = JSONStreamScanner()
+        tokens = []
+        prompt_tokens = None
+        try:
+            async with self.client.stream("POST", url, json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    token = chunk.get("response", "")
+                    tokens.append(token)
+                    if scanner.feed(token) is not None:
+                        # Leaving the context closes the connection - Ollama stops generating
+                        logger.debug(f"✂️ JSON complete after {len(tokens)} tokens, closing stream")
+                        return scanner.result
+                    if chunk.get("done"):
+                        prompt_tokens = chunk.get("prompt_eval_count")
+                        break
+            return "".join(tokens)
+        finally:
+            # One stream chunk per generated token; prompt count only arrives with the final chunk
+            record_tokens(prompt_tokens, len(tokens))
+    
+    def extract_json(self, text: str, call_site: str = "unknown") -> Any:
         """Extract JSON from text, handling both string and dict responses"""
         # If already a dict, return it
         if isinstance(text, dict):
             return text
         
-        # Try to find JSON in markdown code blocks
+        # Structured output / stream cut-off - whole text is the JSON
         text = text.strip()
-        json_match = re.search(r'\{.*\}', text, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(0))
-            except:
-                pass
-        
-        # Try parsing whole text
         try:
-            return json.loads(text)
-        except:
-            return text
+            parsed = json.loads(text)
+            LLM_JSON_PARSE_RESULTS.labels(call_site=call_site, result="direct").inc()
+            return parsed
+        except ValueError:
+            pass
+        
+        # Fallback: first balanced {...} object in the text (markdown fences, chatter) - single linear pass
+        obj = JSONStreamScanner().feed(text)
+        if obj is not None:
+            LLM_JSON_PARSE_RESULTS.labels(call_site=call_site, result="extracted").inc()
+            return json.loads(obj)
+        
+        LLM_JSON_PARSE_RESULTS.labels(call_site=call_site, result="failed").inc()
+        return text
+    
+    @staticmethod
+    def fallback_parse_cv(cv_text: str, skill_hints: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Deterministic CV parse for degraded mode - contact details + keyword-spotted skills"""
+        cv_text = cv_text or ""
+        lines = [line.strip() for line in cv_text.splitlines() if line.strip()]
+        email = re.search(r"[\w.+-]+@[\w-]+\.[\w.-]+", cv_text)
+        phone = re.search(r"\+?\d[\d\s()-]{7,}\d", cv_text)
+        skills = [
+            skill for skill in (skill_hints or [])
+            if re.search(rf"(?<!\w){re.escape(str(skill))}(?!\w)", cv_text, re.IGNORECASE)
+        ]
+        return {
+            "name": lines[0][:100] if lines else "Unknown",
+            "email": email.group(0) if email else "",
+            "phone": phone.group(0).strip() if phone else "",
+            "experience": [],
+            "skills": skills,
+            "education": [],
+            "languages": [],
+        }
     
     async def parse_cv(self, cv_text: str) -> Dict[str, Any]:
         """Parse CV text into structured data"""
@@ -61,16 +328,68 @@ class LLMService:
         
         user_prompt = f"Parse this CV and return ONLY JSON:\n\n{cv_text}"
         
-        response = await self.generate(user_prompt, system=system_prompt)
+        response = await self.generate(user_prompt, system=system_prompt, stop_at_json=True, format=CV_SCHEMA)
         
-        try:
-            parsed = self.extract_json(response)
-            logger.info(f"✅ DEBUG PARSE_CV SUCCESS: {parsed.get('name', 'N/A')}")
-            return parsed if isinstance(parsed, dict) else {}
-        except Exception as e:
-            logger.info(f"❌ DEBUG PARSE_CV ERROR: {e}")
+        parsed = self.extract_json(response, call_site="parse_cv")
+        if not isinstance(parsed, dict):
+            logger.info(f"❌ DEBUG PARSE_CV ERROR: no JSON object in response")
             logger.info(f"📄 DEBUG PARSE_CV RAW (first 300): {str(response)[:300]}")
             return {}
+        logger.info(f"✅ DEBUG PARSE_CV SUCCESS: {parsed.get('name', 'N/A')}")
+        return parsed
+    
+    async def parse_and_analyze(
+        self,
+        cv_text: str,
+        job_requirements: Dict[str, Any],
+        context: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Single-pass mode: parse CV and run the AnalyzerAgent analysis in one LLM call.
+        Returns (parsed_cv, analysis) - ({}, None) on failure, analysis None if only the CV part is usable.
+        """
+        system_prompt = "You are a CV parser and senior recruitment analyst. Return ONLY valid JSON."
+        
+        prompt = ""
+        if context:
+            prompt += f"COMPANY CONTEXT:\n{context}\n\n"
+        prompt += f"""JOB REQUIREMENTS:
+Must have: {job_requirements.get('must_have', [])}
+Nice to have: {job_requirements.get('nice_to_have', [])}
+
+Task:
+1. Parse the CV below into "cv": name, email, phone, experience, skills, education, languages.
+2. Analyze the candidate against the job in "analysis": strengths, weaknesses, red_flags
+   (job hopping, skill gaps...), opportunities, seniority_level (junior/mid/senior/lead),
+   culture_fit_notes, detailed_reasoning (2-3 sentences). Look beyond keywords - years of
+   relevant experience, career progression, technology stack evolution, education relevance.
+
+Return ONLY JSON: {{"cv": {{...}}, "analysis": {{...}}}}
+
+CV:
+{cv_text}"""
+        
+        response = await self.generate(prompt, system=system_prompt, stop_at_json=True, format=PARSE_ANALYZE_SCHEMA)
+        
+        result = self.extract_json(response, call_site="parse_and_analyze")
+        parsed = result.get("cv") if isinstance(result, dict) else None
+        if not isinstance(parsed, dict) or not parsed:
+            logger.info(f"❌ DEBUG PARSE_AND_ANALYZE ERROR: no CV object in response")
+            logger.info(f"📄 DEBUG PARSE_AND_ANALYZE RAW (first 300): {str(response)[:300]}")
+            return {}, None
+        analysis = result.get("analysis")
+        if not matches_schema(analysis, ANALYSIS_SCHEMA):
+            logger.info(f"⚠️ DEBUG PARSE_AND_ANALYZE: analysis missing/invalid, AnalyzerAgent will run")
+            analysis = None
+        logger.info(f"✅ DEBUG PARSE_AND_ANALYZE SUCCESS: {parsed.get('name', 'N/A')}")
+        return parsed, analysis
+    
+    async def score(self, cv_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> Dict[str, Any]:
+        """score_candidate - at batch priority concurrent calls for the same job are scored in one prompt"""
+        if not batching_enabled():
+            return await self.score_candidate(cv_data, job_requirements)
+        key = json.dumps(job_requirements.get("must_have", []), sort_keys=True, default=str)
+        return await self.score_batcher.submit(key, cv_data, job_requirements)
     
     async def score_candidate(self, cv_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> Dict[str, Any]:
         """Score candidate against job requirements"""
@@ -84,13 +403,71 @@ class LLMService:
 Candidate has: {skills}
 Return ONLY JSON with score, strengths, weaknesses, recommendation, reasoning"""
         
-        response = await self.generate(user_prompt, system=system_prompt)
+        response = await self.generate(user_prompt, system=system_prompt, stop_at_json=True, format=SCORE_SCHEMA)
         
-        try:
-            scored = self.extract_json(response)
-            logger.info(f"✅ DEBUG SCORE SUCCESS: score={scored.get('score')}")
-            return scored if isinstance(scored, dict) else {"score": 0, "strengths": [], "weaknesses": ["Error"], "recommendation": "no", "reasoning": "Failed"}
-        except Exception as e:
-            logger.info(f"❌ DEBUG SCORE ERROR: {e}")
+        scored = self.extract_json(response, call_site="score_candidate")
+        if not isinstance(scored, dict):
+            logger.info(f"❌ DEBUG SCORE ERROR: no JSON object in response")
             logger.info(f"📄 DEBUG SCORE RAW (first 300): {str(response)[:300]}")
             return {"score": 0, "strengths": [], "weaknesses": ["Error"], "recommendation": "no", "reasoning": "Failed"}
+        logger.info(f"✅ DEBUG SCORE SUCCESS: score={scored.get('score')}")
+        return scored
+    
+    async def generate_batch(
+        self,
+        items: List[Any],
+        build_prompt: Callable[[List[Tuple[str, Any]]], str],
+        system: str,
+        item_schema: Dict[str, Any],
+        call_site: str,
+        batch_size: Optional[int] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Process items in batched prompts of at most batch_size (LLM_BATCH_SIZE) items each.
+        build_prompt gets [(item_id, item), ...]; the model answers {"results": [{"id": ..., ...}]}.
+        Returns one dict per item (input order), or None where that item's result was missing/invalid,
+        so callers retry only the bad items.
+        """
+        batch_size = max(1, batch_size or settings.LLM_BATCH_SIZE)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        schema = batch_schema(item_schema)
+        
+        async def run(offset: int):
+            chunk = [(f"c{offset + i + 1}", item) for i, item in enumerate(items[offset:offset + batch_size])]
+            response = await self.generate(build_prompt(chunk), system=system, stop_at_json=True, format=schema)
+            parsed = self.extract_json(response, call_site=f"{call_site}_batch")
+            entries = parsed.get("results", []) if isinstance(parsed, dict) else []
+            by_id = {entry.get("id"): entry for entry in entries if isinstance(entry, dict)}
+            for i, (item_id, _) in enumerate(chunk):
+                entry = by_id.get(item_id)
+                if entry is not None and matches_schema(entry, schema["properties"]["results"]["items"]):
+                    entry = dict(entry)
+                    entry.pop("id")
+                    results[offset + i] = entry
+        
+        await asyncio.gather(*(run(offset) for offset in range(0, len(items), batch_size)))
+        invalid = results.count(None)
+        if invalid:
+            logger.info(f"⚠️ {call_site} batch: {invalid}/{len(items)} items invalid, retrying individually")
+        return results
+    
+    async def score_candidates_batch(self, cv_list: List[Dict[str, Any]], job_requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Score many candidates against one job in few LLM calls (bad items retried one by one)"""
+        system_prompt = """You are a recruiter. Score each candidate 0-100 against the same job.
+        Return ONLY valid JSON: {"results":[{"id":"c1","score":85,"strengths":[],"weaknesses":[],"recommendation":"yes/maybe/no","reasoning":"..."}]}"""
+        must_have = job_requirements.get("must_have", [])
+        
+        def build_prompt(chunk):
+            candidates = "\n".join(f"[{item_id}] Candidate has: {cv.get('skills', [])}" for item_id, cv in chunk)
+            return f"""Job requires: {must_have}
+
+{candidates}
+
+Return ONLY JSON with one result per candidate id: score, strengths, weaknesses, recommendation, reasoning"""
+        
+        results = await self.generate_batch(cv_list, build_prompt, system_prompt, SCORE_SCHEMA, call_site="score_candidate")
+        retries = [i for i, result in enumerate(results) if result is None]
+        retried = await asyncio.gather(*(self.score_candidate(cv_list[i], job_requirements) for i in retries))
+        for i, result in zip(retries, retried):
+            results[i] = result
+        return results
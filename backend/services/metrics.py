@@ -0,0 +1,138 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Prometheus metrics for the LLM layer (exposed on /metrics via the default registry)
+
+LLM_CACHE_REQUESTS = Counter(
+    "rekruter_llm_cache_requests_total",
+    "LLM response cache lookups",
+    ["result"],  # hit / miss
+)
+
+LLM_COALESCED_REQUESTS = Counter(
+    "rekruter_llm_coalesced_requests_total",
+    "LLM calls by single-flight outcome",
+    ["result"],  # executed / deduplicated
+)
+
+LLM_QUEUE_DEPTH = Gauge(
+    "rekruter_llm_queue_depth",
+    "LLM requests waiting for a scheduler slot",
+    ["priority"],
+)
+
+LLM_ACTIVE_REQUESTS = Gauge(
+    "rekruter_llm_active_requests",
+    "LLM requests currently running against Ollama",
+)
+
+LLM_QUEUE_WAIT = Histogram(
+    "rekruter_llm_queue_wait_seconds",
+    "Time spent waiting for an LLM scheduler slot",
+    ["priority"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+
+LLM_REJECTED_REQUESTS = Counter(
+    "rekruter_llm_rejected_requests_total",
+    "LLM requests rejected because the scheduler queue was full",
+    ["priority"],
+)
+
+LLM_JSON_PARSE_RESULTS = Counter(
+    "rekruter_llm_json_parse_total",
+    "JSON extraction outcome per LLM call site",
+    ["call_site", "result"],  # direct / extracted / failed
+)
+
+LLM_BREAKER_STATE = Gauge(
+    "rekruter_llm_breaker_state",
+    "Ollama circuit breaker state (0=closed, 1=half_open, 2=open)",
+)
+
+LLM_SHORT_CIRCUITED = Counter(
+    "rekruter_llm_short_circuited_total",
+    "LLM calls skipped because the circuit breaker was open",
+)
+
+LLM_ADAPTIVE_TIMEOUT = Gauge(
+    "rekruter_llm_timeout_seconds",
+    "Current adaptive timeout for Ollama calls",
+)
+
+LLM_REQUEST_LATENCY = Histogram(
+    "rekruter_llm_request_seconds",
+    "Ollama call latency by model state (cold = model had to be loaded)",
+    ["start"],  # cold / warm
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300),
+)
+
+LLM_MODEL_LOAD = Histogram(
+    "rekruter_llm_model_load_seconds",
+    "Ollama model load time reported by warm-up / keep-alive pings",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+)
+
+OLLAMA_BACKEND_UP = Gauge(
+    "rekruter_ollama_backend_up",
+    "Ollama node admitted to the pool (1) or removed as unhealthy (0)",
+    ["backend"],
+)
+
+OLLAMA_BACKEND_OUTSTANDING = Gauge(
+    "rekruter_ollama_backend_outstanding",
+    "Requests currently in flight per Ollama node",
+    ["backend"],
+)
+
+LLM_HEDGED_REQUESTS = Counter(
+    "rekruter_llm_hedged_requests_total",
+    "Hedged Ollama requests by which attempt finished first",
+    ["winner"],  # primary / hedge
+)
+
+PIPELINE_FAST_REJECTS = Counter(
+    "rekruter_pipeline_fast_rejects_total",
+    "Candidates below the job's fast-reject threshold (AnalyzerAgent LLM call skipped)",
+)
+
+CV_PROCESSING_SECONDS = Histogram(
+    "rekruter_cv_processing_seconds",
+    "Upload parse + scoring time by LLM flow",
+    ["flow"],  # two_pass / single_pass
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600),
+)
+
+AGENT_LATENCY = Histogram(
+    "rekruter_agent_seconds",
+    "Agent process() latency",
+    ["agent"],
+    buckets=(0.001, 0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+AGENT_FAILURES = Counter(
+    "rekruter_agent_failures_total",
+    "Agent calls that raised or returned a failed result",
+    ["agent"],
+)
+
+AGENT_LLM_TOKENS = Counter(
+    "rekruter_agent_llm_tokens_total",
+    "LLM tokens by calling agent (prompt only when Ollama reports it)",
+    ["agent", "kind"],  # kind: prompt / completion
+)
+
+EXTRACTION_SECONDS = Histogram(
+    "rekruter_extraction_seconds",
+    "CV text extraction time (PDF/DOCX/TXT), process pool round trip included",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+CV_DEDUP = Counter(
+    "rekruter_cv_dedup_total",
+    "Upload work skipped thanks to the content-addressed CV store",
+    ["kind"],  # duplicate_file / duplicate_text (same job, no LLM) / text_reused / parse_reused
+)
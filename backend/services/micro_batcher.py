@@ -0,0 +1,74 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple
+from config import settings
+from services.llm_scheduler import Priority, current_priority
+
+def batching_enabled() -> bool:
+    """Only batch-priority calls (bulk upload, re-scoring) wait for a batch"""
+    return current_priority.get() == Priority.BATCH and settings.LLM_BATCH_SIZE > 1
+
+class MicroBatcher:
+    """
+    Collects concurrent calls with the same key (same job = same prompt header) for
+    LLM_BATCH_WINDOW_MS or until LLM_BATCH_SIZE items, then runs them as one
+    run_batch(items, *args) call. A caller cancelled meanwhile (stage timeout) is
+    left out of its batch.
+    """
+
+    def __init__(self, name: str, run_batch: Callable[..., Awaitable[List[Any]]]):
+        self.name = name
+        self.run_batch = run_batch
+        self._pending: Dict[str, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._flushes: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, key: str, item: Any, *args) -> Any:
+        """Result of run_batch for item; args are taken from the first item of the batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(key, [])
+        pending.append((item, future))
+        if len(pending) >= settings.LLM_BATCH_SIZE:
+            self._start_flush(key, args)
+        elif len(pending) == 1:
+            self._timers[key] = loop.call_later(settings.LLM_BATCH_WINDOW_MS / 1000, self._start_flush, key, args)
+        return await future
+
+    def _start_flush(self, key: str, args: Tuple[Any, ...]):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        task = asyncio.create_task(self._flush(self._pending.pop(key, []), args))
+        self._flushes.add(task)  # keep a reference until done
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, pending: List[Tuple[Any, asyncio.Future]], args: Tuple[Any, ...]):
+        pending = [(item, future) for item, future in pending if not future.done()]
+        if not pending:
+            return
+        self.batches += 1
+        self.items += len(pending)
+        logger.debug(f"📦 {self.name}: batch of {len(pending)}")
+        try:
+            results = await self.run_batch([item for item, _ in pending], *args)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "waiting": sum(len(pending) for pending in self._pending.values()),
+        }
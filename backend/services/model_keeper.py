@@ -0,0 +1,125 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import asyncio
+import re
+import time
+from datetime import datetime
+from typing import Optional
+from config import settings
+from services.metrics import LLM_MODEL_LOAD
+
+def parse_keep_alive(value: str) -> float:
+    """Ollama keep_alive ("30m", "1h", "300", "-1") -> seconds (inf = never unload)"""
+    match = re.fullmatch(r"\s*(-?\d+(?:\.\d+)?)\s*([smh]?)\s*", str(value))
+    if not match:
+        return 300.0  # Ollama default: 5m
+    amount = float(match.group(1))
+    if amount < 0:
+        return float("inf")
+    return amount * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+class OllamaModelKeeper:
+    """Preloads the model at startup and keeps it resident during business hours"""
+    
+    def __init__(self):
+        self.model = settings.OLLAMA_MODEL
+        self.keep_alive_seconds = parse_keep_alive(settings.OLLAMA_KEEP_ALIVE)
+        self.warm_until = 0.0  # monotonic time until which we expect the model to be loaded
+        self.last_load_seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def is_warm(self) -> bool:
+        return time.monotonic() < self.warm_until
+    
+    def note_request(self):
+        """Every successful generation resets Ollama's keep_alive timer"""
+        self.warm_until = time.monotonic() + self.keep_alive_seconds
+    
+    @staticmethod
+    def in_business_hours(now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now()
+        if settings.OLLAMA_KEEPER_WEEKDAYS_ONLY and now.weekday() >= 5:
+            return False
+        return settings.BUSINESS_HOURS_START <= now.hour < settings.BUSINESS_HOURS_END
+    
+    async def preload(self, base_url: Optional[str] = None) -> bool:
+        """Load model into memory (empty prompt) and refresh keep_alive"""
+        from services.llm_service import get_http_client
+        
+        try:
+            response = await get_http_client().post(
+                f"{base_url or settings.OLLAMA_BASE_URL}/api/generate",
+                json={"model": self.model, "prompt": "", "stream": False, "keep_alive": settings.OLLAMA_KEEP_ALIVE},
+            )
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning(f"⚠️ Ollama preload failed: {e!r}")
+            return False
+        load_seconds = response.json().get("load_duration", 0) / 1e9
+        if load_seconds > 0.05:
+            LLM_MODEL_LOAD.observe(load_seconds)
+            self.last_load_seconds = load_seconds
+            logger.info(f"🔥 Model {self.model} loaded in {load_seconds:.1f}s")
+        self.note_request()
+        return True
+    
+    async def warm_up(self, base_url: Optional[str] = None):
+        """Preload + one tiny generation so the first upload doesn't pay cold-start costs"""
+        from services.llm_service import get_http_client
+        
+        if not await self.preload(base_url):
+            return
+        start = time.monotonic()
+        try:
+            response = await get_http_client().post(
+                f"{base_url or settings.OLLAMA_BASE_URL}/api/generate",
+                json={
+                    "model": self.model,
+                    "prompt": "Reply with OK.",
+                    "stream": False,
+                    "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+                    "options": {"num_predict": 4},
+                },
+            )
+            response.raise_for_status()
+            logger.info(f"🔥 Warm-up generation done in {time.monotonic() - start:.1f}s")
+        except Exception as e:
+            logger.warning(f"⚠️ Ollama warm-up generation failed: {e!r}")
+    
+    async def run(self):
+        """Background keeper: re-ping the model on every node before keep_alive expires during business hours"""
+        from services.ollama_pool import ollama_pool
+        
+        if settings.OLLAMA_WARMUP_ON_STARTUP:
+            await asyncio.gather(*(self.warm_up(b.url) for b in ollama_pool.backends))
+        if not settings.OLLAMA_KEEPER_ENABLED:
+            return
+        while True:
+            await asyncio.sleep(settings.OLLAMA_KEEPER_INTERVAL)
+            if self.in_business_hours():
+                await asyncio.gather(*(self.preload(b.url) for b in ollama_pool.healthy_backends))
+    
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def stats(self):
+        return {
+            "model": self.model,
+            "warm": self.is_warm(),
+            "last_load_seconds": self.last_load_seconds,
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+        }
+
+model_keeper = OllamaModelKeeper()
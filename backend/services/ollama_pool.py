@@ -0,0 +1,117 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import asyncio
+import random
+from typing import Iterable, List, Optional
+from config import settings
+from services.metrics import OLLAMA_BACKEND_UP, OLLAMA_BACKEND_OUTSTANDING
+
+class OllamaBackend:
+    """One Ollama node with load and health bookkeeping"""
+    
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.healthy = True
+        self.consecutive_failures = 0
+        OLLAMA_BACKEND_UP.labels(backend=self.url).set(1)
+    
+    def acquire(self):
+        self.outstanding += 1
+        OLLAMA_BACKEND_OUTSTANDING.labels(backend=self.url).set(self.outstanding)
+    
+    def release(self):
+        self.outstanding -= 1
+        OLLAMA_BACKEND_OUTSTANDING.labels(backend=self.url).set(self.outstanding)
+    
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.mark_healthy()
+    
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.healthy and self.consecutive_failures >= settings.OLLAMA_NODE_MAX_FAILURES:
+            self.mark_unhealthy()
+    
+    def mark_healthy(self):
+        if not self.healthy:
+            logger.info(f"✅ Ollama node {self.url} re-admitted")
+        self.healthy = True
+        OLLAMA_BACKEND_UP.labels(backend=self.url).set(1)
+    
+    def mark_unhealthy(self):
+        if self.healthy:
+            logger.warning(f"⚠️ Ollama node {self.url} removed from pool")
+        self.healthy = False
+        OLLAMA_BACKEND_UP.labels(backend=self.url).set(0)
+
+class OllamaPool:
+    """Least-outstanding-requests routing over several Ollama nodes with health checks"""
+    
+    def __init__(self, urls: Optional[List[str]] = None):
+        self.configure(urls or settings.ollama_backends)
+        self._task: Optional[asyncio.Task] = None
+    
+    def configure(self, urls: List[str]):
+        self.backends = [OllamaBackend(url) for url in urls]
+    
+    @property
+    def healthy_backends(self) -> List[OllamaBackend]:
+        return [b for b in self.backends if b.healthy]
+    
+    def pick(self, exclude: Iterable[OllamaBackend] = ()) -> Optional[OllamaBackend]:
+        """Healthy node with the fewest requests in flight (random tie-break)"""
+        excluded = set(exclude)
+        candidates = [b for b in self.healthy_backends if b not in excluded]
+        if not candidates:
+            if excluded:
+                return None
+            # Every node marked down - try them anyway rather than failing without a request
+            candidates = self.backends
+        least = min(b.outstanding for b in candidates)
+        return random.choice([b for b in candidates if b.outstanding == least])
+    
+    async def check(self, backend: OllamaBackend) -> bool:
+        from services.llm_service import get_http_client
+        
+        try:
+            response = await get_http_client().get(f"{backend.url}/api/tags", timeout=settings.OLLAMA_HEALTH_CHECK_TIMEOUT)
+            response.raise_for_status()
+        except Exception as e:
+            logger.info(f"❌ Ollama health check failed for {backend.url}: {e!r}")
+            backend.mark_unhealthy()
+            return False
+        backend.consecutive_failures = 0
+        backend.mark_healthy()
+        return True
+    
+    async def check_all(self):
+        await asyncio.gather(*(self.check(b) for b in self.backends))
+    
+    async def run(self):
+        while True:
+            await self.check_all()
+            await asyncio.sleep(settings.OLLAMA_HEALTH_CHECK_INTERVAL)
+    
+    def start(self):
+        if self._task is None and len(self.backends) > 1:
+            self._task = asyncio.create_task(self.run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def stats(self):
+        return [
+            {"url": b.url, "healthy": b.healthy, "outstanding": b.outstanding}
+            for b in self.backends
+        ]
+
+ollama_pool = OllamaPool()
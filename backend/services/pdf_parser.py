@@ -3,53 +3,48 @@ import logging
 logger = logging.getLogger(__name__)
 
 import fitz
+import io
 from pathlib import Path
 from typing import Optional
 from docx import Document
 
 class PDFParserService:
-    """Real PDF and DOCX parsing with TXT fallback"""
+    """Real PDF and DOCX parsing with TXT fallback (in memory - uploads never touch the disk)"""
     
     @staticmethod
-    def extract_text_from_pdf(file_path: str) -> Optional[str]:
-        """Extract text from PDF using PyMuPDF with TXT fallback"""
+    def text_from_pdf(content: bytes) -> Optional[str]:
+        """Extract text from PDF bytes using PyMuPDF with TXT fallback"""
         try:
-            doc = fitz.open(file_path)
+            doc = fitz.open(stream=content, filetype="pdf")
+            pages = len(doc)
             text = ""
             
-            for page_num in range(len(doc)):
+            # Pages separated by a form feed - CVCompactor finds running headers/footers by page
+            for page_num in range(pages):
                 page = doc[page_num]
-                text += page.get_text()
+                text += ("\f" if page_num else "") + page.get_text()
             
             doc.close()
             
             if not text.strip():
                 raise Exception("PDF is empty")
             
-            logger.info(f"✅ PDF parsed: {len(text)} characters from {len(doc)} pages")
+            logger.info(f"✅ PDF parsed: {len(text)} characters from {pages} pages")
             return text.strip()
         
         except Exception as e:
             logger.info(f"⚠️ PDF Parse Error: {e} - trying TXT fallback...")
             # Fallback: read as plain text
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    text = f.read().strip()
-                
-                if not text:
-                    return None
-                    
+            text = PDFParserService.text_from_plain(content)
+            if text:
                 logger.info(f"✅ TXT fallback SUCCESS: {len(text)} characters")
-                return text
-            except Exception as txt_err:
-                logger.info(f"❌ TXT Fallback FAILED: {txt_err}")
-                return None
+            return text
     
     @staticmethod
-    def extract_text_from_docx(file_path: str) -> Optional[str]:
-        """Extract text from DOCX"""
+    def text_from_docx(content: bytes) -> Optional[str]:
+        """Extract text from DOCX bytes"""
         try:
-            doc = Document(file_path)
+            doc = Document(io.BytesIO(content))
             text = []
             
             for para in doc.paragraphs:
@@ -69,23 +64,54 @@ class PDFParserService:
             return None
     
     @staticmethod
-    def extract_text(file_path: str) -> Optional[str]:
-        """Smart extraction based on file extension"""
-        path = Path(file_path)
-        ext = path.suffix.lower()
+    def extract_text_from_bytes(filename: str, content: bytes) -> Optional[str]:
+        """Smart extraction of an in-memory upload based on its file extension"""
+        ext = Path(filename or "").suffix.lower()
         
         if ext == '.pdf':
-            return PDFParserService.extract_text_from_pdf(file_path)
+            return PDFParserService.text_from_pdf(content)
         elif ext in ['.docx', '.doc']:
-            return PDFParserService.extract_text_from_docx(file_path)
+            return PDFParserService.text_from_docx(content)
         else:
             # Fallback dla innych - czytaj jako TXT
-            logger.info(f"⚠️ Unknown extension {ext}, trying TXT...")
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    text = f.read().strip()
-                logger.info(f"✅ TXT read: {len(text)} chars")
-                return text if text else None
-            except Exception as e:
-                logger.info(f"❌ TXT read failed: {e}")
-                return None
+            if ext != '.txt':
+                logger.info(f"⚠️ Unknown extension {ext}, trying TXT...")
+            return PDFParserService.text_from_plain(content)
+    
+    @staticmethod
+    def text_from_plain(content: bytes) -> Optional[str]:
+        """UTF-8 text, None when empty or binary"""
+        try:
+            text = content.decode('utf-8').strip()
+        except UnicodeDecodeError as e:
+            logger.info(f"❌ TXT read failed: {e}")
+            return None
+        return text if text else None
+    
+    @staticmethod
+    def _read(file_path: str) -> Optional[bytes]:
+        try:
+            return Path(file_path).read_bytes()
+        except OSError as e:
+            logger.info(f"❌ Cannot read {file_path}: {e}")
+            return None
+    
+    @staticmethod
+    def extract_text_from_pdf(file_path: str) -> Optional[str]:
+        """Extract text from a PDF file"""
+        content = PDFParserService._read(file_path)
+        return PDFParserService.text_from_pdf(content) if content is not None else None
+    
+    @staticmethod
+    def extract_text_from_docx(file_path: str) -> Optional[str]:
+        """Extract text from a DOCX file"""
+        content = PDFParserService._read(file_path)
+        return PDFParserService.text_from_docx(content) if content is not None else None
+    
+    @staticmethod
+    def extract_text(file_path: str) -> Optional[str]:
+        """Smart extraction based on file extension"""
+        content = PDFParserService._read(file_path)
+        if content is None:
+            return None
+        return PDFParserService.extract_text_from_bytes(file_path, content)
@@ -0,0 +1,181 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import asyncio
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
+from config import settings
+from database import AsyncSessionLocal
+from models import Job, Candidate
+from services.llm_scheduler import Priority, priority_scope, LLMOverloadedError
+from services.cv_processing import reparse_candidate
+
+def apply_scoring(candidate: Candidate, scoring_result: Dict[str, Any], reparsed: bool = False) -> Candidate:
+    """
+    Copy orchestrator output onto a stored candidate. A degraded candidate stays degraded
+    (its parsed_cv is still the keyword fallback) unless it was just re-parsed.
+    """
+    candidate.score = scoring_result.get("score", 0)
+    candidate.strengths = scoring_result.get("strengths", [])
+    candidate.weaknesses = scoring_result.get("weaknesses", [])
+    candidate.recommendation = scoring_result.get("recommendation", "pending")
+    if candidate.scoring_mode != "degraded" or reparsed:
+        candidate.scoring_mode = scoring_result.get("scoring_mode", "full")
+    candidate.stage_results = scoring_result.get("stage_results", {})
+    return candidate
+
+class JobRescorer:
+    """
+    Background re-scoring of all candidates of a job after its requirements change.
+    Stage results cached on each candidate are reused, so usually only the cheap
+    Screener/Scorer run - AnalyzerAgent only when must_have/nice_to_have changed.
+    Degraded candidates are re-parsed from the CV store first while the LLM is up.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._orchestrator = None
+        self.rescored = 0
+
+    @property
+    def orchestrator(self):
+        if self._orchestrator is None:
+            from services.agents.registry import agent_registry
+            return agent_registry.orchestrator
+        return self._orchestrator
+
+    def schedule(self, job_id: str) -> asyncio.Task:
+        """Start re-scoring a job (a run already going for the same job is restarted)"""
+        job_id = str(job_id)
+        previous = self._tasks.get(job_id)
+        if previous is not None and not previous.done():
+            previous.cancel()
+        task = asyncio.create_task(self.rescore_job(job_id), name=f"rescore:{job_id}")
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda t: self._tasks.pop(job_id, None) if self._tasks.get(job_id) is t else None)
+        return task
+
+    async def rescore_job(self, job_id: str) -> int:
+        """Re-score every candidate of the job (LLM calls at batch priority), returns count"""
+        count = 0
+        with priority_scope(Priority.BATCH):
+            async with AsyncSessionLocal() as db:
+                job = (await db.execute(select(Job).where(Job.id == job_id))).scalar_one_or_none()
+                if job is None:
+                    return 0
+                candidates = (await db.execute(select(Candidate).where(Candidate.job_id == job_id))).scalars().all()
+                logger.info(f"🔁 Re-scoring {len(candidates)} candidates of job {job_id}")
+                # Whole job screened in one vectorized pass over its cached skill matrix
+                screenings = await self.orchestrator.screener.process_job(
+                    job_id,
+                    [(candidate.id, (candidate.parsed_cv or {}).get("skills", [])) for candidate in candidates],
+                    job.requirements,
+                )
+
+                # Pipelines of a chunk run side by side so their AnalyzerAgent calls share batched prompts
+                size = max(1, settings.LLM_BATCH_SIZE)
+                for start in range(0, len(candidates), size):
+                    count += await self.rescore_chunk(
+                        db, job, candidates[start:start + size], screenings[start:start + size]
+                    )
+
+        self.rescored += count
+        logger.info(f"✅ Re-scored {count} candidates of job {job_id}")
+        return count
+
+    async def rescore_chunk(self, db, job: Job, candidates: List[Candidate], screenings: List[Dict[str, Any]]) -> int:
+        """Re-score a few candidates concurrently, returns how many were saved"""
+        reparsed = []
+        for candidate in candidates:
+            try:
+                # Committed on its own - a failed re-score must not undo the other re-parses
+                reparsed.append(candidate.scoring_mode == "degraded" and await reparse_candidate(db, candidate))
+                await db.commit()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await db.rollback()
+                reparsed.append(False)
+                logger.error(f"❌ Re-parsing candidate {candidate.id} failed: {e}")
+
+        results = await asyncio.gather(
+            *(
+                self.score_candidate(
+                    candidate,
+                    job.requirements,
+                    job.company_id,
+                    # A re-parse changed the skills - screened again in the pipeline
+                    screening=None if was_reparsed else screening,
+                )
+                for candidate, screening, was_reparsed in zip(candidates, screenings, reparsed)
+            ),
+            return_exceptions=True,
+        )
+        scored = 0
+        for candidate, scoring_result, was_reparsed in zip(candidates, results, reparsed):
+            if isinstance(scoring_result, asyncio.CancelledError):
+                raise scoring_result
+            if isinstance(scoring_result, Exception):
+                logger.error(f"❌ Re-scoring candidate {candidate.id} failed: {scoring_result}")
+                continue
+            apply_scoring(candidate, scoring_result, reparsed=was_reparsed)
+            scored += 1
+        try:
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"❌ Saving re-scored candidates of job {job.id} failed: {e}")
+            return 0
+        return scored
+
+    async def score_candidate(
+        self,
+        candidate: Candidate,
+        job_requirements: Dict[str, Any],
+        company_id: Optional[str] = None,
+        screening: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Orchestrator result for a stored candidate - one already fully analyzed is never fast-rejected again"""
+        while True:
+            try:
+                scoring_result = await self.orchestrator.process_candidate(
+                    cv_data=candidate.parsed_cv or {},
+                    job_requirements=job_requirements,
+                    company_id=company_id,
+                    fast_reject=candidate.scoring_mode != "full",
+                    cached_stages=candidate.stage_results,
+                    screening=screening,
+                )
+                break
+            except LLMOverloadedError as e:
+                # Interactive uploads fill the queue - wait instead of dropping the candidate
+                await asyncio.sleep(e.retry_after)
+
+        reused = scoring_result.get("pipeline", {}).get("reused", [])
+        logger.info(f"   🔁 {candidate.id}: score {candidate.score} -> {scoring_result.get('score', 0)} (reused: {reused})")
+        return scoring_result
+
+    async def rescore_candidate(
+        self,
+        candidate: Candidate,
+        job_requirements: Dict[str, Any],
+        company_id: Optional[str] = None,
+        reparsed: bool = False,
+        screening: Optional[Dict[str, Any]] = None
+    ):
+        """Re-score one candidate in place"""
+        scoring_result = await self.score_candidate(candidate, job_requirements, company_id, screening)
+        apply_scoring(candidate, scoring_result, reparsed=reparsed)
+
+    async def stop(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def stats(self):
+        return {"running_jobs": len(self._tasks), "rescored": self.rescored}
+
+job_rescorer = JobRescorer()
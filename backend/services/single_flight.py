@@ -0,0 +1,43 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+from services.metrics import LLM_COALESCED_REQUESTS
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight future"""
+    
+    def __init__(self, name: str = "llm"):
+        self.name = name
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.executed = 0
+        self.deduplicated = 0
+    
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+    
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() once per key; concurrent callers with the same key share its result"""
+        future = self._calls.get(key)
+        if future is not None:
+            self.deduplicated += 1
+            LLM_COALESCED_REQUESTS.labels(result="deduplicated").inc()
+            logger.debug(f"🔗 {self.name}: joined in-flight call {key[:16]}")
+        else:
+            self.executed += 1
+            LLM_COALESCED_REQUESTS.labels(result="executed").inc()
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        # Shield - one caller giving up (client disconnect) must not cancel the shared call
+        return await asyncio.shield(future)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executed": self.executed,
+            "deduplicated": self.deduplicated,
+            "in_flight": self.in_flight,
+        }
@@ -0,0 +1,136 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import os
+import threading
+import uuid
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from config import settings
+from services.skill_taxonomy import normalize_skill
+
+class SkillEmbeddingIndex:
+    """
+    Persistent skill-string -> unit vector matrix for semantic skill matching
+    ("ML" ~ "machine learning"). Each distinct (normalized) skill string is encoded
+    once with the CompanyKnowledgeRAG SentenceTransformer; matching is a single
+    matrix multiply of required vs candidate vectors against a cosine threshold.
+    """
+
+    def __init__(self, path: Optional[str] = None, encoder: Any = None):
+        self.path = Path(path or settings.SKILL_EMBEDDINGS_PATH)
+        self._encoder = encoder
+        self._lock = threading.RLock()
+        self._encoder_failed = False
+        self.keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self.matrix: Optional[np.ndarray] = None
+        self._loaded = False
+
+    @property
+    def encoder(self):
+        if self._encoder is None and not self._encoder_failed:
+            try:
+                from services.rag_service import get_rag
+                rag = get_rag()
+                self._encoder = rag.encoder if rag else None
+            except Exception as e:
+                self._encoder_failed = True
+                logger.info(f"⚠️ Skill encoder unavailable ({e}) - semantic matching off")
+        return self._encoder
+
+    def load(self):
+        """Main file + part files appended since (oldest first), merged into the main file once"""
+        self._loaded = True
+        parts = sorted(self.path.parent.glob(f"{self.path.stem}.part-*.npz"), key=lambda part: part.stat().st_mtime_ns)
+        keys: List[str] = []
+        blocks: List[np.ndarray] = []
+        for file in ([self.path] if self.path.exists() else []) + parts:
+            try:
+                with np.load(file, allow_pickle=False) as data:
+                    file_keys, matrix = [str(k) for k in data["keys"]], data["matrix"].astype(np.float32)
+            except Exception as e:
+                logger.info(f"⚠️ Skill embeddings file {file.name} unreadable ({e}) - skipped")
+                continue
+            if blocks and matrix.shape[1] != blocks[-1].shape[1]:
+                keys, blocks = [], []  # encoder changed - older vectors are useless
+            keys.extend(file_keys)
+            blocks.append(matrix)
+        if not blocks:
+            return
+        keep = sorted({key: i for i, key in enumerate(keys)}.values())
+        self.keys = [keys[i] for i in keep]
+        self.matrix = np.vstack(blocks)[keep]
+        self._rows = {key: i for i, key in enumerate(self.keys)}
+        logger.info(f"🧠 Skill embeddings loaded: {len(self.keys)} skills")
+        if parts:
+            self._write(self.path, self.keys, self.matrix)
+            for part in parts:
+                part.unlink(missing_ok=True)
+
+    def append(self, keys: List[str], matrix: np.ndarray):
+        """New rows go to their own part file - the whole matrix is not rewritten per batch"""
+        self._write(self.path.with_name(f"{self.path.stem}.part-{uuid.uuid4().hex}.npz"), keys, matrix)
+
+    def _write(self, path: Path, keys: List[str], matrix: np.ndarray):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, keys=np.array(keys), matrix=matrix)
+        os.replace(tmp, path)
+
+    def vectors(self, skills: Sequence[str]) -> np.ndarray:
+        """Unit vectors for the skills (new strings encoded in one batch and persisted)"""
+        normalized = [normalize_skill(skill) for skill in skills]
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            missing = list(dict.fromkeys(s for s in normalized if s and s not in self._rows))
+            if missing:
+                encoded = np.asarray(self.encoder.encode(missing), dtype=np.float32).reshape(len(missing), -1)
+                encoded /= np.maximum(np.linalg.norm(encoded, axis=1, keepdims=True), 1e-12)
+                if self.matrix is not None and self.matrix.shape[1] != encoded.shape[1]:
+                    logger.info("⚠️ Encoder dimension changed - dropping cached skill embeddings")
+                    self.keys, self._rows, self.matrix = [], {}, None
+                    return self.vectors(skills)
+                self.matrix = encoded if self.matrix is None else np.vstack([self.matrix, encoded])
+                for skill in missing:
+                    self._rows[skill] = len(self.keys)
+                    self.keys.append(skill)
+                self.append(missing, encoded)
+            dimension = self.matrix.shape[1] if self.matrix is not None else 0
+            rows = [self._rows.get(s) for s in normalized]
+            out = np.zeros((len(rows), dimension), dtype=np.float32)
+            known = [i for i, row in enumerate(rows) if row is not None]
+            if known:
+                out[known] = self.matrix[[rows[i] for i in known]]
+            return out
+
+    def match(self, required: Sequence[str], candidate: Sequence[str], threshold: Optional[float] = None) -> np.ndarray:
+        """(len(required), len(candidate)) bool - cosine similarity >= threshold"""
+        if not required or not candidate:
+            return np.zeros((len(required), len(candidate)), dtype=bool)
+        threshold = settings.SKILL_SEMANTIC_THRESHOLD if threshold is None else threshold
+        return (self.vectors(required) @ self.vectors(candidate).T) >= threshold
+
+    @property
+    def available(self) -> bool:
+        return self.encoder is not None
+
+    def semantic_matches(self, required: Sequence[str], candidate: Sequence[str]) -> Dict[str, List[str]]:
+        """{required skill: candidate skills close enough} - empty when the encoder is unavailable"""
+        required, candidate = list(required), [str(s) for s in candidate]
+        if not required or not candidate or not self.available:
+            return {}
+        hits = self.match(required, candidate)
+        return {
+            skill: [candidate[j] for j in np.flatnonzero(row)]
+            for skill, row in zip(required, hits) if row.any()
+        }
+
+def semantic_mode() -> bool:
+    return settings.SKILL_MATCH_MODE == "semantic"
+
+skill_embeddings = SkillEmbeddingIndex()
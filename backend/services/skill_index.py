@@ -0,0 +1,59 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+from typing import Any, Dict, Iterable, List
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Candidate, CandidateSkill
+from services.skill_taxonomy import skill_taxonomy
+
+def skill_keys(skills: Iterable[str]) -> List[str]:
+    """Candidate skills -> canonical keys (aliases merged, parents implied)"""
+    scope = skill_taxonomy.scope()
+    return sorted({scope.key(skill_id) for skill_id in skill_taxonomy.encode(skills, scope)})
+
+def query_keys(skills: Iterable[str]) -> List[str]:
+    """Filter terms -> canonical keys (unknown terms as their compact spelling)"""
+    keys = []
+    for skill in skills:
+        # Same normalization as the indexed keys (skill_keys via SkillScope)
+        key = skill_taxonomy.skill_key(skill)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+def index_entries(job_id: Any, parsed_cv: Dict[str, Any]) -> List[CandidateSkill]:
+    """Index rows for a new candidate (assign to candidate.skill_index)"""
+    return [CandidateSkill(job_id=str(job_id), skill=key) for key in skill_keys((parsed_cv or {}).get("skills", []))]
+
+def filter_by_skills(query, job_id: Any, skills: List[str], mode: str = "and"):
+    """
+    Restrict a Candidate select to candidates having all (and) / any (or) of the skills.
+    Resolved on the (job_id, skill) index - cost follows the matching rows, not the job size.
+    """
+    keys = query_keys(skills)
+    if not keys:
+        return query
+    matching = select(CandidateSkill.candidate_id).where(
+        CandidateSkill.job_id == str(job_id),
+        CandidateSkill.skill.in_(keys),
+    )
+    if mode == "and":
+        matching = matching.group_by(CandidateSkill.candidate_id).having(func.count() == len(keys))
+    return query.where(Candidate.id.in_(matching))
+
+async def reindex_job(db: AsyncSession, job_id: Any) -> int:
+    """Rebuild the index of one job (after taxonomy changes / for rows created before the index)"""
+    await db.execute(delete(CandidateSkill).where(CandidateSkill.job_id == str(job_id)))
+    candidates = (await db.execute(select(Candidate).where(Candidate.job_id == str(job_id)))).scalars().all()
+    rows = 0
+    for candidate in candidates:
+        entries = index_entries(job_id, candidate.parsed_cv)
+        for entry in entries:
+            entry.candidate_id = candidate.id
+        db.add_all(entries)
+        rows += len(entries)
+    await db.commit()
+    logger.info(f"🗂️ Skill index rebuilt for job {job_id}: {len(candidates)} candidates, {rows} entries")
+    return rows
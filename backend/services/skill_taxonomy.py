@@ -0,0 +1,227 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from config import settings
+
+_WHITESPACE = re.compile(r"\s+")
+_NON_ALNUM = re.compile(r"[^\w+#]")  # keep c++ / c# apart from c
+
+def normalize_skill(skill: str) -> str:
+    """'  React.JS ' -> 'react.js'"""
+    return _WHITESPACE.sub(" ", str(skill).strip().lower()).strip(" ,;:.-")
+
+def compact_skill(skill: str) -> str:
+    """'react.js' -> 'reactjs', 'node js' -> 'nodejs'"""
+    return _NON_ALNUM.sub("", normalize_skill(skill))
+
+RESOLVED_CACHE_MAX = 50000  # raw spellings remembered per taxonomy
+
+class SkillTaxonomy:
+    """
+    Compiled skill taxonomy: aliases -> canonical integer IDs (dense, usable as bit
+    positions) plus the parent hierarchy (PostgreSQL counts as SQL, Django as Python).
+    Read-only after loading (safe to share between threads); skills outside the
+    taxonomy get IDs in a SkillScope, so they still match exactly
+    (case/punctuation-insensitive) within one encoding.
+    """
+
+    def __init__(self, skills: Optional[Dict[str, dict]] = None, version: str = "empty"):
+        self.version = version
+        self.keys: List[str] = []
+        self.names: List[str] = []
+        self._lookup: Dict[str, int] = {}
+        self._resolved: Dict[str, Tuple[Optional[int], str]] = {}  # raw spelling -> (ID, compact), skips normalization on repeats
+        self._parents: List[Optional[int]] = []
+        self._ancestors: List[Tuple[int, ...]] = []
+        self._compile(skills or {})
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "SkillTaxonomy":
+        path = Path(path or settings.SKILL_TAXONOMY_PATH)
+        if not path.is_absolute() and not path.exists():
+            path = Path(__file__).resolve().parent.parent / path
+        try:
+            raw = path.read_bytes()
+        except OSError as e:
+            logger.info(f"⚠️ Skill taxonomy not loaded ({e}) - exact matching only")
+            return cls()
+        data = json.loads(raw)
+        taxonomy = cls(data.get("skills", {}), version=hashlib.sha256(raw).hexdigest()[:12])
+        logger.info(f"🧭 Skill taxonomy loaded: {len(taxonomy.keys)} skills, {len(taxonomy._lookup)} aliases")
+        return taxonomy
+
+    def _compile(self, skills: Dict[str, dict]):
+        for key, entry in skills.items():
+            skill_id = self._add(key, entry.get("name", key))
+            for alias in [key, entry.get("name", key)] + entry.get("aliases", []):
+                self._index(alias, skill_id)
+        # Parents resolved after all IDs exist
+        for key, entry in skills.items():
+            parent = entry.get("parent")
+            if parent is not None:
+                if parent not in skills:
+                    raise ValueError(f"Skill '{key}' has unknown parent '{parent}'")
+                self._parents[self.keys.index(key)] = self.keys.index(parent)
+        self._ancestors = [self._closure(i) for i in range(len(self.keys))]
+
+    def _add(self, key: str, name: str) -> int:
+        self.keys.append(key)
+        self.names.append(name)
+        self._parents.append(None)
+        self._ancestors.append((len(self.keys) - 1,))
+        return len(self.keys) - 1
+
+    def _index(self, alias: str, skill_id: int):
+        for form in (normalize_skill(alias), compact_skill(alias)):
+            if form:
+                self._lookup.setdefault(form, skill_id)
+
+    def _closure(self, skill_id: int) -> Tuple[int, ...]:
+        chain = [skill_id]
+        while self._parents[chain[-1]] is not None:
+            parent = self._parents[chain[-1]]
+            if parent in chain:
+                raise ValueError(f"Cycle in skill taxonomy at '{self.keys[parent]}'")
+            chain.append(parent)
+        return tuple(chain)
+
+    @property
+    def size(self) -> int:
+        return len(self.keys)
+
+    def canonical_id(self, skill: str) -> Optional[int]:
+        """Taxonomy ID of a skill string (None for empty / unknown)"""
+        return self._resolve(skill)[0]
+
+    def skill_key(self, skill: str) -> str:
+        """Taxonomy key, or the key SkillScope gives an unknown skill (its compact spelling)"""
+        skill_id, key = self._resolve(skill)
+        return self.keys[skill_id] if skill_id is not None else key
+
+    def _resolve(self, skill: str) -> Tuple[Optional[int], str]:
+        """(taxonomy ID or None, compact form) - cached per raw spelling, up to RESOLVED_CACHE_MAX"""
+        resolved = self._resolved.get(skill) if isinstance(skill, str) else None
+        if resolved is not None:
+            return resolved
+        normalized = normalize_skill(skill)
+        compact = compact_skill(normalized)
+        resolved = (self._lookup_forms(normalized, compact) if normalized else None, compact or normalized)
+        if isinstance(skill, str) and len(self._resolved) < RESOLVED_CACHE_MAX:
+            self._resolved[skill] = resolved
+        return resolved
+
+    def _lookup_forms(self, normalized: str, compact: str) -> Optional[int]:
+        for form in (normalized, compact, compact[:-2] if compact.endswith("js") else None):
+            if form and form in self._lookup:
+                return self._lookup[form]
+        return None
+
+    def scope(self) -> "SkillScope":
+        return SkillScope(self)
+
+    def canonical_name(self, skill: str) -> str:
+        skill_id = self.canonical_id(skill)
+        return self.names[skill_id] if skill_id is not None else str(skill).strip()
+
+    def ancestors(self, skill_id: int) -> Tuple[int, ...]:
+        """The skill itself and everything it implies (parent chain)"""
+        return self._ancestors[skill_id] if skill_id < len(self._ancestors) else (skill_id,)
+
+    def _ids(self, skills: Iterable[str], scope: Optional["SkillScope"], extend: bool = True) -> Iterator[Tuple[str, int]]:
+        """(skill, ID) of every resolvable skill - hot loop of bulk encoding, so cached spellings skip method calls"""
+        resolved = self._resolved
+        for skill in skills or []:
+            cached = resolved.get(skill) if isinstance(skill, str) else None
+            skill_id, key = cached or self._resolve(skill)
+            if skill_id is None and scope is not None and key:
+                skill_id = scope.key_id(key) if extend else scope.find(key)
+            if skill_id is not None:
+                yield skill, skill_id
+
+    def encode(self, skills: Iterable[str], scope: Optional["SkillScope"] = None, extend: bool = True) -> Set[int]:
+        """
+        Candidate skills -> set of IDs including implied parents (unknown skills only with
+        a scope; extend=False ignores those the scope doesn't have yet)
+        """
+        ids: Set[int] = set()
+        known = len(self._ancestors)
+        for _, skill_id in self._ids(skills, scope, extend):
+            if skill_id < known:
+                ids.update(self._ancestors[skill_id])
+            else:
+                ids.add(skill_id)
+        return ids
+
+    def requirements(self, skills: Iterable[str], scope: Optional["SkillScope"] = None) -> Dict[int, str]:
+        """Required skills -> {ID: first spelling used in the job}, duplicates/aliases merged"""
+        required: Dict[int, str] = {}
+        for skill, skill_id in self._ids(skills, scope):
+            required.setdefault(skill_id, str(skill))
+        return required
+
+class SkillScope:
+    """
+    IDs for skills outside the taxonomy, numbered after the taxonomy's and valid only
+    for encodings made through this scope - unknown skills never grow the shared
+    taxonomy. child() extends a scope without changing it (new requirements against
+    a cached encoding).
+    """
+
+    def __init__(self, taxonomy: SkillTaxonomy, parent: Optional["SkillScope"] = None):
+        self.taxonomy = taxonomy
+        self.parent = parent
+        self.base = parent.size if parent is not None else taxonomy.size
+        self.keys: List[str] = []
+        self._lookup: Dict[str, int] = {}
+
+    @property
+    def size(self) -> int:
+        return self.base + len(self.keys)
+
+    def child(self) -> "SkillScope":
+        return SkillScope(self.taxonomy, self)
+
+    def find(self, key: str) -> Optional[int]:
+        """ID of an unknown skill's compact form, None if not seen in this scope"""
+        scope = self
+        while scope is not None:
+            skill_id = scope._lookup.get(key)
+            if skill_id is None and key.endswith("js"):
+                skill_id = scope._lookup.get(key[:-2])
+            if skill_id is not None:
+                return skill_id
+            scope = scope.parent
+        return None
+
+    def key_id(self, key: str) -> int:
+        """ID of an unknown skill's compact form, assigned on first sight"""
+        skill_id = self.find(key)
+        if skill_id is not None:
+            return skill_id
+        skill_id = self.base + len(self.keys)
+        self.keys.append(key)
+        self._lookup[key] = skill_id
+        return skill_id
+
+    def id(self, skill: str) -> Optional[int]:
+        skill_id, key = self.taxonomy._resolve(skill)
+        if skill_id is None and key:
+            skill_id = self.key_id(key)
+        return skill_id
+
+    def key(self, skill_id: int) -> str:
+        """Taxonomy key, or the compact spelling of an unknown skill"""
+        scope = self
+        while skill_id < scope.base and scope.parent is not None:
+            scope = scope.parent
+        if skill_id < scope.base:
+            return self.taxonomy.keys[skill_id]
+        return scope.keys[skill_id - scope.base]
+
+skill_taxonomy = SkillTaxonomy.load()
@@ -0,0 +1,258 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Set
+from sqlalchemy import and_, delete, or_, select, update
+from config import settings
+from database import AsyncSessionLocal
+from models import Job, ProcessingTask
+from services.llm_scheduler import LLMOverloadedError
+from services.cv_processing import process_upload, save_upload
+from services.cv_stream import cv_stream
+
+def lease_expired(stale: datetime):
+    return or_(ProcessingTask.updated_at.is_(None), ProcessingTask.updated_at < stale)
+
+class CVTaskQueue:
+    """
+    Background CV processing for async uploads: the endpoint stores the file, creates
+    a ProcessingTask row and returns 202; a bounded pool of in-process workers runs
+    extraction + LLM parsing + agents and records stage/progress on the row.
+    Each task is claimed with a conditional UPDATE before it runs and keeps a lease
+    (updated_at, refreshed by a heartbeat) while running, so several API processes can
+    recover the same table: rows left queued or abandoned mid-run (lease older than
+    CV_TASK_LEASE_SECONDS) are re-queued on start and then periodically.
+    With CV_QUEUE_BACKEND=redis the API only enqueues to the Redis Stream and
+    worker.py processes run process() on their own nodes.
+    """
+
+    def __init__(self, workers: Optional[int] = None, session_factory=None):
+        self.workers = workers or settings.CV_WORKERS
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.upload_dir = Path(settings.UPLOAD_DIR)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._pending: Set[str] = set()  # queued or in progress in this process
+        self.processed = 0
+        self.failed = 0
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=settings.CV_QUEUE_MAX)
+        return self._queue
+
+    @property
+    def distributed(self) -> bool:
+        return settings.CV_QUEUE_BACKEND == "redis"
+
+    def start(self):
+        if self._tasks or self.distributed:
+            return
+        self._tasks = [asyncio.create_task(self._worker(), name=f"cv-worker-{i}") for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._recover_loop(), name="cv-recover"))
+        logger.info(f"📥 CV task queue started ({self.workers} workers)")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def check_capacity(self):
+        """Reject before storing the upload when the queue is full"""
+        # Redis Stream is the buffer in distributed mode, workers scale out instead
+        if not self.distributed and self.queue.full():
+            raise LLMOverloadedError(settings.LLM_RETRY_AFTER_SECONDS)
+
+    async def store_upload(self, task_id: str, filename: str, content: bytes) -> str:
+        """Persist the uploaded file until a worker picks it up (written off the event loop)"""
+        path = self.upload_dir / f"{task_id}{Path(filename or '').suffix}"
+
+        def write():
+            self.upload_dir.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+
+        await asyncio.to_thread(write)
+        return str(path)
+
+    async def submit(self, task_id: str):
+        if self.distributed:
+            await cv_stream.enqueue(task_id)
+            return
+        try:
+            self.queue.put_nowait(str(task_id))
+            self._pending.add(str(task_id))
+        except asyncio.QueueFull:
+            raise LLMOverloadedError(settings.LLM_RETRY_AFTER_SECONDS)
+
+    async def discard(self, db, task: ProcessingTask):
+        """Drop a task that could not be submitted (row + stored file)"""
+        await db.execute(delete(ProcessingTask).where(ProcessingTask.id == task.id))
+        await db.commit()
+        if task.file_path:
+            Path(task.file_path).unlink(missing_ok=True)
+
+    async def recover(self) -> int:
+        """Re-queue tasks left unfinished by a stopped (or crashed) process"""
+        stale = datetime.utcnow() - timedelta(seconds=settings.CV_TASK_LEASE_SECONDS)
+        try:
+            async with self.session_factory() as db:
+                rows = await db.execute(
+                    select(ProcessingTask.id)
+                    .where(ProcessingTask.status.in_(["queued", "running"]), lease_expired(stale))
+                    .order_by(ProcessingTask.created_at)
+                )
+                task_ids = rows.scalars().all()
+        except Exception as e:
+            logger.error(f"❌ Recovering CV tasks failed: {e}")
+            return 0
+        task_ids = [task_id for task_id in task_ids if task_id not in self._pending]
+        for task_id in task_ids:
+            self._pending.add(task_id)
+            await self.queue.put(task_id)
+        if task_ids:
+            logger.info(f"📥 Re-queued {len(task_ids)} unfinished CV tasks")
+        return len(task_ids)
+
+    async def _recover_loop(self):
+        while True:
+            await self.recover()
+            await asyncio.sleep(settings.CV_TASK_LEASE_SECONDS)
+
+    async def claim(self, task_id: str) -> bool:
+        """Take a queued task (or one whose lease expired) - False when another process has it"""
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=settings.CV_TASK_LEASE_SECONDS)
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(ProcessingTask)
+                .where(
+                    ProcessingTask.id == task_id,
+                    or_(
+                        ProcessingTask.status == "queued",
+                        and_(ProcessingTask.status == "running", lease_expired(stale)),
+                    ),
+                )
+                .values(status="running", updated_at=now)
+            )
+            await db.commit()
+        return result.rowcount == 1
+
+    async def _heartbeat(self, task_id: str):
+        """Keep the lease of a running task fresh (long LLM stages don't commit progress)"""
+        while True:
+            await asyncio.sleep(settings.CV_TASK_LEASE_SECONDS / 3)
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(
+                        update(ProcessingTask)
+                        .where(ProcessingTask.id == task_id, ProcessingTask.status == "running")
+                        .values(updated_at=datetime.utcnow())
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.warning(f"⚠️ CV task heartbeat failed ({task_id}): {e}")
+
+    async def _worker(self):
+        while True:
+            task_id = await self.queue.get()
+            try:
+                await self.process(task_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ CV task {task_id} crashed: {e}")
+            finally:
+                self._pending.discard(task_id)
+                self.queue.task_done()
+
+    async def process(self, task_id: str):
+        """Run one stored upload through the pipeline, recording progress on its task row"""
+        # Redis Stream delivery is exclusive already, local queues of several processes are not
+        if self.distributed:
+            await self._process(task_id)
+            return
+        if not await self.claim(task_id):
+            return
+        heartbeat = asyncio.create_task(self._heartbeat(task_id))
+        try:
+            await self._process(task_id)
+        finally:
+            heartbeat.cancel()
+
+    async def _process(self, task_id: str):
+        async with self.session_factory() as db:
+            task = (await db.execute(select(ProcessingTask).where(ProcessingTask.id == task_id))).scalar_one_or_none()
+            if task is None or task.status in ("done", "failed"):
+                return
+            file_path = task.file_path
+
+            async def on_stage(stage: str, progress: int):
+                task.status, task.stage, task.progress = "running", stage, progress
+                await db.commit()
+
+            try:
+                job = (await db.execute(select(Job).where(Job.id == task.job_id))).scalar_one_or_none()
+                if job is None:
+                    raise ValueError("Job not found")
+
+                content = await asyncio.to_thread(Path(file_path).read_bytes)
+                while True:
+                    try:
+                        outcome = await process_upload(db, job, file_path, content, on_stage)
+                        break
+                    except LLMOverloadedError as e:
+                        # Interactive uploads fill the LLM queue - wait instead of failing the task
+                        await asyncio.sleep(e.retry_after)
+
+                await on_stage("saving", 90)
+                await save_upload(db, outcome)
+                await db.flush()
+                candidate = outcome.candidate
+                task.candidate_id = candidate.id
+                task.status, task.progress = "done", 100
+                task.stage = "duplicate" if outcome.duplicate else "done"
+                await db.commit()
+                self.processed += 1
+                logger.info(f"✅ CV task {task_id} {task.stage} -> candidate {candidate.id} (score {candidate.score})")
+            except asyncio.CancelledError:
+                # Shutdown mid-run - the row stays "running" and is re-queued once its lease expires
+                raise
+            except Exception as e:
+                await db.rollback()
+                task.status, task.stage, task.error = "failed", "failed", str(e)
+                await db.commit()
+                self.failed += 1
+                logger.error(f"❌ CV task {task_id} failed: {e}")
+            if file_path:
+                Path(file_path).unlink(missing_ok=True)
+
+    async def mark_failed(self, task_id: str, error: str):
+        """Give up on a task (e.g. it keeps killing stream workers)"""
+        async with self.session_factory() as db:
+            task = (await db.execute(select(ProcessingTask).where(ProcessingTask.id == task_id))).scalar_one_or_none()
+            if task is None or task.status in ("done", "failed"):
+                return
+            task.status, task.stage, task.error = "failed", "failed", error
+            await db.commit()
+            self.failed += 1
+            if task.file_path:
+                Path(task.file_path).unlink(missing_ok=True)
+
+    def stats(self):
+        if self.distributed:
+            return {"backend": "redis", **cv_stream.stats()}
+        return {
+            "backend": "local",
+            "workers": len([t for t in self._tasks if t.get_name().startswith("cv-worker")]),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+cv_task_queue = CVTaskQueue()
@@ -34,3 +34,69 @@ async def test_analyzer_agent_mock_processing(test_cv_data):
     agent = AnalyzerAgent()
     assert hasattr(agent, 'process')
     assert callable(agent.process)
+
+def test_agent_memory_is_bounded_ring_buffer(monkeypatch):
+    """Test agent memory keeps only the newest sampled interactions"""
+    monkeypatch.setattr("config.settings.AGENT_MEMORY_SIZE", 3)
+    monkeypatch.setattr("config.settings.AGENT_MEMORY_SAMPLE_RATE", 1.0)
+    agent = ScreenerAgent()
+    for i in range(10):
+        agent.log_interaction({"i": i}, {})
+    assert [entry["input"]["i"] for entry in agent.memory] == [7, 8, 9]
+    
+    monkeypatch.setattr("config.settings.AGENT_MEMORY_SAMPLE_RATE", 0.0)
+    agent.log_interaction({"i": 10}, {})
+    assert agent.memory[-1]["input"]["i"] == 9
+
+@pytest.mark.asyncio
+async def test_agent_run_records_metrics(test_cv_data):
+    """Test run() observes per-agent latency and counts failures"""
+    from prometheus_client import REGISTRY
+    agent = ScreenerAgent()
+    
+    def sample(name):
+        return REGISTRY.get_sample_value(name, {"agent": "ScreenerAgent"}) or 0
+    
+    before = sample("rekruter_agent_seconds_count")
+    result = await agent.run(test_cv_data, {"must_have": ["Python"]})
+    assert result["passes"] is True
+    assert sample("rekruter_agent_seconds_count") == before + 1
+    
+    failures = sample("rekruter_agent_failures_total")
+    with pytest.raises(AttributeError):
+        await agent.run(None, {})
+    assert sample("rekruter_agent_failures_total") == failures + 1
+
+@pytest.mark.asyncio
+async def test_agent_registry_single_orchestrator_and_plugins(test_cv_data, monkeypatch):
+    """Test registry reuses agents/orchestrator and plugs named agents into the pipeline"""
+    from services.agents.base_agent import BaseAgent
+    from services.agents.registry import AgentRegistry
+    
+    monkeypatch.setattr("config.settings.USE_RAG_CONTEXT", False)
+    registry = AgentRegistry()
+    registry.register("screener", ScreenerAgent)
+    registry.register("analyzer", AnalyzerAgent)
+    registry.register("scorer", ScorerAgent)
+    
+    assert registry.orchestrator is registry.orchestrator
+    assert registry.orchestrator.screener is registry.get("screener")
+    
+    class LanguageAgent(BaseAgent):
+        def __init__(self):
+            super().__init__(name="LanguageAgent")
+        
+        async def process(self, cv_data):
+            return {"languages": len(cv_data.get("languages", []))}
+    
+    registry.register("languages", LanguageAgent, inputs=("cv_data",))
+    
+    async def analyze(cv_data, job_requirements, context=None):
+        return {"strengths": [], "weaknesses": [], "red_flags": []}
+    monkeypatch.setattr(registry.get("analyzer"), "process", analyze)
+    
+    result = await registry.orchestrator.process_candidate(test_cv_data, {"must_have": ["Python"]})
+    assert result["agents"]["languages"] == {"languages": 0}
+    
+    with pytest.raises(KeyError):
+        registry.get("missing")
@@ -0,0 +1,210 @@
+import asyncio
+import io
+import json
+import zipfile
+import pytest
+from sqlalchemy import select
+from models import Company, Job, Candidate, CandidateSkill
+from services.bulk_upload import BulkUploadTooLarge, collect_cv_files, bulk_upload_stream
+
+def _zip(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, content in entries.items():
+            zf.writestr(name, content)
+    return buffer.getvalue()
+
+async def _job(session_factory):
+    async with session_factory() as db:
+        company = Company(name="Hotel")
+        db.add(company)
+        await db.flush()
+        job = Job(company_id=company.id, title="Dev", description="...", requirements={"must_have": ["Python"]})
+        db.add(job)
+        await db.commit()
+        return job
+
+def test_collect_cv_files_expands_zip_and_rejects_bad_files(monkeypatch):
+    """Test ZIPs are flattened, junk skipped and wrong/oversized files reported"""
+    monkeypatch.setattr("config.settings.MAX_UPLOAD_SIZE", 100)
+    archive = _zip({
+        "cvs/anna.pdf": b"%PDF anna",
+        "cvs/jan.txt": b"Jan Kowalski",
+        "__MACOSX/cvs/._anna.pdf": b"junk",
+        "cvs/photo.jpg": b"jpeg",
+        "cvs/huge.txt": b"x" * 200,
+    })
+    files = collect_cv_files([
+        ("batch.zip", "application/zip", archive),
+        ("ola.txt", "text/plain", b"Ola Nowak"),
+        ("notes.exe", "application/octet-stream", b"MZ"),
+        ("broken.zip", "application/zip", b"not a zip"),
+    ])
+
+    result = {name: error for name, _, error in files}
+    assert result == {
+        "cvs/anna.pdf": None,
+        "cvs/jan.txt": None,
+        "cvs/photo.jpg": "Invalid file type",
+        "cvs/huge.txt": "File too large",
+        "ola.txt": None,
+        "notes.exe": "Invalid file type",
+        "broken.zip": "Invalid ZIP archive",
+    }
+
+def test_collect_cv_files_limits_checked_before_unpacking(monkeypatch):
+    """Test file count and unpacked size limits reject a ZIP without inflating any entry"""
+    def no_read(*args, **kwargs):
+        raise AssertionError("entry decompressed")
+    monkeypatch.setattr(zipfile.ZipFile, "read", no_read)
+    archive = _zip({f"cv{i}.txt": b"x" * 60 for i in range(3)})
+
+    monkeypatch.setattr("config.settings.BULK_UPLOAD_MAX_FILES", 2)
+    with pytest.raises(BulkUploadTooLarge, match="Too many files"):
+        collect_cv_files([("batch.zip", "application/zip", archive)])
+
+    monkeypatch.setattr("config.settings.BULK_UPLOAD_MAX_FILES", 10)
+    monkeypatch.setattr("config.settings.BULK_UPLOAD_MAX_UNPACKED_SIZE", 150)
+    with pytest.raises(BulkUploadTooLarge, match="too large"):
+        collect_cv_files([("batch.zip", "application/zip", archive)])
+
+@pytest.mark.asyncio
+async def test_bulk_upload_streams_progress_and_inserts_in_batches(session_factory, monkeypatch):
+    """Test per-file NDJSON lines, bounded concurrency and one commit for the whole batch"""
+    monkeypatch.setattr("config.settings.BULK_UPLOAD_CONCURRENCY", 2)
+    running, peak = 0, 0
+
+    async def score(job, cv_text, on_stage=None, parsed_cv=None):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if cv_text == "broken":
+            raise ValueError("unparseable CV")
+        return Candidate(job_id=job.id, name=cv_text, score=len(cv_text), parsed_cv={"skills": ["Python"]},
+                         skill_index=[CandidateSkill(skill="python", job_id=job.id)])
+
+    async def extract(filename, content):
+        return content.decode()
+
+    monkeypatch.setattr("services.cv_processing.score_cv_text", score)
+    monkeypatch.setattr("services.cv_processing.extract_cv_bytes", extract)
+    commits = []
+    original_commit = session_factory.class_.commit
+
+    async def counting_commit(self):
+        commits.append(1)
+        await original_commit(self)
+    monkeypatch.setattr(session_factory.class_, "commit", counting_commit)
+
+    job = await _job(session_factory)
+    commits.clear()
+    files = [(f"cv{i}.txt", f"Candidate {i}".encode(), None) for i in range(5)]
+    files += [("bad.txt", b"broken", None), ("photo.jpg", None, "Invalid file type")]
+
+    lines = []
+    async for raw in bulk_upload_stream(job, files, session_factory=session_factory):
+        lines.append(json.loads(raw))
+
+    per_file = lines[:-1]
+    summary = lines[-1]
+    assert len(per_file) == 7
+    assert [line["done"] for line in per_file] == list(range(1, 8))
+    assert sum(line["status"] == "scored" for line in per_file) == 5
+    assert {line["file"] for line in per_file if line["status"] == "failed"} == {"bad.txt", "photo.jpg"}
+    assert summary["status"] == "completed"
+    assert (summary["created"], summary["failed"]) == (5, 2)
+    assert peak <= 2
+    assert len(commits) == 1
+
+    async with session_factory() as db:
+        stored = (await db.execute(select(Candidate.id).where(Candidate.job_id == job.id))).scalars().all()
+        indexed = (await db.execute(select(CandidateSkill))).scalars().all()
+    assert sorted(stored) == sorted(summary["candidate_ids"])
+    assert len(indexed) == 5
+
+@pytest.mark.asyncio
+async def test_bulk_upload_reports_duplicates(session_factory, monkeypatch):
+    """Test repeated files and CV texts (within the batch and of earlier uploads) are not scored again"""
+    scored = []
+
+    async def score(job, cv_text, on_stage=None, parsed_cv=None):
+        scored.append(cv_text)
+        return Candidate(job_id=job.id, name=cv_text, score=50, parsed_cv={"skills": []})
+
+    async def extract(filename, content):
+        return content.decode()
+
+    monkeypatch.setattr("services.cv_processing.score_cv_text", score)
+    monkeypatch.setattr("services.cv_processing.extract_cv_bytes", extract)
+    job = await _job(session_factory)
+
+    first = [json.loads(line) async for line in bulk_upload_stream(job, [("anna.txt", b"Anna Nowak", None)], session_factory=session_factory)]
+    files = [
+        ("anna-again.txt", b"Anna Nowak", None),
+        ("jan.txt", b"Jan Kowalski", None),
+        ("jan-copy.txt", b"Jan Kowalski", None),
+    ]
+    lines = [json.loads(line) async for line in bulk_upload_stream(job, files, session_factory=session_factory)]
+
+    statuses = {line["file"]: line["status"] for line in lines[:-1]}
+    assert statuses == {"anna-again.txt": "duplicate", "jan.txt": "scored", "jan-copy.txt": "duplicate"}
+    assert next(l for l in lines if l["file"] == "anna-again.txt")["candidate_id"] == first[-1]["candidate_ids"][0]
+    assert (lines[-1]["created"], lines[-1]["duplicates"], lines[-1]["failed"]) == (1, 2, 0)
+    assert scored == ["Anna Nowak", "Jan Kowalski"]
+
+@pytest.mark.asyncio
+async def test_bulk_upload_reports_failed_saves(session_factory, monkeypatch):
+    """Test a failed insert is reported per file and counted in the summary"""
+    async def score(job, cv_text, on_stage=None, parsed_cv=None):
+        return Candidate(job_id=job.id, name=cv_text, score=50, parsed_cv={"skills": []})
+
+    async def extract(filename, content):
+        return content.decode()
+
+    async def broken_save(db, outcome):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr("services.cv_processing.score_cv_text", score)
+    monkeypatch.setattr("services.cv_processing.extract_cv_bytes", extract)
+    monkeypatch.setattr("services.bulk_upload.save_upload", broken_save)
+    job = await _job(session_factory)
+    files = [("anna.txt", b"Anna Nowak", None), ("jan.txt", b"Jan Kowalski", None)]
+
+    lines = [json.loads(line) async for line in bulk_upload_stream(job, files, session_factory=session_factory)]
+
+    assert [line["status"] for line in lines[:-1]] == ["scored", "scored", "save_failed", "save_failed"]
+    assert all("disk full" in line["error"] for line in lines[2:-1])
+    assert (lines[-1]["created"], lines[-1]["failed"], lines[-1]["candidate_ids"]) == (0, 2, [])
+
+@pytest.mark.asyncio
+async def test_bulk_upload_commits_zip_in_bounded_batches(session_factory, monkeypatch):
+    """Test a ZIP of many CVs is inserted in BULK_UPLOAD_SAVE_BATCH-sized commits, not one per file"""
+    monkeypatch.setattr("config.settings.BULK_UPLOAD_SAVE_BATCH", 5)
+    monkeypatch.setattr("config.settings.BULK_UPLOAD_SAVE_INTERVAL_MS", 60_000)
+
+    async def score(job, cv_text, on_stage=None, parsed_cv=None):
+        await asyncio.sleep(0.001)
+        return Candidate(job_id=job.id, name=cv_text, score=50, parsed_cv={"skills": []})
+
+    async def extract(filename, content):
+        return content.decode()
+
+    monkeypatch.setattr("services.cv_processing.score_cv_text", score)
+    monkeypatch.setattr("services.cv_processing.extract_cv_bytes", extract)
+    job = await _job(session_factory)
+    commits = []
+    original_commit = session_factory.class_.commit
+
+    async def counting_commit(self):
+        commits.append(1)
+        await original_commit(self)
+    monkeypatch.setattr(session_factory.class_, "commit", counting_commit)
+
+    archive = _zip({f"cvs/cv{i}.txt": f"Candidate {i}" for i in range(12)})
+    files = collect_cv_files([("batch.zip", "application/zip", archive)])
+    lines = [json.loads(line) async for line in bulk_upload_stream(job, files, session_factory=session_factory)]
+
+    assert lines[-1]["created"] == 12
+    assert len(commits) == 3  # 5 + 5 + final 2
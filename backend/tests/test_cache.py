@@ -35,3 +35,44 @@ async def test_cache_delete():
     
     result = await cache.get(test_key)
     assert result is None
+
+@pytest.mark.asyncio
+async def test_memory_cache_ttl_and_size_limit():
+    """Test in-memory fallback honours TTL and evicts least recently used entries"""
+    from services.cache import CacheService
+    
+    local = CacheService(max_entries=2)
+    local.enabled = False
+    await local.set("a", 1)
+    await local.set("b", 2)
+    await local.get("a")
+    await local.set("c", 3)
+    
+    assert await local.get("b") is None
+    assert await local.get("a") == 1
+    
+    await local.set("expired", 4, ttl=-1)
+    assert await local.get("expired") is None
+
+@pytest.mark.asyncio
+async def test_llm_cache_hit_miss():
+    """Test LLM response cache is content-addressed and counts hits/misses"""
+    from services.cache import CacheService, LLMResponseCache
+    
+    backend = CacheService()
+    backend.enabled = False
+    llm_cache = LLMResponseCache(backend=backend)
+    key = LLMResponseCache.make_key("llama3.1:8b", "Parse this CV", "You are a CV parser", {"stop_at_json": True})
+    
+    assert key == LLMResponseCache.make_key("llama3.1:8b", "Parse this CV", "You are a CV parser", {"stop_at_json": True})
+    assert key != LLMResponseCache.make_key("llama3.1:70b", "Parse this CV", "You are a CV parser", {"stop_at_json": True})
+    
+    assert await llm_cache.get(key) is None
+    await llm_cache.set(key, '{"name": "Jan"}')
+    assert await llm_cache.get(key) == '{"name": "Jan"}'
+    
+    await llm_cache.set("llm:failed", "")
+    assert await llm_cache.get("llm:failed") is None
+    
+    assert llm_cache.stats()["hits"] == 1
+    assert llm_cache.stats()["misses"] == 2
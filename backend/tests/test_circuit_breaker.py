@@ -0,0 +1,61 @@
+import pytest
+from services.circuit_breaker import CircuitBreaker, llm_breaker
+from services.llm_service import LLMService
+
+def test_breaker_opens_after_threshold_and_probes():
+    """Test closed -> open -> half_open probe -> closed"""
+    breaker = CircuitBreaker(failure_threshold=3, recovery_seconds=60)
+    for _ in range(3):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.is_open
+    assert not breaker.allow_request()
+    
+    breaker.opened_at -= 61
+    assert breaker.allow_request()  # single probe
+    assert not breaker.allow_request()
+    breaker.record_success(1.0)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_breaker_adaptive_timeout():
+    """Test timeout follows observed latency percentile within bounds"""
+    from config import settings
+    
+    breaker = CircuitBreaker()
+    assert breaker.timeout() == settings.OLLAMA_TIMEOUT
+    
+    for _ in range(20):
+        breaker.record_success(8.0)
+    assert breaker.timeout() == min(settings.OLLAMA_TIMEOUT, max(settings.OLLAMA_MIN_TIMEOUT, 8.0 * settings.LLM_TIMEOUT_MULTIPLIER))
+
+def test_fallback_parse_cv():
+    """Test deterministic CV parse used in degraded mode"""
+    text = "Anna Nowak\nanna.nowak@example.com\n+48 600 100 200\nSkills: Python, PostgreSQL, Docker"
+    parsed = LLMService.fallback_parse_cv(text, ["python", "Docker", "Kubernetes", "C"])
+    
+    assert parsed["name"] == "Anna Nowak"
+    assert parsed["email"] == "anna.nowak@example.com"
+    assert parsed["skills"] == ["python", "Docker"]
+
+@pytest.mark.asyncio
+async def test_orchestrator_degraded_mode_skips_analyzer(test_cv_data, monkeypatch):
+    """Test open breaker -> screener + scorer only, result marked degraded"""
+    from services.agents.orchestrator import MultiAgentOrchestrator
+    
+    monkeypatch.setattr("config.settings.USE_RAG_CONTEXT", False)
+    monkeypatch.setattr(llm_breaker, "state", CircuitBreaker.OPEN)
+    monkeypatch.setattr(llm_breaker, "opened_at", float("inf"))
+    
+    orchestrator = MultiAgentOrchestrator()
+    
+    async def fail(*args, **kwargs):
+        raise AssertionError("AnalyzerAgent must not run in degraded mode")
+    monkeypatch.setattr(orchestrator.analyzer, "process", fail)
+    
+    result = await orchestrator.process_candidate(test_cv_data, {"must_have": ["Python", "Kubernetes"]})
+    
+    assert result["degraded"] is True
+    assert result["scoring_mode"] == "degraded"
+    assert 0 <= result["score"] <= 100
@@ -0,0 +1,76 @@
+from services.cv_compactor import CVCompactor
+
+def _long_cv(pages: int = 4) -> str:
+    page = (
+        "Jan Kowalski - Curriculum Vitae\n"
+        "{page_body}\n"
+        "Page {n} of {pages}\n"
+    )
+    bodies = [
+        "Jan Kowalski\njan@example.com\n\nSKILLS: Python, FastAPI, PostgreSQL\n\nEXPERIENCE\n" + "Built APIs at Tech Corp.\n" * 40,
+        "EDUCATION\nMSc CS, AGH 2020\n\nHOBBIES\n" + "Mountain hiking and photography.\n" * 60,
+        "PROJECTS\n" + "Open source contributions.\n" * 60,
+        "I hereby consent to the processing of my personal data for recruitment purposes (GDPR).",
+    ]
+    # Pages separated by form feeds, as PDFParserService returns them
+    return "\f".join(page.format(page_body=bodies[i % len(bodies)], n=i + 1, pages=pages) for i in range(pages))
+
+def test_compaction_removes_headers_footers_and_boilerplate():
+    """Test repeated running headers, page numbers and consent clauses are dropped"""
+    result = CVCompactor(token_budget=1200).compact(_long_cv())
+    
+    assert "Page 1 of 4" not in result
+    assert "Curriculum Vitae" not in result
+    assert "personal data" not in result
+    assert "SKILLS: Python, FastAPI, PostgreSQL" in result
+    # Repeated body lines are content, not headers
+    assert result.count("Built APIs at Tech Corp.") == 40
+
+def test_compaction_keeps_real_content():
+    """Test repeated role titles, year lines and GDPR experience survive; only the consent paragraph goes"""
+    pages = [
+        "Jan Kowalski\nEXPERIENCE\nSoftware Engineer\nAcme\n2021\nImplemented GDPR compliance module\n1",
+        "Software Engineer\nGlobex\n2019\nSoftware Engineer\nInitech\n2017\n"
+        + "Maintained billing services.\n" * 5 + "2",
+        "HOBBIES\nChess\n\nI hereby consent to the processing of my personal data\nfor recruitment purposes.\n3",
+    ]
+    compactor = CVCompactor()
+    lines = compactor.remove_boilerplate(compactor.remove_page_furniture(compactor.normalize("\f".join(pages))))
+    result = "\n".join(lines)
+    
+    assert lines.count("Software Engineer") == 3
+    assert {"2021", "2019", "2017"} <= set(lines)
+    assert "Implemented GDPR compliance module" in lines
+    assert "Chess" in lines
+    assert "personal data" not in result
+    assert not {"1", "2", "3"} & set(lines)
+
+def test_compaction_skipped_under_budget():
+    """Test text that already fits the budget is only whitespace-normalized"""
+    text = "Jan Kowalski\nCurriculum Vitae\n2021\nI hereby consent to the processing of my personal data."
+    
+    assert CVCompactor(token_budget=1000).compact(text) == text
+
+def test_compaction_respects_budget_and_keeps_priority_sections():
+    """Test low-priority sections are cut first when over budget"""
+    compactor = CVCompactor(token_budget=300)
+    result = compactor.compact(_long_cv())
+    
+    assert compactor.estimate_tokens(result) <= 300
+    assert "jan@example.com" in result
+    assert "SKILLS: Python" in result
+    assert "EXPERIENCE" in result
+    assert "hiking" not in result
+    # Original order preserved
+    assert result.index("SKILLS") < result.index("EXPERIENCE")
+
+def test_compaction_normalizes_whitespace():
+    """Test whitespace runs collapse and blank lines are capped"""
+    result = CVCompactor().compact("Anna   Nowak\t\n\n\n\n• Python    developer  ")
+    
+    assert result == "Anna Nowak\n\nPython developer"
+
+def test_compaction_empty_text():
+    """Test None/empty input passes through"""
+    assert CVCompactor().compact(None) is None
+    assert CVCompactor().compact("") == ""
@@ -0,0 +1,172 @@
+import pytest
+from sqlalchemy import select, func
+from models import Company, Job, Candidate, CVDocument
+from services.cv_processing import process_upload, save_upload
+from services.cv_store import content_hash, text_hash
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = {"extract": 0, "parsed_cv": []}
+
+    async def score(job, cv_text, on_stage=None, parsed_cv=None):
+        calls["parsed_cv"].append(parsed_cv)
+        return Candidate(job_id=job.id, name="Jan Kowalski", score=70, parsed_cv=parsed_cv or {"skills": ["python"]})
+
+    async def extract(filename, content):
+        calls["extract"] += 1
+        return content.decode()
+
+    monkeypatch.setattr("services.cv_processing.score_cv_text", score)
+    monkeypatch.setattr("services.cv_processing.extract_cv_bytes", extract)
+    return calls
+
+async def _jobs(db, count=2):
+    company = Company(name="Hotel")
+    db.add(company)
+    await db.flush()
+    jobs = [Job(company_id=company.id, title=f"Dev {i}", description="...", requirements={}) for i in range(count)]
+    db.add_all(jobs)
+    await db.commit()
+    return jobs
+
+async def _upload(db, job, content, filename="cv.txt"):
+    outcome = await process_upload(db, job, filename, content)
+    await save_upload(db, outcome)
+    await db.commit()
+    return outcome
+
+def test_text_hash_ignores_formatting():
+    assert text_hash("Jan Kowalski\n\nPython,  FastAPI") == text_hash("JAN KOWALSKI - python fastapi")
+    assert text_hash("Jan Kowalski") != text_hash("Anna Nowak")
+    assert content_hash(b"a") != content_hash(b"a ")
+
+@pytest.mark.asyncio
+async def test_same_file_same_job_is_duplicate(session_factory, calls):
+    async with session_factory() as db:
+        job, _ = await _jobs(db)
+        first = await _upload(db, job, b"Jan Kowalski, Python")
+        second = await _upload(db, job, b"Jan Kowalski, Python")
+
+        assert second.duplicate and second.candidate.id == first.candidate.id
+        assert calls["extract"] == 1 and len(calls["parsed_cv"]) == 1
+        assert await db.scalar(select(func.count()).select_from(Candidate)) == 1
+
+@pytest.mark.asyncio
+async def test_same_text_other_file_is_duplicate(session_factory, calls):
+    async with session_factory() as db:
+        job, _ = await _jobs(db)
+        first = await _upload(db, job, b"Jan Kowalski, Python", "cv.txt")
+        second = await _upload(db, job, b"JAN KOWALSKI python\n", "cv-export.txt")
+
+        assert second.duplicate and second.candidate.id == first.candidate.id
+        assert len(calls["parsed_cv"]) == 1
+
+@pytest.mark.asyncio
+async def test_other_job_reuses_text_and_parse(session_factory, calls):
+    async with session_factory() as db:
+        job, other_job = await _jobs(db)
+        await _upload(db, job, b"Jan Kowalski, Python")
+        outcome = await _upload(db, other_job, b"Jan Kowalski, Python")
+
+        assert not outcome.duplicate and outcome.candidate.job_id == other_job.id
+        assert calls["extract"] == 1
+        assert calls["parsed_cv"] == [None, {"skills": ["python"]}]
+        assert await db.scalar(select(func.count()).select_from(CVDocument)) == 1
+        assert await db.scalar(select(func.count()).select_from(Candidate)) == 2
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_uploads_store_one_document(session_factory, calls):
+    async with session_factory() as db:
+        job, other_job = await _jobs(db)
+    # Both processed before either is saved, as with two workers
+    async with session_factory() as db:
+        first = await process_upload(db, job, "cv.txt", b"Jan Kowalski, Python")
+        second = await process_upload(db, other_job, "cv.txt", b"Jan Kowalski, Python")
+    for outcome in (first, second):
+        async with session_factory() as db:
+            await save_upload(db, outcome)
+            await db.commit()
+
+    async with session_factory() as db:
+        assert await db.scalar(select(func.count()).select_from(CVDocument)) == 1
+        assert await db.scalar(select(func.count()).select_from(Candidate)) == 2
+        document = (await db.execute(select(CVDocument))).scalar_one()
+        assert document.parsed_cv == {"skills": ["python"]}
+
+@pytest.mark.asyncio
+async def test_degraded_candidate_reparsed_from_store(session_factory, calls, monkeypatch):
+    """Test a keyword-fallback candidate gets the LLM parse of its stored text"""
+    from models import CandidateSkill
+    from services.cv_processing import reparse_candidate
+
+    async def parse_cv(cv_text):
+        return {"name": "Jan Kowalski", "email": "jan@example.com", "skills": ["Python"]}
+    monkeypatch.setattr("services.cv_processing.llm_service.parse_cv", parse_cv)
+
+    async with session_factory() as db:
+        job, _ = await _jobs(db)
+        sha = content_hash(b"Jan Kowalski, Python")
+        db.add(CVDocument(content_hash=sha, text_hash=text_hash("Jan Kowalski, Python"), text="Jan Kowalski, Python"))
+        candidate = Candidate(job_id=job.id, name="Jan Kowalski, Python", parsed_cv={"skills": []},
+                              scoring_mode="degraded", content_hash=sha, stage_results={"screening": {}})
+        legacy = Candidate(job_id=job.id, name="Old", parsed_cv={}, scoring_mode="degraded")
+        db.add_all([candidate, legacy])
+        await db.commit()
+
+        assert await reparse_candidate(db, candidate)
+        assert not await reparse_candidate(db, legacy)
+        await db.commit()
+
+        assert (candidate.name, candidate.email) == ("Jan Kowalski", "jan@example.com")
+        assert candidate.stage_results == {}  # stages of the fallback parse are not reused
+        assert (await db.get(CVDocument, sha)).parsed_cv["skills"] == ["Python"]
+        assert "notes" not in (await db.get(CVDocument, sha)).parsed_cv
+        skills = (await db.execute(select(CandidateSkill.skill).where(CandidateSkill.candidate_id == candidate.id))).scalars().all()
+        assert "python" in skills
+
+@pytest.mark.asyncio
+async def test_reparse_keeps_recruiter_notes(session_factory, calls, monkeypatch):
+    """Test notes added to a degraded candidate survive the re-parse"""
+    from routers.candidates import add_candidate_note
+    from schemas import CandidateNote
+    from services.cv_processing import reparse_candidate
+
+    async def parse_cv(cv_text):
+        return {"name": "Jan Kowalski", "skills": ["Python"]}
+    monkeypatch.setattr("services.cv_processing.llm_service.parse_cv", parse_cv)
+
+    async with session_factory() as db:
+        job, _ = await _jobs(db)
+        sha = content_hash(b"Jan Kowalski, Python")
+        db.add(CVDocument(content_hash=sha, text_hash=text_hash("Jan Kowalski, Python"), text="Jan Kowalski, Python"))
+        candidate = Candidate(job_id=job.id, name="Jan", parsed_cv={"name": "Jan", "skills": []},
+                              scoring_mode="degraded", content_hash=sha)
+        db.add(candidate)
+        await db.commit()
+        await add_candidate_note(candidate.id, CandidateNote(text="Strong call, invite on-site"), db)
+
+    async with session_factory() as db:
+        candidate = await db.get(Candidate, candidate.id)
+        assert await reparse_candidate(db, candidate)
+        await db.commit()
+
+    async with session_factory() as db:
+        stored = (await db.get(Candidate, candidate.id)).parsed_cv
+    assert stored["skills"] == ["Python"]
+    assert [note["text"] for note in stored["notes"]] == ["Strong call, invite on-site"]
+
+@pytest.mark.asyncio
+async def test_analyze_degraded_candidate_without_stored_text_conflicts(session_factory, calls):
+    """Test /analyze refuses to run a full analysis on a keyword-fallback parse"""
+    from fastapi import HTTPException
+    from routers.candidates import analyze_candidate
+
+    async with session_factory() as db:
+        job, _ = await _jobs(db)
+        candidate = Candidate(job_id=job.id, name="Old", parsed_cv={}, scoring_mode="degraded")
+        db.add(candidate)
+        await db.commit()
+
+        with pytest.raises(HTTPException) as error:
+            await analyze_candidate(candidate.id, db)
+    assert error.value.status_code == 409
@@ -0,0 +1,119 @@
+import asyncio
+import pytest
+from benchmarks.fake_redis import FakeRedis
+from services.cv_stream import CVStream
+
+@pytest.fixture
+async def redis_server():
+    server = await FakeRedis().start()
+    yield server
+    await server.stop()
+
+@pytest.fixture
+async def stream(redis_server, monkeypatch):
+    monkeypatch.setattr("config.settings.CV_STREAM_BLOCK_MS", 50)
+    stream = CVStream(url=redis_server.url, stream="test:cv", group="workers")
+    yield stream
+    await stream.close()
+
+async def _run_consumers(stream, handler, names, until, on_dead=None, timeout=5):
+    stop = asyncio.Event()
+    consumers = [asyncio.create_task(stream.consume(handler, name, on_dead=on_dead, stop=stop)) for name in names]
+    try:
+        await asyncio.wait_for(until(), timeout)
+    finally:
+        stop.set()
+        await asyncio.gather(*consumers)
+
+async def _pending(stream):
+    return (await stream.client.xpending(stream.stream, stream.group))["pending"]
+
+@pytest.mark.asyncio
+async def test_consumer_group_processes_each_task_once(stream, redis_server):
+    """Test tasks are spread over consumers, each handled exactly once and acked"""
+    handled = []
+
+    async def handler(task_id):
+        await asyncio.sleep(0.01)
+        handled.append(task_id)
+
+    for i in range(10):
+        await stream.enqueue(f"task-{i}")
+
+    async def done():
+        while len(handled) < 10:
+            await asyncio.sleep(0.01)
+
+    await _run_consumers(stream, handler, ["a", "b", "c"], done)
+
+    assert sorted(handled) == sorted(f"task-{i}" for i in range(10))
+    assert await _pending(stream) == 0
+    assert redis_server.acked == 10
+
+@pytest.mark.asyncio
+async def test_stuck_task_of_dead_consumer_is_claimed(stream, monkeypatch):
+    """Test a task read by a consumer that never acked is taken over by a live one"""
+    monkeypatch.setattr("config.settings.CV_STREAM_CLAIM_IDLE_MS", 100)
+    await stream.enqueue("orphan")
+    await stream.ensure_group()
+    # "dead" reads the message and crashes before acking
+    await stream.client.xreadgroup(stream.group, "dead", {stream.stream: ">"}, count=1)
+    handled = []
+
+    async def handler(task_id):
+        handled.append(task_id)
+
+    async def done():
+        while not handled:
+            await asyncio.sleep(0.01)
+
+    await _run_consumers(stream, handler, ["alive"], done)
+
+    assert handled == ["orphan"]
+    assert stream.claimed == 1
+    assert await _pending(stream) == 0
+
+@pytest.mark.asyncio
+async def test_poison_task_given_up_after_max_deliveries(stream, monkeypatch):
+    """Test a task that keeps crashing workers is reported dead and acked"""
+    monkeypatch.setattr("config.settings.CV_STREAM_CLAIM_IDLE_MS", 30)
+    monkeypatch.setattr("config.settings.CV_STREAM_MAX_DELIVERIES", 2)
+    await stream.enqueue("poison")
+    attempts, dead = [], []
+
+    async def handler(task_id):
+        attempts.append(task_id)
+        raise RuntimeError("segfault in parser")
+
+    async def on_dead(task_id, reason):
+        dead.append(task_id)
+
+    async def done():
+        while not dead:
+            await asyncio.sleep(0.01)
+
+    await _run_consumers(stream, handler, ["a", "b"], done, on_dead=on_dead)
+
+    assert len(attempts) == 2
+    assert dead == ["poison"]
+    assert await _pending(stream) == 0
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_long_task_from_being_claimed(stream, monkeypatch):
+    """Test a task running longer than the claim timeout is not handed to a second consumer"""
+    monkeypatch.setattr("config.settings.CV_STREAM_CLAIM_IDLE_MS", 300)
+    await stream.enqueue("slow-llm")
+    handled = []
+
+    async def handler(task_id):
+        handled.append(task_id)
+        await asyncio.sleep(1.0)
+
+    async def done():
+        while not handled or await _pending(stream):
+            await asyncio.sleep(0.02)
+
+    await _run_consumers(stream, handler, ["a", "b"], done)
+
+    assert handled == ["slow-llm"]
+    assert stream.claimed == 0
@@ -0,0 +1,68 @@
+import os
+import time
+import fitz
+import pytest
+from services.extraction_pool import ExtractionPool, ExtractionError
+
+def _spin():
+    while True:
+        pass
+
+def _hang():
+    time.sleep(60)  # no CPU use - SIGXCPU never comes
+
+def _pdf(text: str) -> bytes:
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+@pytest.fixture
+def pool():
+    pool = ExtractionPool(workers=1, max_files_per_worker=2, cpu_limit=1)
+    yield pool
+    pool.shutdown()
+
+@pytest.mark.asyncio
+async def test_extracts_pdf_and_text_in_worker_process(pool):
+    """Test PDF and TXT uploads are parsed out of process"""
+    assert "Jan Kowalski" in await pool.extract("cv.pdf", _pdf("Jan Kowalski - Python"))
+    assert await pool.extract("cv.txt", "Anna Nowak\nDjango".encode()) == "Anna Nowak\nDjango"
+    assert pool.stats()["extracted"] == 2
+
+@pytest.mark.asyncio
+async def test_workers_recycled_after_max_files(pool):
+    """Test a worker process is replaced after max_files_per_worker tasks"""
+    pids = [await pool.run(os.getpid) for _ in range(4)]
+
+    assert os.getpid() not in pids
+    assert pids[0] == pids[1]
+    assert pids[2] == pids[3]
+    assert pids[1] != pids[2]
+
+@pytest.mark.asyncio
+async def test_cpu_limit_stops_runaway_parse_and_pool_survives(pool):
+    """Test a file exceeding its CPU budget fails cleanly and the next one still works"""
+    with pytest.raises(ExtractionError, match="CPU time limit"):
+        await pool.run(_spin)
+
+    assert await pool.extract("cv.txt", b"still alive") == "still alive"
+
+@pytest.mark.asyncio
+async def test_wall_clock_limit_kills_stuck_parser(pool):
+    """Test a parse that never uses its CPU budget is killed and the pool restarted"""
+    pool.wall_limit = 2
+
+    with pytest.raises(ExtractionError, match="Wall-clock limit"):
+        await pool.run(_hang)
+
+    assert pool.stats()["restarts"] == 1
+    assert await pool.extract("cv.txt", b"still alive") == "still alive"
+
+@pytest.mark.asyncio
+async def test_inline_mode_without_workers():
+    """Test EXTRACTION_WORKERS=0 parses in a thread of the API process"""
+    pool = ExtractionPool(workers=0)
+    assert await pool.extract("cv.txt", b"inline") == "inline"
+    assert await pool.run(os.getpid) == os.getpid()
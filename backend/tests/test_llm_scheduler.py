@@ -0,0 +1,92 @@
+import pytest
+import asyncio
+from services.llm_scheduler import LLMScheduler, LLMOverloadedError, Priority, priority_scope
+
+@pytest.mark.asyncio
+async def test_scheduler_caps_concurrency():
+    """Test that no more than max_concurrency calls run at once"""
+    scheduler = LLMScheduler(max_concurrency=2, max_queue_depth=10)
+    running = []
+    peak = []
+    
+    async def call():
+        async with scheduler.slot():
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+    
+    await asyncio.gather(*(call() for _ in range(6)))
+    
+    assert max(peak) == 2
+    assert scheduler.active == 0
+
+@pytest.mark.asyncio
+async def test_scheduler_serves_interactive_first():
+    """Test that queued interactive calls go ahead of queued batch calls"""
+    scheduler = LLMScheduler(max_concurrency=1, max_queue_depth=10)
+    order = []
+    
+    async def call(name, priority):
+        async with scheduler.slot(priority):
+            order.append(name)
+            await asyncio.sleep(0.01)
+    
+    blocker = asyncio.create_task(call("first", Priority.INTERACTIVE))
+    await asyncio.sleep(0)
+    batch = [asyncio.create_task(call(f"batch{i}", Priority.BATCH)) for i in range(2)]
+    await asyncio.sleep(0)
+    with priority_scope(Priority.INTERACTIVE):
+        interactive = asyncio.create_task(call("upload", None))
+    await asyncio.gather(blocker, interactive, *batch)
+    
+    assert order == ["first", "upload", "batch0", "batch1"]
+
+@pytest.mark.asyncio
+async def test_scheduler_rejects_when_queue_full():
+    """Test backpressure when queue is deeper than the limit"""
+    scheduler = LLMScheduler(max_concurrency=1, max_queue_depth=1, retry_after=7)
+    release = asyncio.Event()
+    
+    async def hold():
+        async with scheduler.slot():
+            await release.wait()
+    
+    tasks = [asyncio.create_task(hold()) for _ in range(2)]
+    await asyncio.sleep(0)
+    
+    with pytest.raises(LLMOverloadedError) as exc_info:
+        scheduler.check_capacity()
+    assert exc_info.value.retry_after == 7
+    
+    with pytest.raises(LLMOverloadedError):
+        async with scheduler.slot():
+            pass
+    
+    release.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.queue_depth == 0
+
+@pytest.mark.asyncio
+async def test_scheduler_cancelled_waiter_does_not_leak_slot():
+    """Test a waiter cancelled before or right after being handed the slot frees it"""
+    scheduler = LLMScheduler(max_concurrency=1, max_queue_depth=10)
+    
+    # Cancelled in the queue, popped by the release before it could clean up
+    async with scheduler.slot():
+        waiter = asyncio.create_task(scheduler._acquire(Priority.BATCH))
+        await asyncio.sleep(0)
+        waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.active == 0
+    assert scheduler.queue_depth == 0
+    
+    # Handed the slot, cancelled before it resumed
+    async with scheduler.slot():
+        waiter = asyncio.create_task(scheduler._acquire(Priority.BATCH))
+        await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.active == 0
@@ -63,3 +63,227 @@ class TestLLMService:
         assert isinstance(result, dict)
         assert "score" in result
         assert isinstance(result["score"], int)
+    
+    def test_instances_share_http_client(self):
+        """Test that all LLMService instances reuse one pooled client"""
+        from services.agents.analyzer_agent import AnalyzerAgent
+        
+        assert LLMService().client is LLMService().client
+        assert AnalyzerAgent().llm.client is LLMService().client
+    
+    @pytest.mark.asyncio
+    async def test_generate_uses_injected_client(self):
+        """Test generate with stand-in Ollama transport"""
+        import httpx
+        
+        def handler(request):
+            return httpx.Response(200, json={"response": '{"name": "John"}'})
+        
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            service = LLMService(client=client)
+            result = await service.generate("test", use_cache=False)
+        
+        assert result == '{"name": "John"}'
+    
+    def test_json_stream_scanner_stops_at_first_object(self):
+        """Test brace-depth scanner across token boundaries, nested objects and braces in strings"""
+        from services.llm_service import JSONStreamScanner
+        
+        scanner = JSONStreamScanner()
+        tokens = ['Sure! {"na', 'me": "a}b", "exp": [{"y', '": 2}]', '}', ' and more text {"x": 1}']
+        results = [scanner.feed(t) for t in tokens]
+        
+        assert results[:3] == [None, None, None]
+        assert json.loads(results[3]) == {"name": "a}b", "exp": [{"y": 2}]}
+        assert results[4] == results[3]
+    
+    @pytest.mark.asyncio
+    async def test_generate_stream_closes_after_json(self):
+        """Test streaming mode stops reading once the JSON object is complete"""
+        import httpx
+        
+        lines = [{"response": '{"score":'}, {"response": ' 80}'}, {"response": " Explanation..."}, {"response": "", "done": True}]
+        consumed = []
+        
+        async def body():
+            for line in lines:
+                consumed.append(line)
+                yield (json.dumps(line) + "\n").encode()
+        
+        def handler(request):
+            assert json.loads(request.content)["stream"] is True
+            return httpx.Response(200, content=body())
+        
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            result = await LLMService(client=client).generate("test", stop_at_json=True, use_cache=False)
+        
+        assert json.loads(result) == {"score": 80}
+        assert len(consumed) == 2
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_prompts_coalesced(self):
+        """Test single-flight: identical concurrent prompts make one Ollama request"""
+        import asyncio
+        import httpx
+        from services.llm_service import llm_single_flight
+        
+        requests_made = []
+        
+        async def handler(request):
+            requests_made.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"response": "shared"})
+        
+        deduplicated_before = llm_single_flight.deduplicated
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            service = LLMService(client=client)
+            results = await asyncio.gather(*(service.generate("same prompt", use_cache=False) for _ in range(5)))
+        
+        assert results == ["shared"] * 5
+        assert len(requests_made) == 1
+        assert llm_single_flight.deduplicated - deduplicated_before == 4
+    
+    def test_extract_json_with_surrounding_text(self, llm_service):
+        """Test balanced-brace fallback picks the first object, not a greedy span"""
+        text = 'Here you go:\n```json\n{"score": 70, "notes": "uses {braces}"}\n```\nAlso {"other": 1}'
+        result = llm_service.extract_json(text, call_site="test")
+        
+        assert result == {"score": 70, "notes": "uses {braces}"}
+    
+    def test_schemas_derived_from_examples(self):
+        """Test structured-output schemas match the dicts call sites expect"""
+        from services.llm_schemas import CV_SCHEMA, SCORE_SCHEMA, ANALYSIS_SCHEMA, schema_from_example
+        
+        assert set(CV_SCHEMA["required"]) == {"name", "email", "phone", "experience", "skills", "education", "languages"}
+        assert CV_SCHEMA["properties"]["skills"] == {"type": "array", "items": {"type": "string"}}
+        assert SCORE_SCHEMA["properties"]["score"]["type"] == "integer"
+        assert SCORE_SCHEMA["properties"]["recommendation"]["enum"] == ["yes", "maybe", "no"]
+        assert "red_flags" in ANALYSIS_SCHEMA["required"]
+        assert schema_from_example({"a": [{"b": 1.5}]})["properties"]["a"]["items"]["properties"]["b"] == {"type": "number"}
+    
+    @pytest.mark.asyncio
+    async def test_parse_cv_sends_format_schema(self):
+        """Test parse_cv passes the CV schema to Ollama"""
+        import httpx
+        from services.llm_schemas import CV_SCHEMA
+        
+        payloads = []
+        
+        def handler(request):
+            payloads.append(json.loads(request.content))
+            return httpx.Response(200, json={"response": '{"name": "Anna", "skills": ["SQL"]}'})
+        
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            result = await LLMService(client=client).parse_cv("Anna Nowak, SQL developer, format test")
+        
+        assert result["name"] == "Anna"
+        assert payloads[0]["format"] == CV_SCHEMA
+    
+    @pytest.mark.asyncio
+    async def test_score_candidates_batch_retries_only_bad_item(self):
+        """Test batched scoring: one LLM call per batch, invalid item retried alone"""
+        import httpx
+        
+        prompts = []
+        
+        def handler(request):
+            prompt = json.loads(request.content)["prompt"]
+            prompts.append(prompt)
+            if "[c1]" in prompt:
+                body = {"results": [
+                    {"id": "c1", "score": 90, "strengths": ["Python"], "weaknesses": [], "recommendation": "yes", "reasoning": "ok"},
+                    {"id": "c2", "score": "high"},
+                    {"id": "c3", "score": 20, "strengths": [], "weaknesses": ["No SQL"], "recommendation": "no", "reasoning": "weak"},
+                ]}
+            else:
+                body = {"score": 55, "strengths": [], "weaknesses": [], "recommendation": "maybe", "reasoning": "retried"}
+            return httpx.Response(200, json={"response": json.dumps(body)})
+        
+        cvs = [{"skills": ["Python", "batch"]}, {"skills": ["Java", "batch"]}, {"skills": ["Go", "batch"]}]
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            results = await LLMService(client=client).score_candidates_batch(cvs, {"must_have": ["Python", "batch-test"]})
+        
+        assert [r["score"] for r in results] == [90, 55, 20]
+        assert len(prompts) == 2
+        assert prompts[0].count("Job requires") == 1
+        assert "[c1]" not in prompts[1]
+    
+    @pytest.mark.asyncio
+    async def test_batch_priority_score_calls_share_one_prompt(self, monkeypatch):
+        """Test single-agent scoring at batch priority: concurrent calls for one job become one batched LLM call"""
+        import asyncio
+        import httpx
+        from services.llm_scheduler import Priority, priority_scope
+        
+        monkeypatch.setattr("config.settings.LLM_BATCH_SIZE", 3)
+        prompts = []
+        
+        def handler(request):
+            prompt = json.loads(request.content)["prompt"]
+            prompts.append(prompt)
+            body = {"results": [
+                {"id": f"c{i}", "score": 10 * i, "strengths": [], "weaknesses": [], "recommendation": "maybe", "reasoning": "ok"}
+                for i in (1, 2, 3)
+            ]}
+            return httpx.Response(200, json={"response": json.dumps(body)})
+        
+        job = {"must_have": ["Python", "legacy-batch"]}
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            service = LLMService(client=client)
+            with priority_scope(Priority.BATCH):
+                results = await asyncio.gather(*(service.score({"skills": [skill, "legacy"]}, job) for skill in ("Go", "Rust", "C")))
+        
+        assert [r["score"] for r in results] == [10, 20, 30]
+        assert len(prompts) == 1
+        assert service.score_batcher.stats()["batches"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_parse_and_analyze_single_call(self):
+        """Test single-pass mode returns parsed CV and analysis from one LLM call"""
+        import httpx
+        from services.llm_schemas import PARSE_ANALYZE_SCHEMA
+        
+        payloads = []
+        analysis = {
+            "strengths": ["SQL"], "weaknesses": [], "red_flags": [], "opportunities": [],
+            "seniority_level": "mid", "culture_fit_notes": "ok", "detailed_reasoning": "fine",
+        }
+        
+        def handler(request):
+            payloads.append(json.loads(request.content))
+            body = {"cv": {"name": "Anna", "skills": ["SQL"]}, "analysis": analysis}
+            return httpx.Response(200, json={"response": json.dumps(body)})
+        
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            parsed, result = await LLMService(client=client).parse_and_analyze(
+                "Anna Nowak, SQL developer, single-pass test", {"must_have": ["SQL"]}
+            )
+        
+        assert parsed["name"] == "Anna"
+        assert result == analysis
+        assert len(payloads) == 1
+        assert payloads[0]["format"] == PARSE_ANALYZE_SCHEMA
+    
+    @pytest.mark.asyncio
+    async def test_llm_tokens_attributed_to_calling_agent(self, monkeypatch):
+        """Test token counts reported by Ollama are recorded under the calling agent"""
+        import httpx
+        from prometheus_client import REGISTRY
+        from services.agents.analyzer_agent import AnalyzerAgent
+        
+        monkeypatch.setattr("config.settings.OLLAMA_STREAM_JSON", False)
+        
+        def handler(request):
+            return httpx.Response(200, json={"response": '{"strengths": []}', "prompt_eval_count": 120, "eval_count": 8})
+        
+        def sample(kind):
+            return REGISTRY.get_sample_value("rekruter_agent_llm_tokens_total", {"agent": "AnalyzerAgent", "kind": kind}) or 0
+        
+        before = sample("prompt"), sample("completion")
+        agent = AnalyzerAgent()
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            agent.llm = LLMService(client=client)
+            await agent.run({"skills": ["token-test"]}, {"must_have": ["SQL"]})
+        
+        assert sample("prompt") == before[0] + 120
+        assert sample("completion") == before[1] + 8
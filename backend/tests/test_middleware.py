@@ -25,3 +25,36 @@ async def test_cors_headers(client: AsyncClient):
     })
     # CORS headers should be present
     assert response.status_code in [200, 405]
+
+@pytest.mark.asyncio
+async def test_oversized_upload_rejected_before_body(client: AsyncClient, monkeypatch):
+    """Test uploads with Content-Length over MAX_UPLOAD_SIZE get 413 without reaching the handler"""
+    monkeypatch.setattr("config.settings.MAX_UPLOAD_SIZE", 1024)
+    job_id = "00000000-0000-0000-0000-000000000000"
+    response = await client.post(
+        f"/api/jobs/{job_id}/upload",
+        files={"file": ("cv.txt", b"x" * (200 * 1024), "text/plain")},
+    )
+    assert response.status_code == 413
+
+@pytest.mark.asyncio
+async def test_oversized_chunked_upload_rejected_while_streaming(client: AsyncClient, monkeypatch):
+    """Test uploads without Content-Length are cut off once the body passes the limit"""
+    monkeypatch.setattr("config.settings.MAX_UPLOAD_SIZE", 1024)
+    job_id = "00000000-0000-0000-0000-000000000000"
+    sent = []
+
+    async def body():
+        yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="cv.txt"\r\nContent-Type: text/plain\r\n\r\n'
+        for _ in range(100):
+            sent.append(1)
+            yield b"x" * (64 * 1024)
+        yield b"\r\n--b--\r\n"
+
+    response = await client.post(
+        f"/api/jobs/{job_id}/upload",
+        content=body(),
+        headers={"Content-Type": "multipart/form-data; boundary=b"},
+    )
+    assert response.status_code == 413
+    assert len(sent) < 100
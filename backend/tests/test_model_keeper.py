@@ -0,0 +1,47 @@
+import pytest
+import json
+from datetime import datetime
+from services.model_keeper import OllamaModelKeeper, parse_keep_alive
+
+def test_parse_keep_alive():
+    """Test Ollama keep_alive durations"""
+    assert parse_keep_alive("30m") == 1800
+    assert parse_keep_alive("1h") == 3600
+    assert parse_keep_alive("300") == 300
+    assert parse_keep_alive("-1") == float("inf")
+
+def test_business_hours(monkeypatch):
+    """Test keeper only pings during configured business hours"""
+    monkeypatch.setattr("config.settings.BUSINESS_HOURS_START", 7)
+    monkeypatch.setattr("config.settings.BUSINESS_HOURS_END", 19)
+    monkeypatch.setattr("config.settings.OLLAMA_KEEPER_WEEKDAYS_ONLY", True)
+    
+    assert OllamaModelKeeper.in_business_hours(datetime(2026, 10, 14, 10, 0))  # Wednesday
+    assert not OllamaModelKeeper.in_business_hours(datetime(2026, 10, 14, 22, 0))
+    assert not OllamaModelKeeper.in_business_hours(datetime(2026, 10, 17, 10, 0))  # Saturday
+
+@pytest.mark.asyncio
+async def test_warm_up_preloads_with_keep_alive(monkeypatch):
+    """Test warm-up sends preload + tiny generation and marks model warm"""
+    import httpx
+    import services.llm_service as llm_module
+    
+    payloads = []
+    
+    def handler(request):
+        payloads.append(json.loads(request.content))
+        return httpx.Response(200, json={"response": "OK", "load_duration": 2_500_000_000})
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(llm_module, "_http_client", client)
+    
+    keeper = OllamaModelKeeper()
+    assert not keeper.is_warm()
+    await keeper.warm_up()
+    await client.aclose()
+    
+    assert payloads[0]["prompt"] == ""
+    assert all(p["keep_alive"] for p in payloads)
+    assert len(payloads) == 2
+    assert keeper.is_warm()
+    assert keeper.last_load_seconds == 2.5
@@ -0,0 +1,76 @@
+import pytest
+import asyncio
+import httpx
+from services.ollama_pool import OllamaPool
+from services.llm_service import LLMService
+
+def test_pick_least_outstanding():
+    """Test routing prefers the node with fewest requests in flight"""
+    pool = OllamaPool(["http://a:11434", "http://b:11434/"])
+    a, b = pool.backends
+    a.acquire()
+    
+    assert pool.pick() is b
+    assert b.url == "http://b:11434"
+    assert pool.pick(exclude=[b]) is a
+
+def test_unhealthy_node_removed_after_failures(monkeypatch):
+    """Test node removal after consecutive failures"""
+    monkeypatch.setattr("config.settings.OLLAMA_NODE_MAX_FAILURES", 2)
+    pool = OllamaPool(["http://a:11434", "http://b:11434"])
+    a, b = pool.backends
+    a.record_failure()
+    assert a.healthy
+    a.record_failure()
+    
+    assert not a.healthy
+    assert pool.healthy_backends == [b]
+    assert all(pool.pick() is b for _ in range(5))
+
+@pytest.mark.asyncio
+async def test_health_check_readmits_node(monkeypatch):
+    """Test health check re-admits a recovered node and removes a dead one"""
+    import services.llm_service as llm_module
+    
+    def handler(request):
+        if request.url.host == "down":
+            raise httpx.ConnectError("refused")
+        return httpx.Response(200, json={"models": []})
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(llm_module, "_http_client", client)
+    pool = OllamaPool(["http://up:11434", "http://down:11434"])
+    up, down = pool.backends
+    up.mark_unhealthy()
+    
+    await pool.check_all()
+    await client.aclose()
+    
+    assert up.healthy
+    assert not down.healthy
+
+@pytest.mark.asyncio
+async def test_hedged_request_uses_faster_node(monkeypatch):
+    """Test call past p95 is hedged to a second node and the first answer wins"""
+    import services.llm_service as llm_module
+    from services.circuit_breaker import CircuitBreaker
+    
+    async def handler(request):
+        if request.url.host == "slow":
+            await asyncio.sleep(1)
+        return httpx.Response(200, json={"response": request.url.host})
+    
+    breaker = CircuitBreaker()
+    for _ in range(CircuitBreaker.MIN_SAMPLES):
+        breaker.record_success(0.05)
+    pool = OllamaPool(["http://slow:11434", "http://fast:11434"])
+    pool.backends[1].acquire()  # force primary = slow node
+    monkeypatch.setattr(llm_module, "ollama_pool", pool)
+    monkeypatch.setattr(llm_module, "llm_breaker", breaker)
+    monkeypatch.setattr("config.settings.OLLAMA_HEDGING", True)
+    
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        result = await LLMService(client=client).generate("hedge me", use_cache=False)
+    
+    assert result == "fast"
+    assert pool.backends[0].outstanding == 0
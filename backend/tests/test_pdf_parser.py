@@ -53,3 +53,27 @@ class TestPDFParser:
         result = PDFParserService.extract_text("/nonexistent/file.pdf")
         
         assert result is None
+
+def test_extract_from_bytes_without_temp_files(monkeypatch):
+    """Test PDF, DOCX and TXT uploads are parsed straight from memory"""
+    import io
+    import fitz
+    from docx import Document
+
+    def no_temp_files(*args, **kwargs):
+        raise AssertionError("temp file created")
+    monkeypatch.setattr(tempfile, "mkstemp", no_temp_files)
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", no_temp_files)
+
+    pdf = fitz.open()
+    pdf.new_page().insert_text((72, 72), "Anna Nowak - Python")
+    pdf_bytes = pdf.tobytes()
+    docx_buffer = io.BytesIO()
+    document = Document()
+    document.add_paragraph("Jan Kowalski - Django")
+    document.save(docx_buffer)
+
+    assert "Anna Nowak" in PDFParserService.extract_text_from_bytes("cv.pdf", pdf_bytes)
+    assert PDFParserService.extract_text_from_bytes("cv.docx", docx_buffer.getvalue()) == "Jan Kowalski - Django"
+    assert PDFParserService.extract_text_from_bytes("cv.txt", "Zażółć".encode()) == "Zażółć"
+    assert PDFParserService.extract_text_from_bytes("cv.pdf", b"\xff\xfe\x00garbage") is None
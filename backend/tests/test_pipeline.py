@@ -0,0 +1,291 @@
+import asyncio
+import time
+import pytest
+from services.agents.pipeline import AgentPipeline, PipelineError, Stage
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_independent_stages_concurrently():
+    """Test stages without mutual dependencies overlap and dependents see their outputs"""
+    async def slow(value):
+        await asyncio.sleep(0.1)
+        return value
+
+    pipeline = AgentPipeline([
+        Stage("a", lambda x: slow(x + 1), inputs=("x",)),
+        Stage("b", lambda x: slow(x * 10), inputs=("x",)),
+        Stage("c", lambda a, b: a + b, inputs=("a", "b")),
+    ], initial_inputs=("x",))
+
+    start = time.perf_counter()
+    outputs, report = await pipeline.run(x=2)
+    elapsed = time.perf_counter() - start
+
+    assert outputs == {"a": 3, "b": 20, "c": 23}
+    assert elapsed < 0.18  # a and b ran side by side
+    assert set(report["timings_ms"]) == {"a", "b", "c"}
+
+@pytest.mark.asyncio
+async def test_pipeline_stage_timeout_uses_fallback():
+    """Test a timed-out stage falls back instead of failing the whole pipeline"""
+    async def hang(x):
+        await asyncio.sleep(10)
+
+    pipeline = AgentPipeline([
+        Stage("slow", hang, inputs=("x",), timeout=0.05, fallback=lambda **_: "fallback"),
+        Stage("after", lambda slow: slow.upper(), inputs=("slow",)),
+    ], initial_inputs=("x",))
+
+    outputs, report = await pipeline.run(x=1)
+
+    assert outputs["after"] == "FALLBACK"
+    assert report["timed_out"] == ["slow"]
+
+@pytest.mark.asyncio
+async def test_pipeline_errors_propagate():
+    """Test errors are not swallowed by fallbacks"""
+    def boom(x):
+        raise ValueError("boom")
+
+    pipeline = AgentPipeline([Stage("boom", boom, inputs=("x",), fallback=lambda **_: None)], initial_inputs=("x",))
+    with pytest.raises(ValueError):
+        await pipeline.run(x=1)
+
+def test_pipeline_validates_graph():
+    """Test unknown inputs and cycles are rejected up front"""
+    with pytest.raises(PipelineError):
+        AgentPipeline([Stage("a", lambda y: y, inputs=("y",))], initial_inputs=("x",))
+    with pytest.raises(PipelineError):
+        AgentPipeline([
+            Stage("a", lambda b: b, inputs=("b",)),
+            Stage("b", lambda a: a, inputs=("a",)),
+        ], initial_inputs=())
+
+@pytest.mark.asyncio
+async def test_orchestrator_pipeline_report_and_extra_stage(test_cv_data, monkeypatch):
+    """Test orchestrator attaches stage timings and runs plugged-in agents"""
+    from services.agents.orchestrator import MultiAgentOrchestrator
+
+    monkeypatch.setattr("config.settings.USE_RAG_CONTEXT", False)
+    orchestrator = MultiAgentOrchestrator()
+
+    async def analyze(cv_data, job_requirements, context=None):
+        return {"strengths": ["python"], "weaknesses": [], "red_flags": [], "experience_level": "mid", "culture_fit_score": 70, "growth_potential": "medium"}
+    monkeypatch.setattr(orchestrator.analyzer, "process", analyze)
+    orchestrator.add_stage(Stage("skills_count", lambda cv_data: len(cv_data.get("skills", [])), inputs=("cv_data",)))
+
+    result = await orchestrator.process_candidate(test_cv_data, {"must_have": ["Python"]})
+
+    assert set(result["pipeline"]["timings_ms"]) == {"rag", "screening", "analysis", "scoring", "skills_count"}
+    assert result["agents"]["skills_count"] == len(test_cv_data.get("skills", []))
+    assert 0 <= result["score"] <= 100
+
+@pytest.mark.asyncio
+async def test_orchestrator_fast_reject_skips_analyzer(test_cv_data, monkeypatch):
+    """Test low screening match short-circuits the analyzer unless full analysis is forced"""
+    from services.agents.orchestrator import MultiAgentOrchestrator
+
+    monkeypatch.setattr("config.settings.USE_RAG_CONTEXT", False)
+    orchestrator = MultiAgentOrchestrator()
+    calls = []
+
+    async def analyze(cv_data, job_requirements, context=None):
+        calls.append(cv_data["name"])
+        return {"strengths": [], "weaknesses": [], "red_flags": []}
+    monkeypatch.setattr(orchestrator.analyzer, "process", analyze)
+
+    job = {"must_have": ["Rust", "Kubernetes", "Go"], "fast_reject_threshold": 50}
+    result = await orchestrator.process_candidate(test_cv_data, job)
+    assert calls == []
+    assert result["scoring_mode"] == "fast_reject"
+    assert result["recommendation"] == "no"
+
+    result = await orchestrator.process_candidate(test_cv_data, job, fast_reject=False)
+    assert len(calls) == 1
+    assert result.get("scoring_mode", "full") == "full"
+
+    # Job-level 0 disables the policy
+    await orchestrator.process_candidate(test_cv_data, {**job, "fast_reject_threshold": 0})
+    assert len(calls) == 2
+
+@pytest.mark.asyncio
+async def test_orchestrator_uses_single_pass_analysis(test_cv_data, monkeypatch):
+    """Test a ready analysis (single-pass mode) replaces the AnalyzerAgent call"""
+    from services.agents.orchestrator import MultiAgentOrchestrator
+
+    orchestrator = MultiAgentOrchestrator()
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("AnalyzerAgent must not run with a single-pass analysis")
+    monkeypatch.setattr(orchestrator.analyzer, "process", fail)
+
+    analysis = {"strengths": ["a", "b"], "weaknesses": [], "red_flags": []}
+    result = await orchestrator.process_candidate(test_cv_data, {"must_have": ["Python"]}, analysis=analysis)
+
+    assert result["score"] == 100
+    assert result.get("scoring_mode", "full") == "full"
+
+@pytest.mark.asyncio
+async def test_pipeline_reuses_cached_stage_when_inputs_unchanged():
+    """Test stages with an unchanged input hash are not re-run (and lazy inputs not started)"""
+    calls = []
+
+    def record(name, value):
+        calls.append(name)
+        return value
+
+    def build():
+        return AgentPipeline([
+            Stage("context", lambda: record("context", "ctx"), lazy=True),
+            Stage("expensive", lambda x, context: record("expensive", x * 2), inputs=("x", "context"),
+                  cache_key=lambda x: {"x": x}),
+        ], initial_inputs=("x",), cached=cached)
+
+    cached = None
+    outputs, report = await build().run(x=2)
+    assert outputs["expensive"] == 4
+    assert calls == ["context", "expensive"]
+
+    cached = report["stage_results"]
+    outputs, report = await build().run(x=2)
+    assert outputs["expensive"] == 4
+    assert report["reused"] == ["expensive"]
+    assert calls == ["context", "expensive"]
+
+    outputs, _ = await build().run(x=3)
+    assert outputs["expensive"] == 6
+    assert calls == ["context", "expensive"] * 2
+
+@pytest.mark.asyncio
+async def test_rescoring_reruns_analyzer_only_for_skill_changes(test_cv_data, monkeypatch):
+    """Test re-scoring reuses the cached analysis unless must_have/nice_to_have changed"""
+    from models import Candidate
+    from services.agents.orchestrator import MultiAgentOrchestrator
+    from services.rescoring import JobRescorer, apply_scoring
+
+    monkeypatch.setattr("config.settings.USE_RAG_CONTEXT", False)
+    monkeypatch.setattr("config.settings.FAST_REJECT_THRESHOLD", 0)
+    rescorer = JobRescorer()
+    rescorer._orchestrator = MultiAgentOrchestrator()
+    calls = []
+
+    async def analyze(cv_data, job_requirements, context=None):
+        calls.append(job_requirements)
+        return {"strengths": ["python"], "weaknesses": [], "red_flags": []}
+    monkeypatch.setattr(rescorer.orchestrator.analyzer, "process", analyze)
+
+    job = {"must_have": ["Python"], "nice_to_have": []}
+    candidate = Candidate(parsed_cv=test_cv_data, stage_results={})
+    apply_scoring(candidate, await rescorer.orchestrator.process_candidate(test_cv_data, job))
+    assert len(calls) == 1
+
+    # Title-only change: nothing expensive re-runs
+    await rescorer.rescore_candidate(candidate, {**job, "title": "Senior"})
+    assert len(calls) == 1
+
+    # Skills change: analyzer re-runs, score follows the new screening
+    await rescorer.rescore_candidate(candidate, {"must_have": ["Python", "Rust"], "nice_to_have": []})
+    assert len(calls) == 2
+    assert candidate.score < 100
+
+@pytest.mark.asyncio
+async def test_rescoring_keeps_degraded_and_full_analysis(test_cv_data, monkeypatch):
+    """Test a degraded candidate stays degraded, a fully analyzed one is not fast-rejected again"""
+    from models import Candidate
+    from services.agents.orchestrator import MultiAgentOrchestrator
+    from services.rescoring import JobRescorer
+
+    monkeypatch.setattr("config.settings.USE_RAG_CONTEXT", False)
+    monkeypatch.setattr("config.settings.FAST_REJECT_THRESHOLD", 100)
+    rescorer = JobRescorer()
+    rescorer._orchestrator = MultiAgentOrchestrator()
+    calls = []
+
+    async def analyze(cv_data, job_requirements, context=None):
+        calls.append(job_requirements)
+        return {"strengths": ["python"], "weaknesses": [], "red_flags": []}
+    monkeypatch.setattr(rescorer.orchestrator.analyzer, "process", analyze)
+    job = {"must_have": ["Python", "Rust"], "nice_to_have": []}
+
+    degraded = Candidate(parsed_cv=test_cv_data, scoring_mode="degraded", stage_results={})
+    await rescorer.rescore_candidate(degraded, job)
+    assert degraded.scoring_mode == "degraded"
+    assert calls == []
+
+    analyzed = Candidate(parsed_cv=test_cv_data, scoring_mode="full", stage_results={})
+    await rescorer.rescore_candidate(analyzed, job)
+    assert analyzed.scoring_mode == "full"
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_precomputed_screening_skips_screener(test_cv_data, monkeypatch):
+    """Test a screening from the bulk screener replaces the ScreenerAgent call"""
+    from services.agents.orchestrator import MultiAgentOrchestrator
+
+    monkeypatch.setattr("config.settings.USE_RAG_CONTEXT", False)
+    orchestrator = MultiAgentOrchestrator()
+
+    async def no_screen(*args, **kwargs):
+        raise AssertionError("screener called")
+    monkeypatch.setattr(orchestrator.screener, "process", no_screen)
+    screening = (await orchestrator.screener.process_job("job", [("c1", test_cv_data["skills"])], {"must_have": ["Python"]}))[0]
+
+    result = await orchestrator.process_candidate(test_cv_data, {"must_have": ["Python"]}, fast_reject=True, screening=screening)
+    assert result["stage_results"]["screening"]["output"] == screening
+
+@pytest.mark.asyncio
+async def test_batch_priority_analyses_share_one_batch(test_cv_data, monkeypatch):
+    """Test concurrent batch-priority pipelines for one job send their analyses in one batched call"""
+    from services.agents.orchestrator import MultiAgentOrchestrator
+    from services.llm_scheduler import Priority, priority_scope
+
+    monkeypatch.setattr("config.settings.USE_RAG_CONTEXT", False)
+    monkeypatch.setattr("config.settings.FAST_REJECT_THRESHOLD", 0)
+    monkeypatch.setattr("config.settings.LLM_BATCH_SIZE", 3)
+    orchestrator = MultiAgentOrchestrator()
+    batches = []
+
+    async def process_batch(cv_list, job_requirements, context=None):
+        batches.append([cv["name"] for cv in cv_list])
+        return [{"strengths": [cv["name"]], "weaknesses": [], "red_flags": []} for cv in cv_list]
+
+    async def no_single(*args, **kwargs):
+        raise AssertionError("single analysis at batch priority")
+    monkeypatch.setattr(orchestrator.analyzer, "process_batch", process_batch)
+    monkeypatch.setattr(orchestrator.analyzer, "process", no_single)
+
+    job = {"must_have": ["Python"], "nice_to_have": []}
+    cvs = [{**test_cv_data, "name": f"c{i}"} for i in range(3)]
+    with priority_scope(Priority.BATCH):
+        results = await asyncio.gather(*(orchestrator.process_candidate(cv, job) for cv in cvs))
+
+    assert batches == [["c0", "c1", "c2"]]
+    assert [r["stage_results"]["analysis"]["output"]["strengths"] for r in results] == [["c0"], ["c1"], ["c2"]]
+
+    # A waiter cancelled before the window closes is left out of the batch
+    with priority_scope(Priority.BATCH):
+        cancelled = asyncio.create_task(orchestrator.analyzer.analyze(cvs[0], job))
+        kept = asyncio.create_task(orchestrator.analyzer.analyze(cvs[1], job))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        assert (await kept)["strengths"] == ["c1"]
+    assert batches[-1] == ["c1"]
+
+@pytest.mark.asyncio
+async def test_failed_analysis_marks_candidate_degraded(test_cv_data, monkeypatch):
+    """Test an analyzer timeout is stored as degraded (picked up by re-scoring), not as a full analysis"""
+    from services.agents.orchestrator import MultiAgentOrchestrator
+
+    monkeypatch.setattr("config.settings.USE_RAG_CONTEXT", False)
+    monkeypatch.setattr("config.settings.FAST_REJECT_THRESHOLD", 0)
+    monkeypatch.setattr("config.settings.PIPELINE_STAGE_TIMEOUTS", {"analysis": 0.05})
+    orchestrator = MultiAgentOrchestrator()
+
+    async def hang(cv_data, job_requirements, context=None):
+        await asyncio.sleep(10)
+    monkeypatch.setattr(orchestrator.analyzer, "process", hang)
+
+    result = await orchestrator.process_candidate(test_cv_data, {"must_have": ["Python"], "nice_to_have": []})
+
+    assert result["pipeline"]["timed_out"] == ["analysis"]
+    assert (result["degraded"], result["scoring_mode"]) == (True, "degraded")
+    assert "analysis" not in result["stage_results"]
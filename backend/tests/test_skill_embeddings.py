@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from services.skill_embeddings import SkillEmbeddingIndex
+
+class WordEncoder:
+    """Tiny deterministic encoder: fixed vectors per known phrase, counts encoded strings"""
+    VECTORS = {
+        "ml": [1.0, 0.0, 0.0],
+        "machine learning": [0.95, 0.05, 0.0],
+        "neural networks": [0.97, 0.2, 0.0],
+        "deep learning": [0.5, 0.8, 0.0],
+        "cooking": [0.0, 0.0, 1.0],
+    }
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return np.array([self.VECTORS.get(t, [0.0, 1.0, 0.0]) for t in texts])
+
+def test_match_is_thresholded_cosine(tmp_path):
+    """Test similarity matrix against the threshold"""
+    index = SkillEmbeddingIndex(path=tmp_path / "emb.npz", encoder=WordEncoder())
+    hits = index.match(["Machine Learning"], ["ML", "Cooking"], threshold=0.9)
+    assert hits.tolist() == [[True, False]]
+    assert index.semantic_matches(["machine learning", "cooking"], ["ml"]) == {"machine learning": ["ml"]}
+
+def test_each_skill_encoded_once_and_persisted(tmp_path):
+    """Test skill strings are encoded once and the matrix survives a restart"""
+    encoder = WordEncoder()
+    index = SkillEmbeddingIndex(path=tmp_path / "emb.npz", encoder=encoder)
+    index.match(["ML"], ["machine learning", " ml "])
+    index.match(["ml"], ["Machine  Learning", "cooking"])
+    assert sorted(encoder.encoded) == ["cooking", "machine learning", "ml"]
+
+    fresh = WordEncoder()
+    reloaded = SkillEmbeddingIndex(path=tmp_path / "emb.npz", encoder=fresh)
+    assert reloaded.match(["ml"], ["machine learning"]).all()
+    assert fresh.encoded == []
+
+def test_new_skills_appended_then_merged_on_load(tmp_path):
+    """Test each batch of new skills is written as a part file, merged into the main file on load"""
+    index = SkillEmbeddingIndex(path=tmp_path / "emb.npz", encoder=WordEncoder())
+    index.match(["ml"], ["cooking"])
+    index.match(["deep learning"], ["cooking"])
+    assert not (tmp_path / "emb.npz").exists()
+    assert len(list(tmp_path.glob("emb.part-*.npz"))) == 3
+
+    reloaded = SkillEmbeddingIndex(path=tmp_path / "emb.npz", encoder=WordEncoder())
+    reloaded.load()
+    assert sorted(reloaded.keys) == ["cooking", "deep learning", "ml"]
+    assert [p.name for p in tmp_path.iterdir()] == ["emb.npz"]
+
+@pytest.mark.asyncio
+async def test_screener_semantic_mode(monkeypatch, tmp_path):
+    """Test semantic mode turns close exact-misses into matches, in single and bulk screening"""
+    from services import skill_embeddings as module
+    from services.agents.screener_agent import ScreenerAgent
+
+    monkeypatch.setattr("config.settings.SKILL_MATCH_MODE", "semantic")
+    monkeypatch.setattr("config.settings.SKILL_SEMANTIC_THRESHOLD", 0.9)
+    monkeypatch.setattr(module, "skill_embeddings", SkillEmbeddingIndex(path=tmp_path / "emb.npz", encoder=WordEncoder()))
+    monkeypatch.setattr("services.agents.screener_agent.skill_embeddings", module.skill_embeddings)
+
+    agent = ScreenerAgent()
+    job = {"must_have": ["Machine Learning", "Cooking"]}
+    result = await agent.process({"skills": ["Neural Networks", "cooking"]}, job)
+    assert result["passes"] is True
+    assert result["semantic_matches"] == {"Machine Learning": ["Neural Networks"]}
+
+    result = await agent.process({"skills": ["Deep Learning", "cooking"]}, job)
+    assert result["missing_skills"] == ["Machine Learning"]  # similarity below threshold
+
+    bulk = await agent.process_job(
+        "job", [("a", ["Neural Networks"]), ("b", ["Deep Learning"]), ("c", ["ML"])],
+        {"must_have": ["Machine Learning"]}
+    )
+    assert [r["passes"] for r in bulk] == [True, False, True]
+
+@pytest.mark.asyncio
+async def test_slow_semantic_model_falls_back_to_exact_screening(monkeypatch, test_cv_data):
+    """Test a screening stage timeout (model still loading) scores with exact matching instead of failing"""
+    import time
+    from services.agents.orchestrator import MultiAgentOrchestrator
+
+    class LoadingIndex:
+        def semantic_matches(self, skills, cv_skills):
+            time.sleep(0.3)
+            return {}
+
+    monkeypatch.setattr("config.settings.USE_RAG_CONTEXT", False)
+    monkeypatch.setattr("config.settings.FAST_REJECT_THRESHOLD", 0)
+    monkeypatch.setattr("config.settings.SKILL_MATCH_MODE", "semantic")
+    monkeypatch.setattr("config.settings.PIPELINE_STAGE_TIMEOUTS", {"screening": 0.05})
+    monkeypatch.setattr("services.agents.screener_agent.skill_embeddings", LoadingIndex())
+    orchestrator = MultiAgentOrchestrator()
+
+    async def analyze(cv_data, job_requirements, context=None):
+        return {"strengths": [], "weaknesses": [], "red_flags": []}
+    monkeypatch.setattr(orchestrator.analyzer, "process", analyze)
+
+    result = await orchestrator.process_candidate(test_cv_data, {"must_have": ["Python", "Cobol"], "nice_to_have": []})
+
+    assert result["pipeline"]["timed_out"] == ["screening"]
+    assert "screening" not in result["stage_results"]  # exact-only result is not cached
+    assert result["score"] > 0
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from database import Base
+from models import Company, Job, Candidate, CandidateSkill
+from services.skill_index import index_entries, filter_by_skills, reindex_job, skill_keys, query_keys
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+async def _seed(db):
+    company = Company(name="Hotel")
+    db.add(company)
+    await db.flush()
+    job = Job(company_id=company.id, title="DevOps", description="...", requirements={"must_have": []})
+    other = Job(company_id=company.id, title="Other", description="...", requirements={"must_have": []})
+    db.add_all([job, other])
+    await db.flush()
+    profiles = {
+        "anna": ["Kubernetes", "Python"],
+        "jan": ["k8s", "Go"],
+        "ola": ["Postgres", "Django"],
+    }
+    for name, skills in profiles.items():
+        candidate = Candidate(job_id=job.id, name=name, parsed_cv={"skills": skills})
+        candidate.skill_index = index_entries(job.id, candidate.parsed_cv)
+        db.add(candidate)
+    stranger = Candidate(job_id=other.id, name="piotr", parsed_cv={"skills": ["Kubernetes"]})
+    stranger.skill_index = index_entries(other.id, stranger.parsed_cv)
+    db.add(stranger)
+    await db.commit()
+    return job
+
+async def _names(db, job, skills, mode="and"):
+    query = filter_by_skills(select(Candidate).where(Candidate.job_id == job.id), job.id, skills, mode)
+    return sorted(c.name for c in (await db.execute(query)).scalars())
+
+def test_skill_keys_merge_aliases_and_parents():
+    """Test index keys are canonical and include implied parents"""
+    assert skill_keys(["k8s", "Kubernetes"]) == ["kubernetes"]
+    assert set(skill_keys(["Postgres"])) == {"postgresql", "sql"}
+
+def test_query_keys_match_index_keys_of_unknown_skills():
+    """Test filter terms outside the taxonomy get the same key as the indexed skill"""
+    for skill in ["Next.js", "Foo.Bar Tool", "foobar-tool", "C/C++", "🐍"]:
+        assert query_keys([skill]) and set(query_keys([skill])) <= set(skill_keys([skill]))
+    assert query_keys(["Foo.Bar Tool", "foobar tool"]) == ["foobartool"]
+
+@pytest.mark.asyncio
+async def test_filter_by_skills_and_or(db):
+    """Test AND/OR skill filters via the inverted index (aliases and hierarchy aware)"""
+    job = await _seed(db)
+
+    assert await _names(db, job, ["kubernetes"]) == ["anna", "jan"]
+    assert await _names(db, job, ["Kubernetes", "Python"]) == ["anna"]
+    assert await _names(db, job, ["go", "python"], mode="or") == ["anna", "jan", "ola"]
+    assert await _names(db, job, ["SQL"]) == ["ola"]
+    assert await _names(db, job, ["Cobol"]) == []
+    assert await _names(db, job, ["Cobol", "Go"], mode="or") == ["jan"]
+
+@pytest.mark.asyncio
+async def test_reindex_job(db):
+    """Test the index can be rebuilt from parsed_cv"""
+    job = await _seed(db)
+    rows = await reindex_job(db, job.id)
+    assert rows == len((await db.execute(select(CandidateSkill).where(CandidateSkill.job_id == job.id))).scalars().all())
+    assert await _names(db, job, ["k8s"]) == ["anna", "jan"]
@@ -0,0 +1,111 @@
+import pytest
+import numpy as np
+from services.skill_taxonomy import SkillTaxonomy, normalize_skill, compact_skill
+from services.bulk_screener import BulkScreener
+
+@pytest.fixture
+def taxonomy():
+    return SkillTaxonomy({
+        "sql": {"name": "SQL"},
+        "postgresql": {"name": "PostgreSQL", "aliases": ["postgres", "psql"], "parent": "sql"},
+        "javascript": {"name": "JavaScript", "aliases": ["js"]},
+        "react": {"name": "React", "parent": "javascript"},
+        "nodejs": {"name": "Node.js", "aliases": ["node"], "parent": "javascript"},
+        "cpp": {"name": "C++"},
+        "c": {"name": "C"},
+    }, version="test")
+
+def test_normalization_forms():
+    """Test case, whitespace and punctuation normalization"""
+    assert normalize_skill("  React.JS ") == "react.js"
+    assert compact_skill("Node  JS") == "nodejs"
+    assert compact_skill("C++") == "c++"
+
+def test_aliases_resolve_to_canonical_id(taxonomy):
+    """Test aliases, spelling variants and the .js suffix map to one ID"""
+    postgres = taxonomy.canonical_id("PostgreSQL")
+    assert taxonomy.canonical_id("postgres") == postgres
+    assert taxonomy.canonical_id(" PSQL ") == postgres
+    assert taxonomy.canonical_id("React.js") == taxonomy.canonical_id("react")
+    assert taxonomy.canonical_id("NodeJS") == taxonomy.canonical_id("node")
+    assert taxonomy.canonical_id("C++") != taxonomy.canonical_id("C")
+    assert taxonomy.canonical_name("postgres") == "PostgreSQL"
+
+def test_hierarchy_and_unknown_skills(taxonomy):
+    """Test parents are implied and unknown skills match exactly within a scope, never growing the taxonomy"""
+    scope = taxonomy.scope()
+    ids = taxonomy.encode(["Postgres", "Some Tool"], scope)
+    assert taxonomy.canonical_id("SQL") in ids
+    assert scope.id("some-tool") in ids
+    assert scope.key(scope.id("SOME TOOL")) == "sometool"
+    assert taxonomy.canonical_id("JavaScript") not in ids
+    assert taxonomy.canonical_id("Some Tool") is None
+    assert taxonomy.size == 7
+
+    # Child scope extends without touching the parent
+    child = scope.child()
+    assert child.id("Some Tool") == scope.id("Some Tool")
+    assert child.id("Other Tool") == scope.size
+    assert scope.size == 8
+
+def test_cycle_and_unknown_parent_rejected():
+    """Test broken taxonomies fail at load time"""
+    with pytest.raises(ValueError):
+        SkillTaxonomy({"a": {"parent": "b"}, "b": {"parent": "a"}})
+    with pytest.raises(ValueError):
+        SkillTaxonomy({"a": {"parent": "missing"}})
+
+def test_bulk_screener_matches_per_candidate_logic(taxonomy):
+    """Test vectorized screening (bit ops over the matrix) gives the expected matches"""
+    screener = BulkScreener(taxonomy)
+    cv_list = [
+        {"skills": ["Postgres", "React.js"]},
+        {"skills": ["SQL"]},
+        {"skills": []},
+        {"skills": ["node"] + [f"tool {i}" for i in range(100)]},  # more IDs than one 64-bit word
+    ]
+    matrix = screener.encode([cv["skills"] for cv in cv_list])
+    assert matrix.bits.dtype == np.uint64
+    assert matrix.bits.shape[1] == 2
+
+    result = screener.screen(matrix, ["PostgreSQL", "JavaScript"])
+    assert result["matched"].tolist() == [2, 0, 0, 1]
+    assert result["passes"].tolist() == [True, False, False, False]
+    assert result["match_percentage"].tolist() == [100.0, 0.0, 0.0, 50.0]
+
+    # Requirement unknown when the matrix was built matches nobody
+    assert screener.screen(matrix, ["Brand New Skill"])["matched"].tolist() == [0, 0, 0, 0]
+
+    screened = screener.screen_candidates(cv_list, {"must_have": ["postgres", "SQL", "tool 99"]})
+    assert screened[0]["matching_skills"] == ["postgres", "SQL"]
+    assert screened[0]["missing_skills"] == ["tool 99"]
+    assert screened[3]["matching_skills"] == ["tool 99"]
+    assert screener.screen_candidates(cv_list, {"must_have": []})[2]["passes"] is True
+
+def test_bulk_screener_job_cache(taxonomy):
+    """Test a job's matrix is reused until its candidates or their skills change"""
+    screener = BulkScreener(taxonomy)
+    candidates = [("a", ["Postgres", "Niche Tool"]), ("b", ["React"])]
+
+    first = screener.job_matrix("job", candidates)
+    assert screener.job_matrix("job", candidates) is first
+    assert [r["passes"] for r in screener.results(first, {"must_have": ["SQL", "niche-tool"]})] == [True, False]
+
+    # Skills of known candidates change only on re-parse, which invalidates the job
+    screener.invalidate("job")
+    changed = screener.job_matrix("job", [("a", ["Postgres"]), ("b", ["React"])])
+    assert changed is not first
+    assert screener.job_matrix("job", candidates + [("c", [])]) is not changed
+    screener.invalidate("job")
+    assert screener.stats() == {"cached_jobs": 0, "hits": 1, "misses": 3}
+
+def test_bulk_screener_returns_only_best_rows(taxonomy):
+    """Test top_k / min_match build result dicts only for the returned rows, best first"""
+    screener = BulkScreener(taxonomy)
+    cv_list = [{"skills": ["React"]}, {"skills": ["Postgres", "React"]}, {"skills": ["Postgres"]}, {"skills": []}]
+    job = {"must_have": ["SQL", "React"]}
+
+    top = screener.screen_candidates(cv_list, job, top_k=2)
+    assert [(r["row"], r["match_percentage"]) for r in top] == [(1, 100.0), (0, 50.0)]
+    assert [r["row"] for r in screener.screen_candidates(cv_list, job, min_match=50)] == [1, 0, 2]
+    assert "row" not in screener.screen_candidates(cv_list, job)[0]
@@ -0,0 +1,128 @@
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+import pytest
+from sqlalchemy import select
+from models import Company, Job, Candidate, ProcessingTask
+from services.task_queue import CVTaskQueue
+
+@pytest.fixture
+def queue(session_factory, tmp_path, monkeypatch):
+    stages = []
+
+    async def score(job, cv_text, on_stage=None, parsed_cv=None):
+        await on_stage("parsing", 30)
+        stages.append(cv_text)
+        if "broken" in cv_text:
+            raise ValueError("unparseable CV")
+        await on_stage("scoring", 60)
+        return Candidate(job_id=job.id, name="Jan Kowalski", score=77, parsed_cv={"skills": []})
+
+    async def extract(filename, content):
+        return content.decode()
+
+    monkeypatch.setattr("services.cv_processing.score_cv_text", score)
+    monkeypatch.setattr("services.cv_processing.extract_cv_bytes", extract)
+    queue = CVTaskQueue(workers=2, session_factory=session_factory)
+    queue.upload_dir = tmp_path / "uploads"
+    queue.scored = stages
+    return queue
+
+async def _task(queue, content="Jan Kowalski, Python", status="queued", age=0):
+    async with queue.session_factory() as db:
+        company = Company(name="Hotel")
+        db.add(company)
+        await db.flush()
+        job = Job(company_id=company.id, title="Dev", description="...", requirements={"must_have": []})
+        db.add(job)
+        await db.flush()
+        touched = datetime.utcnow() - timedelta(seconds=age)
+        task = ProcessingTask(job_id=job.id, filename="cv.txt", status=status)
+        db.add(task)
+        await db.flush()
+        task.file_path = await queue.store_upload(task.id, "cv.txt", content.encode())
+        task.updated_at = touched
+        await db.commit()
+        return task.id
+
+async def _get(queue, task_id):
+    async with queue.session_factory() as db:
+        return (await db.execute(select(ProcessingTask).where(ProcessingTask.id == task_id))).scalar_one()
+
+@pytest.mark.asyncio
+async def test_task_processed_to_candidate(queue):
+    """Test a stored upload ends as a saved candidate and the file is removed"""
+    task_id = await _task(queue)
+    path = (await _get(queue, task_id)).file_path
+
+    await queue.process(task_id)
+
+    task = await _get(queue, task_id)
+    assert (task.status, task.stage, task.progress) == ("done", "done", 100)
+    assert task.candidate_id is not None
+    async with queue.session_factory() as db:
+        candidate = (await db.execute(select(Candidate).where(Candidate.id == task.candidate_id))).scalar_one()
+    assert candidate.score == 77
+    assert not Path(path).exists()
+    assert queue.stats()["processed"] == 1
+
+@pytest.mark.asyncio
+async def test_task_failure_recorded(queue):
+    """Test a failing CV marks the task failed with the error, no candidate saved"""
+    task_id = await _task(queue, content="broken")
+
+    await queue.process(task_id)
+
+    task = await _get(queue, task_id)
+    assert task.status == "failed"
+    assert "unparseable" in task.error
+    assert task.candidate_id is None
+    assert queue.failed == 1
+
+@pytest.mark.asyncio
+async def test_workers_process_submitted_and_recovered_tasks(queue):
+    """Test unfinished tasks from a previous run are re-queued on start, done and live ones are not"""
+    interrupted = await _task(queue, status="running", age=3600)
+    finished = await _task(queue, status="done", age=3600)
+    elsewhere = await _task(queue, status="running")  # another process is on it
+    queue.start()
+    try:
+        fresh = await _task(queue)
+        await queue.submit(fresh)
+        await asyncio.sleep(0.05)
+        await asyncio.wait_for(queue.queue.join(), timeout=5)
+    finally:
+        await queue.stop()
+
+    assert (await _get(queue, interrupted)).status == "done"
+    assert (await _get(queue, fresh)).status == "done"
+    assert (await _get(queue, finished)).candidate_id is None
+    assert (await _get(queue, elsewhere)).status == "running"
+    assert len(queue.scored) == 2
+
+@pytest.mark.asyncio
+async def test_task_claimed_by_one_process_only(queue, session_factory, tmp_path):
+    """Test two API processes recovering the same row run it once"""
+    other = CVTaskQueue(workers=1, session_factory=session_factory)
+    other.upload_dir = tmp_path / "uploads"
+    task_id = await _task(queue, age=3600)
+
+    assert await queue.recover() == 1
+    assert await other.recover() == 1
+    await asyncio.gather(queue.process(task_id), other.process(task_id))
+
+    assert (await _get(queue, task_id)).status == "done"
+    assert len(queue.scored) == 1
+
+@pytest.mark.asyncio
+async def test_unsubmitted_task_discarded(queue):
+    """Test a task rejected by a full queue leaves neither its row nor its file behind"""
+    task_id = await _task(queue)
+    task = await _get(queue, task_id)
+
+    async with queue.session_factory() as db:
+        await queue.discard(db, task)
+
+    async with queue.session_factory() as db:
+        assert (await db.execute(select(ProcessingTask).where(ProcessingTask.id == task_id))).scalar_one_or_none() is None
+    assert not Path(task.file_path).exists()
@@ -0,0 +1,43 @@
+import io
+import pytest
+from fastapi import HTTPException, UploadFile
+from routers.candidates import read_upload
+
+class CountingFile(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+@pytest.mark.asyncio
+async def test_read_upload_within_limit():
+    """Test uploads under the limit are read completely"""
+    upload = UploadFile(file=io.BytesIO(b"x" * 200_000), filename="cv.pdf")
+    assert len(await read_upload(upload, 300_000)) == 200_000
+
+@pytest.mark.asyncio
+async def test_read_upload_stops_early_when_size_unknown():
+    """Test a stream without declared size is cut off as soon as it passes the limit"""
+    source = CountingFile(b"x" * 5_000_000)
+    upload = UploadFile(file=source, filename="cv.pdf")
+
+    with pytest.raises(HTTPException) as error:
+        await read_upload(upload, 100_000)
+
+    assert error.value.status_code == 413
+    assert source.bytes_read < 200_000
+
+@pytest.mark.asyncio
+async def test_read_upload_rejects_declared_size_without_reading():
+    """Test a known oversized upload is rejected before any byte is read"""
+    source = CountingFile(b"x" * 500_000)
+    upload = UploadFile(file=source, filename="cv.pdf", size=500_000)
+
+    with pytest.raises(HTTPException):
+        await read_upload(upload, 100_000)
+
+    assert source.bytes_read == 0
@@ -0,0 +1,84 @@
+"""
+Standalone CV worker: takes CV tasks from the Redis Stream and runs the same
+processing as the in-process queue (extraction, LLM parsing, agents, DB save).
+
+Start the API with CV_QUEUE_BACKEND=redis, then on every worker node:
+    python worker.py --processes 4 --concurrency 2
+
+Each process runs --concurrency consumers of the CV_STREAM_GROUP consumer group.
+UPLOAD_DIR has to be shared storage when workers run on other machines.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+from typing import Optional
+from config import settings
+
+logging.basicConfig(
+    level=logging.INFO if settings.DEBUG else logging.WARNING,
+    format='%(asctime)s - %(name)s - %(process)d - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+async def run_worker(concurrency: int, stop: Optional[asyncio.Event] = None):
+    from database import engine
+    from services.cv_stream import CVStream, consumer_name
+    from services.task_queue import CVTaskQueue
+    from services.llm_service import init_http_client, close_http_client
+    from services.ollama_pool import ollama_pool
+    from services.extraction_pool import extraction_pool
+    from services.agents.registry import agent_registry
+
+    stop = stop or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    await init_http_client()
+    agent_registry.init()
+    ollama_pool.start()
+    queue = CVTaskQueue(workers=concurrency)
+    stream = CVStream()
+    logger.info(f"👷 CV worker started ({concurrency} consumers)")
+    try:
+        await asyncio.gather(*(
+            stream.consume(queue.process, consumer_name(i), on_dead=queue.mark_failed, stop=stop)
+            for i in range(concurrency)
+        ))
+    finally:
+        logger.info(f"🛑 CV worker stopping (processed {queue.processed}, failed {queue.failed})")
+        await stream.close()
+        extraction_pool.shutdown()
+        await ollama_pool.stop()
+        await close_http_client()
+        await engine.dispose()
+
+def _process_main(concurrency: int):
+    asyncio.run(run_worker(concurrency))
+
+def main(processes: int, concurrency: int):
+    if processes <= 1:
+        _process_main(concurrency)
+        return
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_process_main, args=(concurrency,), name=f"cv-worker-{i}") for i in range(processes)]
+    for worker in workers:
+        worker.start()
+    # Children stop gracefully on SIGTERM (finish the current CV, then exit)
+    signal.signal(signal.SIGTERM, lambda *_: [w.terminate() for w in workers if w.is_alive()])
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        # Ctrl+C reaches the whole process group, just wait for the children
+        for worker in workers:
+            worker.join()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=settings.CV_WORKER_PROCESSES)
+    parser.add_argument("--concurrency", type=int, default=settings.CV_WORKERS, help="consumers per process")
+    args = parser.parse_args()
+    main(args.processes, args.concurrency)